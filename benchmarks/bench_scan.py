@@ -0,0 +1,223 @@
+"""Throughput benchmark for the scan engines against the bundled mock Google server.
+
+Every case scans a synthetic key set in a fresh child process, so peak RSS
+and CPU time belong to that scan alone, while the mock server runs in this
+process and counts the connections the scanner opened. Results are written
+as JSON; pass an earlier file with --baseline to print the change in
+throughput for every case the two runs share.
+
+	python benchmarks/bench_scan.py --sizes 1,100,10000 --engines threads,async
+	python benchmarks/bench_scan.py --quick --baseline benchmarks/results/previous.json
+"""
+import argparse
+import contextlib
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+try:
+	import resource
+except ImportError:  # Windows
+	resource = None
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import eva_gmaps_scanner as scanner
+
+
+DEFAULT_SIZES = (1, 100, 10_000, 100_000)
+QUICK_SIZES = (1, 100)
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results')
+
+# Simulated network conditions: (median latency in seconds, log-normal sigma)
+LATENCY_PROFILES = {
+	'none': (0.0, 0.0),
+	'lan': (0.002, 0.3),
+	'wan': (0.05, 0.5),
+}
+
+
+def synthetic_keys(count: int) -> List[str]:
+	"""Deterministic, well-formed keys; the mock server spreads them across behaviors by hash."""
+	return [f"AIzaSyBench{i:028d}" for i in range(count)]
+
+
+def percentile(values: List[float], fraction: float) -> Optional[float]:
+	if not values:
+		return None
+	ordered = sorted(values)
+	return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def peak_rss_bytes() -> Optional[int]:
+	if resource is None:
+		return None
+	peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+	# Linux reports kilobytes, macOS bytes
+	return peak if sys.platform == 'darwin' else peak * 1024
+
+
+class LatencySink(scanner.OutputSink):
+	"""Keeps per-probe timings instead of writing records."""
+
+	def __init__(self):
+		self.count = 0
+		self.latencies: List[float] = []
+		self.verdicts: Dict[str, int] = {}
+
+	def _write(self, result: scanner.ProbeResult) -> None:
+		label = scanner.verdict_label(result)
+		self.verdicts[label] = self.verdicts.get(label, 0) + 1
+		if result.elapsed is not None and not result.inferred and not result.cached:
+			self.latencies.append(result.elapsed)
+
+	def close(self) -> None:
+		pass
+
+
+def run_scan(keys: int, engine: str, concurrency: int, mode: str, base_url: str) -> Dict[str, Any]:
+	"""Scan ``keys`` synthetic keys in this process and measure it."""
+	api_keys = synthetic_keys(keys)
+	sink = LatencySink()
+	limiter = scanner.HostRateLimiter(rate=1e9)
+	cpu_before = time.process_time()
+	started = time.perf_counter()
+	with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+		if mode == 'batch':
+			scanner.scan_gmaps_batch(api_keys, concurrency=concurrency, engine=engine, base_url=base_url, limiter=limiter, sink=sink, verbosity=scanner.QUIET)
+		elif mode == 'parallel':
+			scanner.scan_gmaps_parallel(iter(api_keys), concurrency=concurrency, engine=engine, base_url=base_url, rate=1e9, sink=sink, verbosity=scanner.QUIET)
+		else:
+			scanner.scan_gmaps_stream(iter(api_keys), concurrency=concurrency, engine=engine, base_url=base_url, limiter=limiter, sink=sink, verbosity=scanner.QUIET)
+	wall = time.perf_counter() - started
+	latencies = sink.latencies
+	return {
+		'wall_seconds': wall,
+		'cpu_seconds': time.process_time() - cpu_before,
+		'peak_rss_bytes': peak_rss_bytes(),
+		'keys_per_second': keys / wall if wall else None,
+		'probes': sink.count,
+		'probes_sent': len(latencies),
+		'probes_per_second': len(latencies) / wall if wall else None,
+		'latency_p50_ms': 1000 * percentile(latencies, 0.50) if latencies else None,
+		'latency_p99_ms': 1000 * percentile(latencies, 0.99) if latencies else None,
+		'latency_mean_ms': 1000 * statistics.mean(latencies) if latencies else None,
+		'verdicts': sink.verdicts,
+	}
+
+
+def run_case(keys: int, engine: str, concurrency: int, mode: str, profile: str, seed: int = 0) -> Dict[str, Any]:
+	"""Serve the mock API here and run one measured scan in a child process."""
+	latency, jitter = LATENCY_PROFILES[profile]
+	with scanner.MockGoogleServer(mix=scanner.DEFAULT_MOCK_MIX, latency=latency, jitter=jitter, seed=seed) as server:
+		command = [
+			sys.executable, os.path.abspath(__file__), '--child',
+			'--keys', str(keys), '--engines', engine, '--concurrency', str(concurrency),
+			'--mode', mode, '--base-url', server.base_url,
+		]
+		completed = subprocess.run(command, stdout=subprocess.PIPE, check=True)
+		measurement = json.loads(completed.stdout.decode().strip().splitlines()[-1])
+		requests_served, connections = server.requests, server.connections
+	case = {'keys': keys, 'engine': engine, 'concurrency': concurrency, 'mode': mode, 'latency_profile': profile}
+	case.update(measurement)
+	case['requests_served'] = requests_served
+	case['connections_opened'] = connections
+	return case
+
+
+def case_id(case: Dict[str, Any]) -> str:
+	return f"{case['mode']}/{case['engine']}/c{case['concurrency']}/{case['latency_profile']}/{case['keys']}"
+
+
+def environment() -> Dict[str, Any]:
+	try:
+		commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, cwd=os.path.dirname(os.path.abspath(__file__))).stdout.decode().strip() or None
+	except OSError:
+		commit = None
+	return {
+		'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+		'commit': commit,
+		'python': platform.python_version(),
+		'platform': platform.platform(),
+		'cpu_count': os.cpu_count(),
+	}
+
+
+def print_case(case: Dict[str, Any], baseline: Optional[Dict[str, Any]] = None) -> None:
+	line = f"  {case_id(case):<40} {case['probes_per_second']:>10.1f} probes/s  {case['keys_per_second']:>9.1f} keys/s"
+	if case['latency_p50_ms'] is not None:
+		line += f"  p50 {case['latency_p50_ms']:.1f} ms  p99 {case['latency_p99_ms']:.1f} ms"
+	if case['peak_rss_bytes'] is not None:
+		line += f"  rss {case['peak_rss_bytes'] / (1 << 20):.0f} MiB"
+	line += f"  cpu {case['cpu_seconds']:.1f}s  {case['connections_opened']} conns"
+	if baseline is not None and baseline.get('probes_per_second'):
+		change = case['probes_per_second'] / baseline['probes_per_second'] - 1
+		line += f"  ({change:+.1%} vs baseline)"
+	print(line, flush=True)
+
+
+def main() -> None:
+	parser = argparse.ArgumentParser(description='Benchmark the scanner against the bundled mock Google server')
+	parser.add_argument('--sizes', type=str, default=','.join(str(n) for n in DEFAULT_SIZES), help='Comma-separated key set sizes (default: %(default)s)')
+	parser.add_argument('--quick', action='store_true', help=f"Only run the small key sets ({', '.join(str(n) for n in QUICK_SIZES)})")
+	parser.add_argument('--engines', type=str, default='threads', help=f"Comma-separated engines from {', '.join(scanner.ENGINES)} (default: %(default)s)")
+	parser.add_argument('--concurrency', type=int, default=64, help='Parallel probes (default: %(default)s)')
+	parser.add_argument('--mode', choices=('stream', 'batch', 'parallel'), default='stream', help='Scan function to measure; parallel uses one process per core (default: %(default)s)')
+	parser.add_argument('--latency', type=str, default='lan', help=f"Comma-separated latency profiles from {', '.join(LATENCY_PROFILES)} (default: %(default)s)")
+	parser.add_argument('--output', type=str, default=None, help='Where to write the JSON results (default: benchmarks/results/<timestamp>.json)')
+	parser.add_argument('--baseline', type=str, default=None, help='Earlier results file to compare throughput against')
+	# Internal: measure one scan in this (child) process and print it as JSON
+	parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+	parser.add_argument('--keys', type=int, help=argparse.SUPPRESS)
+	parser.add_argument('--base-url', type=str, help=argparse.SUPPRESS)
+	args = parser.parse_args()
+
+	if args.child:
+		print(json.dumps(run_scan(args.keys, args.engines, args.concurrency, args.mode, args.base_url)))
+		return
+
+	sizes = QUICK_SIZES if args.quick else tuple(int(n) for n in args.sizes.split(','))
+	engines = args.engines.split(',')
+	profiles = args.latency.split(',')
+	for engine in engines:
+		if engine not in scanner.ENGINES:
+			print(f"Error: Unknown engine {engine!r}.")
+			sys.exit(1)
+		if engine == 'async' and scanner.aiohttp is None:
+			print("Error: The async engine requires aiohttp (pip install 'eva-gmapsapiscanner[async]').")
+			sys.exit(1)
+	for profile in profiles:
+		if profile not in LATENCY_PROFILES:
+			print(f"Error: Unknown latency profile {profile!r}.")
+			sys.exit(1)
+
+	baseline = {}
+	if args.baseline:
+		with open(args.baseline) as f:
+			baseline = {case_id(case): case for case in json.load(f)['cases']}
+
+	report = {'environment': environment(), 'cases': []}
+	print(f"[+] Benchmarking {args.mode} mode, concurrency {args.concurrency}")
+	for profile in profiles:
+		for engine in engines:
+			for size in sizes:
+				case = run_case(size, engine, args.concurrency, args.mode, profile)
+				report['cases'].append(case)
+				print_case(case, baseline.get(case_id(case)))
+
+	output = args.output or os.path.join(RESULTS_DIR, time.strftime('%Y%m%d-%H%M%S') + '.json')
+	directory = os.path.dirname(output)
+	if directory:
+		os.makedirs(directory, exist_ok=True)
+	with open(output, 'w') as f:
+		json.dump(report, f, indent=2)
+	print(f"[+] Results written to {output}")
+
+
+if __name__ == '__main__':
+	main()
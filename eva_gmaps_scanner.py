@@ -4,23 +4,397 @@ import json
 import sys
 import os
 import argparse
-from typing import List, Dict
-from collections import defaultdict
+import asyncio
+import contextlib
+import csv
+import enum
+import hashlib
+import itertools
+import math
+import multiprocessing
+import queue
+import random
+import re
+import secrets
+import signal
+import socket
+import socketserver
+import sqlite3
+import tempfile
+import threading
+import time
+from typing import Any, Callable, List, Dict, Iterable, Iterator, Optional, TextIO, Tuple
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from urllib.parse import parse_qs, urlsplit
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+try:
+	import aiohttp
+except ImportError:  # optional: only needed for --engine async
+	aiohttp = None
+
+
+# Distinct Google API hosts probed by the scanner, used to size the connection pools
+API_HOST_COUNT = 16
+
+# Characters read per chunk when streaming keys from a file or stdin
+KEY_CHUNK_SIZE = 1 << 16
+
+# Google API keys: "AIza" followed by 35 URL-safe base64 characters
+KEY_PATTERN = re.compile(r'AIza[0-9A-Za-z_-]{35}')
+KEY_LENGTH = 39
+KEY_CHARSET = re.compile(r'[0-9A-Za-z_-]+')
+
+# Bloom filter sizing for --dedupe bloom
+DEFAULT_EXPECTED_KEYS = 10_000_000
+BLOOM_ERROR_RATE = 1e-6
+
+# Result cache: default location and how long a cached verdict stays valid (seconds)
+DEFAULT_CACHE_PATH = os.path.join(os.path.expanduser('~'), '.cache', 'eva-gmaps-scanner', 'results.sqlite3')
+DEFAULT_CACHE_TTL = 24 * 60 * 60
+CACHE_COMMIT_EVERY = 500
+
+# Distributed scanning: keys per shard, how long a claimed shard stays leased to a
+# silent worker (seconds) and how often idle workers and the coordinator poll the queue
+DEFAULT_SHARD_SIZE = 100
+SHARD_LEASE = 120.0
+SHARD_POLL_INTERVAL = 0.2
+
+# Process-pool mode: keys handed to a pool process at a time
+DEFAULT_PARTITION_SIZE = 50
+
+# --serve daemon: listen address, keys per job, finished jobs remembered,
+# largest request body and longest ?wait= a client can ask for (seconds)
+DEFAULT_SERVE_ADDRESS = '127.0.0.1:8766'
+SERVE_MAX_KEYS = 10_000
+SERVE_KEEP_JOBS = 1000
+SERVE_MAX_BODY = 1 << 20
+SERVE_MAX_WAIT = 60.0
+
+# Checkpoint journal: fsync after this many new verdicts or this many seconds, whichever comes first
+CHECKPOINT_FLUSH_EVERY = 100
+CHECKPOINT_FLUSH_INTERVAL = 5.0
+
+# Image and tile probes: how much of the body is read before deciding (the rest is never downloaded)
+BODY_PREFIX_BYTES = 1024
+
+# Per-request timeout (seconds) used by the probe engines
+BATCH_TIMEOUT = 10
+
+# Default cap on in-flight probes per API host for the async engine
+DEFAULT_PER_HOST_LIMIT = 50
+
+ENGINES = ('threads', 'async')
+
+# Batch scheduling: endpoint-major (one test across all keys at a time), key-major
+# (each key's full matrix, reported as soon as it completes), round-robin across API
+# hosts, or endpoint-major from the most expensive API down
+ORDERS = ('endpoint', 'key', 'interleaved', 'cost')
+
+# Structured output: one record per (key, endpoint) verdict, written through a buffered file
+OUTPUT_FORMATS = ('text', 'jsonl', 'csv', 'sarif')
+OUTPUT_BUFFER_SIZE = 1 << 16
+SARIF_SCHEMA = "https://json.schemastore.org/sarif-2.1.0.json"
+TOOL_NAME = "EVA G-Maps API Scanner"
+TOOL_URI = "https://github.com/ozguralp/gmapsapiscanner"
+
+# Bundled mock Google server: default address, how unlisted keys are spread across behaviors
+# and the size of the image/tile bodies it serves to allowed keys
+MOCK_BEHAVIORS = ('allowed', 'denied', 'not_enabled', 'referer', 'invalid', 'throttled')
+DEFAULT_MOCK_PORT = 8765
+DEFAULT_MOCK_MIX = {'allowed': 0.1, 'denied': 0.5, 'not_enabled': 0.3, 'invalid': 0.1}
+MOCK_IMAGE_BYTES = 64 * 1024
+
+# Latency histogram bucket bounds (seconds) for --timings and --metrics
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+METRICS_FORMATS = ('prometheus', 'json')
+
+# Console verbosity: findings and summaries only, per-probe lines, or per-probe lines with reasons
+QUIET, NORMAL, VERBOSE = 0, 1, 2
+# How often (seconds) the reporter thread flushes queued lines and redraws the progress bar
+REPORT_INTERVAL = 0.2
+PROGRESS_WIDTH = 30
+
+# Adaptive per-host rate limiting: starting rate (req/s), floor, ceiling and additive step
+DEFAULT_HOST_RATE = 50.0
+MIN_HOST_RATE = 0.5
+MAX_HOST_RATE = 1000.0
+RATE_INCREASE_STEP = 0.5
+THROTTLE_COOLDOWN = 1.0
+
+# Exponential backoff for throttled probes (seconds) and how often to re-queue them
+BACKOFF_BASE = 1.0
+BACKOFF_CAP = 60.0
+DEFAULT_MAX_RETRIES = 5
+
+# How much of a body the classifier scans for markers: Google's error bodies are
+# small, so a refusal is always decided within this prefix
+CLASSIFY_PREFIX_BYTES = 2048
+
+# Body markers Google uses when a request was rate limited rather than refused
+THROTTLE_MARKERS = (b"OVER_QUERY_LIMIT", b"RESOURCE_EXHAUSTED", b"rateLimitExceeded")
+
+# Refusal reasons meaning the key itself is dead (deleted, malformed or expired)
+INVALID_KEY_MARKERS = (
+	"The provided API key is invalid",
+	"The provided API key is expired",
+	"API key not valid",
+	"API key expired",
+	"API_KEY_INVALID",
+)
+
+# Refusal reasons meaning the API is not enabled (or not billed) on the key's project,
+# as opposed to the key's own API, referer or IP restrictions blocking the request
+NOT_ENABLED_MARKERS = (
+	"This API project is not authorized to use this API",
+	"has not been used in project",
+	"SERVICE_DISABLED",
+	"You must enable Billing",
+	"BILLING_DISABLED",
+)
+
+# Error recorded for probes a --max-requests/--deadline budget kept from being sent
+BUDGET_EXHAUSTED = "Not sent: scan budget exhausted"
+
+# A list price in an endpoint's cost lines, in USD per 1000 requests (or elements)
+PRICE_PATTERN = re.compile(r"\$(\d+(?:\.\d+)?) per 1000")
+
+# Refusal reasons that apply to the whole key rather than one API, and the restriction each reveals
+RESTRICTION_MARKERS = (
+	("The provided API key is expired", 'expired'),
+	("API key expired", 'expired'),
+	("The provided API key is invalid", 'invalid'),
+	("API key not valid", 'invalid'),
+	("API_KEY_INVALID", 'invalid'),
+	("API keys with referer restrictions cannot be used with this API", 'referer'),
+	("API_KEY_HTTP_REFERRER_BLOCKED", 'referer'),
+	("Requests from referer", 'referer'),
+	("API_KEY_IP_ADDRESS_BLOCKED", 'ip'),
+	("Request received from IP address", 'ip'),
+	("API_KEY_ANDROID_APP_BLOCKED", 'app'),
+	("API_KEY_IOS_APP_BLOCKED", 'app'),
+)
+
+
+# Timing of the probe running on the current thread, filled in by the timed connections below
+_probe_timing = threading.local()
+
+
+def _current_timing() -> Optional["ProbeTiming"]:
+	return getattr(_probe_timing, 'current', None)
+
+
+class TimedHTTPConnection(HTTPConnection):
+	"""Records TCP connect (including DNS) and time to first byte on the current probe's timing."""
+
+	def _new_conn(self):
+		started = time.perf_counter()
+		try:
+			return super()._new_conn()
+		finally:
+			timing = _current_timing()
+			if timing is not None:
+				timing.add('connect', time.perf_counter() - started)
+
+	def getresponse(self, *args, **kwargs):
+		response = super().getresponse(*args, **kwargs)
+		timing = _current_timing()
+		if timing is not None:
+			timing.headers_at = time.perf_counter()
+		return response
+
+
+class TimedHTTPSConnection(TimedHTTPConnection, HTTPSConnection):
+	"""Adds the TLS handshake: everything ``connect`` does after the TCP socket is open."""
+
+	def connect(self):
+		started = time.perf_counter()
+		timing = _current_timing()
+		connect_before = (timing.connect or 0.0) if timing is not None else 0.0
+		super().connect()
+		if timing is not None:
+			tcp = (timing.connect or 0.0) - connect_before
+			timing.add('tls', time.perf_counter() - started - tcp)
+
+
+class TimedHTTPConnectionPool(HTTPConnectionPool):
+	ConnectionCls = TimedHTTPConnection
+
+
+class TimedHTTPSConnectionPool(HTTPSConnectionPool):
+	ConnectionCls = TimedHTTPSConnection
+
+
+TIMED_POOL_CLASSES = {'http': TimedHTTPConnectionPool, 'https': TimedHTTPSConnectionPool}
+
+
+class TimedHTTPAdapter(HTTPAdapter):
+	"""HTTPAdapter whose pools (direct and proxied) use the timed connection classes."""
+
+	def init_poolmanager(self, *args, **kwargs):
+		super().init_poolmanager(*args, **kwargs)
+		self.poolmanager.pool_classes_by_scheme = TIMED_POOL_CLASSES
+
+	def proxy_manager_for(self, proxy, **proxy_kwargs):
+		manager = super().proxy_manager_for(proxy, **proxy_kwargs)
+		manager.pool_classes_by_scheme = TIMED_POOL_CLASSES
+		return manager
+
+
+def create_session(proxy_url=None, pool_size: int = 1) -> requests.Session:
+	"""Create the shared HTTP session used for every probe.
+
+	Proxy and TLS verification settings are applied once, and connections are
+	kept alive in per-host pools holding up to ``pool_size`` sockets so each
+	Google host costs one handshake per worker rather than one per request.
+	"""
+	session = requests.Session()
+	session.verify = False
+	if proxy_url:
+		session.proxies = {'http': proxy_url, 'https': proxy_url}
+	adapter = TimedHTTPAdapter(
+		pool_connections=API_HOST_COUNT,
+		pool_maxsize=max(1, pool_size),
+	)
+	session.mount('https://', adapter)
+	session.mount('http://', adapter)
+	return session
+
+
+def iter_api_keys(source: str, chunk_size: int = KEY_CHUNK_SIZE) -> Iterator[str]:
+	"""Lazily read API keys from a file, or from stdin when ``source`` is ``-``.
+
+	The input is consumed ``chunk_size`` characters at a time and split on
+	newlines and commas, so arbitrarily large key dumps are never held in
+	memory. The file is opened immediately so a missing path fails here rather
+	than on first iteration.
+	"""
+	stream = sys.stdin if source == '-' else open(source, 'r', errors='replace')
+	return _iter_keys_from_stream(stream, chunk_size, close=stream is not sys.stdin)
+
+
+def _iter_keys_from_stream(stream: TextIO, chunk_size: int, close: bool) -> Iterator[str]:
+	try:
+		partial = ''
+		while True:
+			chunk = stream.read(chunk_size)
+			if not chunk:
+				break
+			tokens = (partial + chunk).replace(',', '\n').split('\n')
+			# The last token may continue in the next chunk
+			partial = tokens.pop()
+			for token in tokens:
+				key = token.strip()
+				if key:
+					yield key
+		key = partial.strip()
+		if key:
+			yield key
+	finally:
+		if close:
+			stream.close()
+
+
+class BloomFilter:
+	"""Fixed-size Bloom filter for approximate dedup of very large key streams.
+
+	Memory is fixed up front from ``capacity`` and ``error_rate`` (about 3.6 MB
+	per million keys at 1e-6); a false positive drops a key that was never
+	seen, never the reverse.
+	"""
+
+	def __init__(self, capacity: int = DEFAULT_EXPECTED_KEYS, error_rate: float = BLOOM_ERROR_RATE):
+		capacity = max(1, capacity)
+		self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+		self.hashes = max(1, round(self.size / capacity * math.log(2)))
+		self.bits = bytearray((self.size + 7) // 8)
+
+	def _positions(self, item: str) -> Iterator[int]:
+		digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+		h1 = int.from_bytes(digest[:8], 'little')
+		h2 = int.from_bytes(digest[8:], 'little') | 1
+		for i in range(self.hashes):
+			yield (h1 + i * h2) % self.size
+
+	def add(self, item: str) -> bool:
+		"""Add ``item`` and return True if it was (probably) already present."""
+		present = True
+		for position in self._positions(item):
+			byte, mask = position >> 3, 1 << (position & 7)
+			if not self.bits[byte] & mask:
+				present = False
+				self.bits[byte] |= mask
+		return present
+
+	def __contains__(self, item: str) -> bool:
+		return all(self.bits[p >> 3] & (1 << (p & 7)) for p in self._positions(item))
+
+
+class KeyFilter:
+	"""Validation and dedup stage that runs before any key reaches the network.
+
+	Keys that do not look like Google API keys and keys already seen are
+	dropped, and the reason for every rejection is counted in ``rejected``.
+	``dedupe`` is ``'set'`` (exact), ``'bloom'`` (fixed memory, approximate)
+	or ``'none'``; ``validate=False`` only dedupes.
+	"""
+
+	def __init__(self, validate: bool = True, dedupe: str = 'set', expected_keys: int = DEFAULT_EXPECTED_KEYS):
+		self.validate = validate
+		self.dedupe = dedupe
+		if dedupe == 'bloom':
+			self.seen = BloomFilter(expected_keys)
+		elif dedupe == 'set':
+			self.seen = set()
+		else:
+			self.seen = None
+		self.accepted = 0
+		self.rejected: Counter = Counter()
+
+	def reject_reason(self, key: str) -> Optional[str]:
+		"""Why ``key`` would be dropped, or None if it is a new well-formed key."""
+		if self.validate and not KEY_PATTERN.fullmatch(key):
+			if not key.startswith('AIza'):
+				return 'bad_prefix'
+			if len(key) != KEY_LENGTH:
+				return 'bad_length'
+			return 'bad_charset'
+		if self.seen is not None:
+			if isinstance(self.seen, BloomFilter):
+				if self.seen.add(key):
+					return 'duplicate'
+			elif key in self.seen:
+				return 'duplicate'
+			else:
+				self.seen.add(key)
+		return None
+
+	def __call__(self, keys: Iterable[str]) -> Iterator[str]:
+		for key in keys:
+			reason = self.reject_reason(key)
+			if reason is None:
+				self.accepted += 1
+				yield key
+			else:
+				self.rejected[reason] += 1
+
+	def summary(self) -> str:
+		rejected = sum(self.rejected.values())
+		if not rejected:
+			return f"{self.accepted} keys accepted"
+		reasons = ", ".join(f"{count} {reason}" for reason, count in self.rejected.most_common())
+		return f"{self.accepted} keys accepted, {rejected} rejected ({reasons})"
 
 
 def parse_api_keys_from_file(filepath: str) -> List[str]:
 	"""Parse API keys from file. Supports newline and comma separation."""
 	try:
-		with open(filepath, 'r') as f:
-			content = f.read()
-		
-		# Replace commas with newlines, then split by newlines
-		keys = content.replace(',', '\n').split('\n')
-		
-		# Clean up: strip whitespace and filter empty strings
-		keys = [key.strip() for key in keys if key.strip()]
-		
-		return keys
+		return list(iter_api_keys(filepath))
 	except FileNotFoundError:
 		print(f"Error: File '{filepath}' not found.")
 		sys.exit(1)
@@ -29,12 +403,21 @@ def parse_api_keys_from_file(filepath: str) -> List[str]:
 		sys.exit(1)
 
 
+def print_rate_summary(limiter) -> None:
+	"""Print the effective request rate reached for each API host."""
+	throttles = limiter.throttle_counts()
+	print("\n⏱  Effective request rate per host:")
+	for host, rps in sorted(limiter.effective_rps().items()):
+		print(f"  {host:<40} {rps:8.1f} req/s  (limit {limiter.rate(host):.1f} req/s, {throttles.get(host, 0)} throttled)")
+
+
+def shorten_key(key: str) -> str:
+	"""Shorten keys for display (first 20 chars + ...)."""
+	return key[:20] + "..." if len(key) > 20 else key
+
+
 def print_results_table(results: Dict[str, Dict[str, bool]], api_keys: List[str]):
 	"""Print a formatted table of results."""
-	# Shorten keys for display (first 20 chars + ...)
-	def shorten_key(key):
-		return key[:20] + "..." if len(key) > 20 else key
-	
 	print("\n" + "="*100)
 	print("📊 BATCH SCAN RESULTS - Vulnerable Endpoints per API Key")
 	print("="*100)
@@ -49,12 +432,17 @@ def print_results_table(results: Dict[str, Dict[str, bool]], api_keys: List[str]
 	print(header)
 	print("-" * len(header))
 	
-	# Print results
+	# Print results (keys with no verdict errored or stayed throttled)
 	for api in apis:
 		row = f"{api:<40}"
 		for key in api_keys:
-			status = "✓ VULN" if results[api].get(key, False) else "✗ Safe"
-			color = "\033[1;31m" if results[api].get(key, False) else "\033[0;32m"
+			verdict = results[api].get(key)
+			if verdict is None:
+				status, color = "? Unknown", "\033[1;33m"
+			elif verdict:
+				status, color = "✓ VULN", "\033[1;31m"
+			else:
+				status, color = "✗ Safe", "\033[0;32m"
 			reset = "\033[0m"
 			row += f" | {color}{status:<23}{reset}"
 		print(row)
@@ -65,538 +453,1717 @@ def print_results_table(results: Dict[str, Dict[str, bool]], api_keys: List[str]
 	print("\n📈 SUMMARY:")
 	for i, key in enumerate(api_keys, 1):
 		vulnerable_count = sum(1 for api in apis if results[api].get(key, False))
-		print(f"  Key {i} ({shorten_key(key)}): {vulnerable_count}/{len(apis)} APIs vulnerable")
+		exposed = sum(PRICES.get(api, 0.0) for api in apis if results[api].get(key, False))
+		print(f"  Key {i} ({shorten_key(key)}): {vulnerable_count}/{len(apis)} APIs vulnerable, exposure {format_exposure(exposed)}")
 	print()
 
 
-def scan_gmaps(apikey, proxy_url=None):
-	vulnerable_apis = []
-	test_number = 1
-	
-	# Setup proxy configuration
-	proxies = None
-	if proxy_url:
-		proxies = {
-			'http': proxy_url,
-			'https': proxy_url
-		}
-		print(f"[+] Using proxy: {proxy_url}")
-		print("")
-	
-	print("--------------------------")
-	print(f"{test_number}. Testing Staticmap API")
-	print("--------------------------")
-	url = "https://maps.googleapis.com/maps/api/staticmap?center=45%2C10&zoom=7&size=400x400&key="+apikey 
-	response = requests.get(url, verify=False, proxies=proxies)
-	if response.status_code == 200:
-		print("API key is \033[1;31;40mvulnerable\033[0m for Staticmap API! Here is the PoC link which can be used directly via browser:")
-		print(url)
-		vulnerable_apis.append("Staticmap 			|| $2 per 1000 requests")
-	elif b"PNG" in response.content:
-		print("API key is not vulnerable for Staticmap API.")
-		print("Reason: Manually check the "+url+" to view the reason.")
-	else:
-		print("API key is not vulnerable for Staticmap API.")
-		print("Reason: "+ str(response.content))
-
-	test_number += 1
-	print("\n--------------------------")
-	print(f"{test_number}. Testing Streetview API")
-	print("--------------------------")
-	url = "https://maps.googleapis.com/maps/api/streetview?size=400x400&location=40.720032,-73.988354&fov=90&heading=235&pitch=10&key="+apikey 
-	response = requests.get(url, verify=False, proxies=proxies)
-	if response.status_code == 200:
-		print("API key is \033[1;31;40mvulnerable\033[0m for Streetview API! Here is the PoC link which can be used directly via browser:")
-		print(url)
-		vulnerable_apis.append("Streetview 			|| $7 per 1000 requests")
-	elif b"PNG" in response.content:
-		print("API key is not vulnerable for Streetview API.")
-		print("Reason: Manually check the "+url+" to view the reason.")
-	else:
-		print("API key is not vulnerable for Streetview API.")
-		print("Reason: "+ str(response.content))
-
-	test_number += 1
-	print("\n--------------------------")
-	print(f"{test_number}. Testing Directions API")
-	print("--------------------------")
-	url = "https://maps.googleapis.com/maps/api/directions/json?origin=Disneyland&destination=Universal+Studios+Hollywood4&key="+apikey
-	response = requests.get(url, verify=False, proxies=proxies)
-	if response.text.find("error_message") < 0:
-		print("API key is \033[1;31;40mvulnerable\033[0m for Directions API! Here is the PoC link which can be used directly via browser:")
-		print(url)
-		vulnerable_apis.append("Directions 			|| $5 per 1000 requests")
-		vulnerable_apis.append("Directions (Advanced) 	|| $10 per 1000 requests")
-	else:
-		print("API key is not vulnerable for Directions API.")
-		print("Reason: "+ response.json()["error_message"])
-
-	test_number += 1
-	print("\n--------------------------")
-	print(f"{test_number}. Testing Geocode API")
-	print("--------------------------")
-	url = "https://maps.googleapis.com/maps/api/geocode/json?latlng=40,30&key="+apikey 
-	response = requests.get(url, verify=False, proxies=proxies)
-	if response.text.find("error_message") < 0:
-		print("API key is \033[1;31;40mvulnerable\033[0m for Geocode API! Here is the PoC link which can be used directly via browser:")
-		print(url)
-		vulnerable_apis.append("Geocode 			|| $5 per 1000 requests")
-	else:
-		print("API key is not vulnerable for Geocode API.")
-		print("Reason: "+ response.json()["error_message"])
-
-	test_number += 1
-	print("\n--------------------------")
-	print(f"{test_number}. Testing Distance Matrix API")
-	print("--------------------------")
-	url = "https://maps.googleapis.com/maps/api/distancematrix/json?units=imperial&origins=40.6655101,-73.89188969999998&destinations=40.6905615%2C-73.9976592%7C40.6905615%2C-73.9976592%7C40.6905615%2C-73.9976592%7C40.6905615%2C-73.9976592%7C40.6905615%2C-73.9976592%7C40.6905615%2C-73.9976592%7C40.659569%2C-73.933783%7C40.729029%2C-73.851524%7C40.6860072%2C-73.6334271%7C40.598566%2C-73.7527626%7C40.659569%2C-73.933783%7C40.729029%2C-73.851524%7C40.6860072%2C-73.6334271%7C40.598566%2C-73.7527626&key="+apikey 
-	response = requests.get(url, verify=False, proxies=proxies)
-	if response.text.find("error_message") < 0:
-		print("API key is \033[1;31;40mvulnerable\033[0m for Distance Matrix API! Here is the PoC link which can be used directly via browser:")
-		print(url)
-		vulnerable_apis.append("Distance Matrix 		|| $5 per 1000 elements")
-		vulnerable_apis.append("Distance Matrix (Advanced) 	|| $10 per 1000 elements")
-	else:
-		print("API key is not vulnerable for Distance Matrix API.")
-		print("Reason: "+ response.json()["error_message"])
-
-	test_number += 1
-	print("\n--------------------------")
-	print(f"{test_number}. Testing Find Place From Text API")
-	print("--------------------------")
-	url = "https://maps.googleapis.com/maps/api/place/findplacefromtext/json?input=Museum%20of%20Contemporary%20Art%20Australia&inputtype=textquery&fields=photos,formatted_address,name,rating,opening_hours,geometry&key="+apikey
-	response = requests.get(url, verify=False, proxies=proxies) 
-	if response.text.find("error_message") < 0:
-		print("API key is \033[1;31;40mvulnerable\033[0m for Find Place From Text API! Here is the PoC link which can be used directly via browser:")
-		print(url)
-		vulnerable_apis.append("Find Place From Text 		|| $17 per 1000 elements")
-	else:
-		print("API key is not vulnerable for Find Place From Text API.")
-		print("Reason: "+ response.json()["error_message"])
-
-	test_number += 1
-	print("\n--------------------------")
-	print(f"{test_number}. Testing Autocomplete API")
-	print("--------------------------")
-	url = "https://maps.googleapis.com/maps/api/place/autocomplete/json?input=Bingh&types=%28cities%29&key="+apikey 
-	response = requests.get(url, verify=False, proxies=proxies)
-	if response.text.find("error_message") < 0:
-		print("API key is \033[1;31;40mvulnerable\033[0m for Autocomplete API! Here is the PoC link which can be used directly via browser:")
-		print(url)
-		vulnerable_apis.append("Autocomplete 			|| $2.83 per 1000 requests")
-		vulnerable_apis.append("Autocomplete Per Session 	|| $17 per 1000 requests")
-	else:
-		print("API key is not vulnerable for Autocomplete API.")
-		print("Reason: "+ response.json()["error_message"])
-
-	test_number += 1
-	print("\n--------------------------")
-	print(f"{test_number}. Testing Elevation API")
-	print("--------------------------")
-	url = "https://maps.googleapis.com/maps/api/elevation/json?locations=39.7391536,-104.9847034&key="+apikey 
-	response = requests.get(url, verify=False, proxies=proxies)
-	if response.text.find("error_message") < 0:
-		print("API key is \033[1;31;40mvulnerable\033[0m for Elevation API! Here is the PoC link which can be used directly via browser:")
-		print(url)
-		vulnerable_apis.append("Elevation 			|| $5 per 1000 requests")
-	else:
-		print("API key is not vulnerable for Elevation API.")
-		print("Reason: "+ response.json()["error_message"])
-
-	test_number += 1
-	print("\n--------------------------")
-	print(f"{test_number}. Testing Timezone API")
-	print("--------------------------")
-	url = "https://maps.googleapis.com/maps/api/timezone/json?location=39.6034810,-119.6822510&timestamp=1331161200&key="+apikey 
-	response = requests.get(url, verify=False, proxies=proxies)
-	if response.text.find("errorMessage") < 0:
-		print("API key is \033[1;31;40mvulnerable\033[0m for Timezone API! Here is the PoC link which can be used directly via browser:")
-		print(url)
-		vulnerable_apis.append("Timezone 			|| $5 per 1000 requests")
-	else:
-		print("API key is not vulnerable for Timezone API.")
-		print("Reason: "+ response.json()["errorMessage"])
-
-	test_number += 1
-	print("\n--------------------------")
-	print(f"{test_number}. Testing Nearest Roads API")
-	print("--------------------------")
-	url = "https://roads.googleapis.com/v1/nearestRoads?points=60.170880,24.942795|60.170879,24.942796|60.170877,24.942796&key="+apikey 
-	response = requests.get(url, verify=False, proxies=proxies)
-	if response.text.find("error") < 0:
-		print("API key is \033[1;31;40mvulnerable\033[0m for Nearest Roads API! Here is the PoC link which can be used directly via browser:")
-		print(url)
-		vulnerable_apis.append("Nearest Roads 		|| $10 per 1000 requests")
-	else:
-		print("API key is not vulnerable for Nearest Roads API.")
-		print("Reason: "+ response.json()["error"]["message"])
-
-	test_number += 1
-	print("\n--------------------------")
-	print(f"{test_number}. Testing Geolocation API")
-	print("--------------------------")
-	url = "https://www.googleapis.com/geolocation/v1/geolocate?key="+apikey 
-	postdata = {'considerIp': 'true'}
-	response = requests.post(url, data=postdata, verify=False, proxies=proxies)
-	if response.text.find("error") < 0:
-		print("API key is \033[1;31;40mvulnerable\033[0m for Geolocation API! Here is the PoC curl command which can be used from terminal:")
-		print("curl -i -s -k  -X $'POST' -H $'Host: www.googleapis.com' -H $'Content-Length: 22' --data-binary $'{\"considerIp\": \"true\"}' $'"+url+"'")
-		vulnerable_apis.append("Geolocation 			|| $5 per 1000 requests")
-	else:
-		print("API key is not vulnerable for Geolocation API.")
-		print("Reason: "+ response.json()["error"]["message"])
-
-	test_number += 1
-	print("\n--------------------------")
-	print(f"{test_number}. Testing Route to Traveled API (Snap to Roads)")
-	print("--------------------------")
-	url = "https://roads.googleapis.com/v1/snapToRoads?path=-35.27801,149.12958|-35.28032,149.12907&interpolate=true&key="+apikey 
-	response = requests.get(url, verify=False, proxies=proxies)
-	if response.text.find("error") < 0:
-		print("API key is \033[1;31;40mvulnerable\033[0m for Route to Traveled API! Here is the PoC link which can be used directly via browser:")
-		print(url)
-		vulnerable_apis.append("Route to Traveled 		|| $10 per 1000 requests")
-	else:
-		print("API key is not vulnerable for Route to Traveled API.")
-		print("Reason: "+ response.json()["error"]["message"])
-
-	test_number += 1
-	print("\n--------------------------")
-	print(f"{test_number}. Testing Speed Limit-Roads API")
-	print("--------------------------")
-	url = "https://roads.googleapis.com/v1/speedLimits?path=38.75807927603043,-9.03741754643809&key="+apikey 
-	response = requests.get(url, verify=False, proxies=proxies)
-	if response.text.find("error") < 0:
-		print("API key is \033[1;31;40mvulnerable\033[0m for Speed Limit-Roads API! Here is the PoC link which can be used directly via browser:")
-		print(url)
-		vulnerable_apis.append("Speed Limit-Roads 		|| $20 per 1000 requests")
-	else:
-		print("API key is not vulnerable for Speed Limit-Roads API.")
-		print("Reason: "+ response.json()["error"]["message"])
-
-	test_number += 1
-	print("\n--------------------------")
-	print(f"{test_number}. Testing Place Details API")
-	print("--------------------------")
-	url = "https://maps.googleapis.com/maps/api/place/details/json?place_id=ChIJN1t_tDeuEmsRUsoyG83frY4&fields=name,rating,formatted_phone_number&key="+apikey 
-	response = requests.get(url, verify=False, proxies=proxies)
-	if response.text.find("error_message") < 0:
-		print("API key is \033[1;31;40mvulnerable\033[0m for Place Details API! Here is the PoC link which can be used directly via browser:")
-		print(url)
-		vulnerable_apis.append("Place Details 		|| $17 per 1000 requests")
-	else:
-		print("API key is not vulnerable for Place Details API.")
-		print("Reason: "+ response.json()["error_message"])
-
-	test_number += 1
-	print("\n--------------------------")
-	print(f"{test_number}. Testing Nearby Search-Places API")
-	print("--------------------------")
-	url = "https://maps.googleapis.com/maps/api/place/nearbysearch/json?location=-33.8670522,151.1957362&radius=100&types=food&name=harbour&key="+apikey 
-	response = requests.get(url, verify=False, proxies=proxies)
-	if response.text.find("error_message") < 0:
-		print("API key is \033[1;31;40mvulnerable\033[0m for Nearby Search-Places API! Here is the PoC link which can be used directly via browser:")
-		print(url)
-		vulnerable_apis.append("Nearby Search-Places		|| $32 per 1000 requests")
-	else:
-		print("API key is not vulnerable for Nearby Search-Places API.")
-		print("Reason: "+ response.json()["error_message"])
-
-	test_number += 1
-	print("\n--------------------------")
-	print(f"{test_number}. Testing Text Search-Places API")
-	print("--------------------------")
-	url = "https://maps.googleapis.com/maps/api/place/textsearch/json?query=restaurants+in+Sydney&key="+apikey 
-	response = requests.get(url, verify=False, proxies=proxies)
-	if response.text.find("error_message") < 0:
-		print("API key is \033[1;31;40mvulnerable\033[0m for Text Search-Places API! Here is the PoC link which can be used directly via browser:")
-		print(url)
-		vulnerable_apis.append("Text Search-Places 		|| $32 per 1000 requests")
-	else:
-		print("API key is not vulnerable for Text Search-Places API.")
-		print("Reason: "+ response.json()["error_message"])
-
-	test_number += 1
-	print("\n--------------------------")
-	print(f"{test_number}. Testing Places Photo API")
-	print("--------------------------")
-	url = "https://maps.googleapis.com/maps/api/place/photo?maxwidth=400&photoreference=CnRtAAAATLZNl354RwP_9UKbQ_5Psy40texXePv4oAlgP4qNEkdIrkyse7rPXYGd9D_Uj1rVsQdWT4oRz4QrYAJNpFX7rzqqMlZw2h2E2y5IKMUZ7ouD_SlcHxYq1yL4KbKUv3qtWgTK0A6QbGh87GB3sscrHRIQiG2RrmU_jF4tENr9wGS_YxoUSSDrYjWmrNfeEHSGSc3FyhNLlBU&key="+apikey 
-	response = requests.get(url, verify=False, allow_redirects=False)
-	if response.status_code == 302:
-		print("API key is \033[1;31;40mvulnerable\033[0m for Places Photo API! Here is the PoC link which can be used directly via browser:")
-		print(url)
-		vulnerable_apis.append("Places Photo 			|| $7 per 1000 requests")
-	else:
-		print("API key is not vulnerable for Places Photo API.")
-		print("Reason: Verbose responses are not enabled for this API, cannot determine the reason.")
-
-	test_number += 1
-	print("\n--------------------------")
-	print(f"{test_number}. Testing FCM API")
-	print("--------------------------")
-	url = "https://fcm.googleapis.com/fcm/send" 
-	postdata = "{'registration_ids':['ABC']}"
-	response = requests.post(url, data=postdata, verify=False, headers={'Content-Type':'application/json','Authorization':'key='+apikey})
-	if response.status_code == 200:
-		print("API key is \033[1;31;40mvulnerable\033[0m for FCM API! Here is the PoC curl command which can be used from terminal:")
-		print("curl --header \"Authorization: key="+apikey+"\" --header Content-Type:\"application/json\" https://fcm.googleapis.com/fcm/send -d '{\"registration_ids\":[\"ABC\"]}'")
-		vulnerable_apis.append("FCM Takeover 			|| https://abss.me/posts/fcm-takeover/")
-	else:
-		print("API key is not vulnerable for FCM API.")
-		for lines in response.iter_lines():
-			if(("TITLE") in str(lines)):
-				print("Reason: "+str(lines).split("TITLE")[1].split("<")[0].replace(">",""))
-
-	test_number += 1
-	print("\n--------------------------")
-	print(f"{test_number}. Testing Query Autocomplete API")
-	print("--------------------------")
-	url = "https://maps.googleapis.com/maps/api/place/queryautocomplete/json?input=pizza+near%20Par&key="+apikey
-	response = requests.get(url, verify=False, proxies=proxies)
-	if response.text.find("error_message") < 0:
-		print("API key is \033[1;31;40mvulnerable\033[0m for Query Autocomplete API! Here is the PoC link which can be used directly via browser:")
-		print(url)
-		vulnerable_apis.append("Query Autocomplete 		|| $2.83 per 1000 requests")
-	else:
-		print("API key is not vulnerable for Query Autocomplete API.")
-		print("Reason: "+ response.json()["error_message"])
-
-	test_number += 1
-	print("\n--------------------------")
-	print(f"{test_number}. Testing Address Validation API")
-	print("--------------------------")
-	url = "https://addressvalidation.googleapis.com/v1:validateAddress?key="+apikey
-	postdata = json.dumps({"address": {"regionCode": "US","addressLines": ["1600 Amphitheatre Pkwy, Mountain View, CA 94043"]}})
-	response = requests.post(url, data=postdata, verify=False, headers={'Content-Type':'application/json'})
-	if response.status_code == 200 and response.text.find("error") < 0:
-		print("API key is \033[1;31;40mvulnerable\033[0m for Address Validation API! Here is the PoC curl command which can be used from terminal:")
-		print("curl -X POST -H 'Content-Type: application/json' -d '{\"address\":{\"regionCode\":\"US\",\"addressLines\":[\"1600 Amphitheatre Pkwy\"]}}' '"+url+"'")
-		vulnerable_apis.append("Address Validation 		|| $17 per 1000 requests")
-	else:
-		print("API key is not vulnerable for Address Validation API.")
-		if response.text.find("error") >= 0:
-			try:
-				print("Reason: "+ response.json()["error"]["message"])
-			except:
-				print("Reason: "+ str(response.content))
-
-	test_number += 1
-	print("\n--------------------------")
-	print(f"{test_number}. Testing Routes API (v2 - Compute Routes)")
-	print("--------------------------")
-	url = "https://routes.googleapis.com/directions/v2:computeRoutes?key="+apikey
-	postdata = json.dumps({"origin":{"location":{"latLng":{"latitude": 37.419734,"longitude": -122.0827784}}},"destination":{"location":{"latLng":{"latitude": 37.417670,"longitude": -122.079595}}},"travelMode": "DRIVE"})
-	response = requests.post(url, data=postdata, verify=False, headers={'Content-Type':'application/json','X-Goog-FieldMask':'routes.duration,routes.distanceMeters'})
-	if response.status_code == 200 and response.text.find("error") < 0:
-		print("API key is \033[1;31;40mvulnerable\033[0m for Routes API (v2)! Here is the PoC curl command which can be used from terminal:")
-		print("curl -X POST -H 'Content-Type: application/json' -H 'X-Goog-FieldMask: routes.duration,routes.distanceMeters' -d '{\"origin\":{\"location\":{\"latLng\":{\"latitude\":37.419734,\"longitude\":-122.0827784}}},\"destination\":{\"location\":{\"latLng\":{\"latitude\":37.417670,\"longitude\":-122.079595}}},\"travelMode\":\"DRIVE\"}' '"+url+"'")
-		vulnerable_apis.append("Routes API (Compute Routes) 	|| $5 per 1000 requests")
-	else:
-		print("API key is not vulnerable for Routes API (v2).")
-		if response.text.find("error") >= 0:
-			try:
-				print("Reason: "+ response.json()["error"]["message"])
-			except:
-				print("Reason: "+ str(response.content))
-
-	test_number += 1
-	print("\n--------------------------")
-	print(f"{test_number}. Testing Routes API (v2 - Route Matrix)")
-	print("--------------------------")
-	url = "https://routes.googleapis.com/distanceMatrix/v2:computeRouteMatrix?key="+apikey
-	postdata = json.dumps({"origins":[{"waypoint":{"location":{"latLng":{"latitude":37.420761,"longitude":-122.081356}}}}],"destinations":[{"waypoint":{"location":{"latLng":{"latitude":37.420999,"longitude":-122.086894}}}}],"travelMode":"DRIVE"})
-	response = requests.post(url, data=postdata, verify=False, headers={'Content-Type':'application/json','X-Goog-FieldMask':'originIndex,destinationIndex,duration,distanceMeters'})
-	if response.status_code == 200 and response.text.find("error") < 0:
-		print("API key is \033[1;31;40mvulnerable\033[0m for Routes API - Route Matrix (v2)! Here is the PoC curl command which can be used from terminal:")
-		print("curl -X POST -H 'Content-Type: application/json' -H 'X-Goog-FieldMask: originIndex,destinationIndex,duration,distanceMeters' -d '{\"origins\":[{\"waypoint\":{\"location\":{\"latLng\":{\"latitude\":37.420761,\"longitude\":-122.081356}}}}],\"destinations\":[{\"waypoint\":{\"location\":{\"latLng\":{\"latitude\":37.420999,\"longitude\":-122.086894}}}}],\"travelMode\":\"DRIVE\"}' '"+url+"'")
-		vulnerable_apis.append("Routes API (Route Matrix) 	|| $10 per 1000 elements")
-	else:
-		print("API key is not vulnerable for Routes API - Route Matrix (v2).")
-		if response.text.find("error") >= 0:
-			try:
-				print("Reason: "+ response.json()["error"]["message"])
-			except:
-				print("Reason: "+ str(response.content))
-
-	test_number += 1
-	print("\n--------------------------")
-	print(f"{test_number}. Testing Places API - Nearby Search (New)")
-	print("--------------------------")
-	url = "https://places.googleapis.com/v1/places:searchNearby?key="+apikey
-	postdata = json.dumps({"includedTypes": ["restaurant"],"maxResultCount": 5,"locationRestriction": {"circle": {"center": {"latitude": 37.7937,"longitude": -122.3965},"radius": 500.0}}})
-	response = requests.post(url, data=postdata, verify=False, headers={'Content-Type':'application/json','X-Goog-FieldMask':'places.displayName,places.id'})
-	if response.status_code == 200 and response.text.find("error") < 0:
-		print("API key is \033[1;31;40mvulnerable\033[0m for Places API - Nearby Search (New)! Here is the PoC curl command which can be used from terminal:")
-		print("curl -X POST -H 'Content-Type: application/json' -H 'X-Goog-FieldMask: places.displayName' -d '{\"includedTypes\":[\"restaurant\"],\"maxResultCount\":5,\"locationRestriction\":{\"circle\":{\"center\":{\"latitude\":37.7937,\"longitude\":-122.3965},\"radius\":500.0}}}' '"+url+"'")
-		vulnerable_apis.append("Places API - Nearby Search (New) || $32 per 1000 requests")
-	else:
-		print("API key is not vulnerable for Places API - Nearby Search (New).")
-		if response.text.find("error") >= 0:
-			try:
-				print("Reason: "+ response.json()["error"]["message"])
-			except:
-				print("Reason: "+ str(response.content))
-
-	test_number += 1
-	print("\n--------------------------")
-	print(f"{test_number}. Testing Places API - Text Search (New)")
-	print("--------------------------")
-	url = "https://places.googleapis.com/v1/places:searchText?key="+apikey
-	postdata = json.dumps({"textQuery": "Spicy Vegetarian Food in Sydney, Australia"})
-	response = requests.post(url, data=postdata, verify=False, headers={'Content-Type':'application/json','X-Goog-FieldMask':'places.displayName,places.formattedAddress'})
-	if response.status_code == 200 and response.text.find("error") < 0:
-		print("API key is \033[1;31;40mvulnerable\033[0m for Places API - Text Search (New)! Here is the PoC curl command which can be used from terminal:")
-		print("curl -X POST -H 'Content-Type: application/json' -H 'X-Goog-FieldMask: places.displayName' -d '{\"textQuery\":\"restaurants in Sydney\"}' '"+url+"'")
-		vulnerable_apis.append("Places API - Text Search (New) 	|| $32 per 1000 requests")
-	else:
-		print("API key is not vulnerable for Places API - Text Search (New).")
-		if response.text.find("error") >= 0:
-			try:
-				print("Reason: "+ response.json()["error"]["message"])
-			except:
-				print("Reason: "+ str(response.content))
-
-	test_number += 1
-	print("\n--------------------------")
-	print(f"{test_number}. Testing Air Quality API")
-	print("--------------------------")
-	url = "https://airquality.googleapis.com/v1/currentConditions:lookup?key="+apikey
-	postdata = json.dumps({"location": {"latitude": 37.419734,"longitude": -122.0827784}})
-	response = requests.post(url, data=postdata, verify=False, headers={'Content-Type':'application/json'})
-	if response.status_code == 200 and response.text.find("error") < 0:
-		print("API key is \033[1;31;40mvulnerable\033[0m for Air Quality API! Here is the PoC curl command which can be used from terminal:")
-		print("curl -X POST -H 'Content-Type: application/json' -d '{\"location\":{\"latitude\":37.419734,\"longitude\":-122.0827784}}' '"+url+"'")
-		vulnerable_apis.append("Air Quality API 		|| Contact Google for pricing")
-	else:
-		print("API key is not vulnerable for Air Quality API.")
-		if response.text.find("error") >= 0:
-			try:
-				print("Reason: "+ response.json()["error"]["message"])
-			except:
-				print("Reason: "+ str(response.content))
-
-	test_number += 1
-	print("\n--------------------------")
-	print(f"{test_number}. Testing Pollen API")
-	print("--------------------------")
-	url = "https://pollen.googleapis.com/v1/forecast:lookup?key="+apikey+"&location.latitude=37.419734&location.longitude=-122.0827784&days=1"
-	response = requests.get(url, verify=False, proxies=proxies)
-	if response.status_code == 200 and response.text.find("error") < 0:
-		print("API key is \033[1;31;40mvulnerable\033[0m for Pollen API! Here is the PoC link which can be used directly via browser:")
-		print(url)
-		vulnerable_apis.append("Pollen API 			|| Contact Google for pricing")
-	else:
-		print("API key is not vulnerable for Pollen API.")
-		if response.text.find("error") >= 0:
-			try:
-				print("Reason: "+ response.json()["error"]["message"])
-			except:
-				print("Reason: "+ str(response.content))
-
-	test_number += 1
-	print("\n--------------------------")
-	print(f"{test_number}. Testing Solar API")
-	print("--------------------------")
-	url = "https://solar.googleapis.com/v1/buildingInsights:findClosest?location.latitude=37.4450&location.longitude=-122.1390&key="+apikey
-	response = requests.get(url, verify=False, proxies=proxies)
-	if response.status_code == 200 and response.text.find("error") < 0:
-		print("API key is \033[1;31;40mvulnerable\033[0m for Solar API! Here is the PoC link which can be used directly via browser:")
-		print(url)
-		vulnerable_apis.append("Solar API 			|| Contact Google for pricing")
-	else:
-		print("API key is not vulnerable for Solar API.")
-		if response.text.find("error") >= 0:
-			try:
-				print("Reason: "+ response.json()["error"]["message"])
-			except:
-				print("Reason: "+ str(response.content))
-
-	test_number += 1
-	print("\n--------------------------")
-	print(f"{test_number}. Testing Playable Locations API")
-	print("--------------------------")
-	url = "https://playablelocations.googleapis.com/v3:samplePlayableLocations?key="+apikey
-	postdata = json.dumps({"area_filter": {"s2_cell_id": 7715420662885515264},"criteria": [{"gameObjectType": 1,"filter": {"maxLocationCount": 4,"includedTypes": ["food_and_drink"]}}]})
-	response = requests.post(url, data=postdata, verify=False, headers={'Content-Type':'application/json'})
-	if response.status_code == 200 and response.text.find("error") < 0:
-		print("API key is \033[1;31;40mvulnerable\033[0m for Playable Locations API! Here is the PoC curl command which can be used from terminal:")
-		print("curl -X POST -H 'Content-Type: application/json' -d '{\"area_filter\":{\"s2_cell_id\":7715420662885515264},\"criteria\":[{\"gameObjectType\":1,\"filter\":{\"maxLocationCount\":4,\"includedTypes\":[\"food_and_drink\"]}}]}' '"+url+"'")
-		vulnerable_apis.append("Playable Locations API 		|| Contact Google for pricing")
-	else:
-		print("API key is not vulnerable for Playable Locations API.")
-		if response.text.find("error") >= 0:
-			try:
-				print("Reason: "+ response.json()["error"]["message"])
-			except:
-				print("Reason: "+ str(response.content))
-
-	test_number += 1
-	print("\n--------------------------")
-	print(f"{test_number}. Testing Aerial View API")
-	print("--------------------------")
-	url = "https://aerialview.googleapis.com/v1/videos:renderVideo?key="+apikey
-	postdata = json.dumps({"address": "1600 Amphitheatre Parkway, Mountain View, CA 94043"})
-	response = requests.post(url, data=postdata, verify=False, headers={'Content-Type':'application/json'})
-	if response.status_code == 200 and response.text.find("error") < 0:
-		print("API key is \033[1;31;40mvulnerable\033[0m for Aerial View API! Here is the PoC curl command which can be used from terminal:")
-		print("curl -X POST -H 'Content-Type: application/json' -d '{\"address\":\"1600 Amphitheatre Parkway, Mountain View, CA 94043\"}' '"+url+"'")
-		vulnerable_apis.append("Aerial View API 		|| Contact Google for pricing")
-	else:
-		print("API key is not vulnerable for Aerial View API.")
-		if response.text.find("error") >= 0:
-			try:
-				print("Reason: "+ response.json()["error"]["message"])
-			except:
-				print("Reason: "+ str(response.content))
-
-	test_number += 1
-	print("\n--------------------------")
-	print(f"{test_number}. Testing Map Tiles API")
-	print("--------------------------")
-	url = "https://tile.googleapis.com/v1/2dtiles/2/2/2?session=&key="+apikey
-	response = requests.get(url, verify=False, proxies=proxies)
-	if response.status_code == 200:
-		print("API key is \033[1;31;40mvulnerable\033[0m for Map Tiles API! Here is the PoC link which can be used directly via browser:")
-		print(url)
-		vulnerable_apis.append("Map Tiles API 			|| $2 per 1000 requests")
-	else:
-		print("API key is not vulnerable for Map Tiles API.")
-		if response.text.find("error") >= 0:
+# ---------------------------------------------------------------------------
+# Endpoint registry
+# ---------------------------------------------------------------------------
+
+def status_is(*codes: int) -> Callable[[requests.Response], bool]:
+	"""Vulnerable when the response status code is one of ``codes``."""
+	return lambda response: response.status_code in codes
+
+
+def lacks(marker: str, status: Optional[int] = None, limit: Optional[int] = CLASSIFY_PREFIX_BYTES) -> Callable[[requests.Response], bool]:
+	"""Vulnerable when ``marker`` is absent from the first ``limit`` bytes of the body (None: all of it) and the status matches, if given."""
+	needle = marker.encode()
+	def check(response):
+		if status is not None and response.status_code != status:
+			return False
+		return response.content.find(needle, 0, limit) < 0
+	return check
+
+
+def json_key(name: str) -> "re.Pattern[bytes]":
+	"""Pattern for ``"name":`` as a JSON object key, so the word inside a value does not match."""
+	return re.compile(b'"' + re.escape(name.encode()) + rb'"\s*:')
+
+
+def lacks_key(name: str, status: Optional[int] = None) -> Callable[[requests.Response], bool]:
+	"""Vulnerable when the body prefix has no ``name`` JSON key (and the status matches, if given)."""
+	pattern = json_key(name)
+	def check(response):
+		if status is not None and response.status_code != status:
+			return False
+		return pattern.search(response.content, 0, CLASSIFY_PREFIX_BYTES) is None
+	return check
+
+
+ERROR_KEY = json_key("error")
+
+
+def reason_content(response: requests.Response, url: str) -> Optional[str]:
+	return str(response.content)
+
+
+def reason_json(*path: str) -> Callable[[requests.Response, str], Optional[str]]:
+	"""Read the refusal reason from a field of the JSON error body."""
+	def reason(response, url):
+		value = response.json()
+		for part in path:
+			value = value[part]
+		return value
+	return reason
+
+
+def reason_json_error(response: requests.Response, url: str) -> Optional[str]:
+	"""Reason for the newer JSON APIs, which only sometimes return an error body."""
+	if ERROR_KEY.search(response.content, 0, CLASSIFY_PREFIX_BYTES) is None:
+		return None
+	try:
+		return response.json()["error"]["message"]
+	except Exception:
+		return str(response.content)
+
+
+def reason_image(response: requests.Response, url: str) -> Optional[str]:
+	if response.content.find(b"PNG", 0, 8) >= 0:
+		return "Manually check the "+url+" to view the reason."
+	return str(response.content)
+
+
+def reason_html_title(response: requests.Response, url: str) -> Optional[str]:
+	for lines in response.iter_lines():
+		if(("TITLE") in str(lines)):
+			return str(lines).split("TITLE")[1].split("<")[0].replace(">","")
+	return None
+
+
+def reason_jsapi(response: requests.Response, url: str) -> Optional[str]:
+	if response.content.find(b"InvalidKeyMapError") >= 0:
+		return "Invalid API key or key restrictions"
+	return str(response.content)[:200]
+
+
+@dataclass(frozen=True)
+class Endpoint:
+	"""Declarative description of one API probe."""
+	name: str
+	url: str
+	check: Callable[[requests.Response], bool]
+	reason: Callable[[requests.Response, str], Optional[str]]
+	costs: Tuple[str, ...]
+	title: Optional[str] = None
+	method: str = 'GET'
+	data: Any = None
+	headers: Dict[str, str] = field(default_factory=dict)
+	allow_redirects: bool = True
+	poc: Optional[str] = None
+	body_limit: Optional[int] = None
+	client_side: bool = False
+
+	@property
+	def host(self) -> str:
+		return urlsplit(self.url).netloc
+
+	def render_url(self, apikey: str, base_url: Optional[str] = None) -> str:
+		"""Fill in the key; ``base_url`` replaces the scheme and host (e.g. a local stub)."""
+		url = self.url.replace("{key}", apikey)
+		if base_url:
+			parts = urlsplit(url)
+			url = base_url.rstrip('/') + url[len(f"{parts.scheme}://{parts.netloc}"):]
+		return url
+
+	def render_headers(self, apikey: str) -> Dict[str, str]:
+		return {name: value.replace("{key}", apikey) for name, value in self.headers.items()}
+
+	def render_poc(self, apikey: str) -> str:
+		url = self.render_url(apikey)
+		if self.poc is None:
+			return url
+		return self.poc.replace("{url}", url).replace("{key}", apikey)
+
+
+JSON_HEADERS = {'Content-Type': 'application/json'}
+
+ENDPOINTS: List[Endpoint] = [
+	Endpoint(
+		name="Staticmap API",
+		url="https://maps.googleapis.com/maps/api/staticmap?center=45%2C10&zoom=7&size=1x1&key={key}",
+		check=status_is(200), reason=reason_image, body_limit=BODY_PREFIX_BYTES,
+		costs=("Staticmap 			|| $2 per 1000 requests",),
+		poc="https://maps.googleapis.com/maps/api/staticmap?center=45%2C10&zoom=7&size=400x400&key={key}",
+		client_side=True,
+	),
+	Endpoint(
+		name="Streetview API",
+		url="https://maps.googleapis.com/maps/api/streetview?size=1x1&location=40.720032,-73.988354&fov=90&heading=235&pitch=10&key={key}",
+		check=status_is(200), reason=reason_image, body_limit=BODY_PREFIX_BYTES,
+		costs=("Streetview 			|| $7 per 1000 requests",),
+		poc="https://maps.googleapis.com/maps/api/streetview?size=400x400&location=40.720032,-73.988354&fov=90&heading=235&pitch=10&key={key}",
+		client_side=True,
+	),
+	Endpoint(
+		name="Directions API",
+		url="https://maps.googleapis.com/maps/api/directions/json?origin=Disneyland&destination=Universal+Studios+Hollywood4&key={key}",
+		check=lacks_key("error_message"), reason=reason_json("error_message"),
+		costs=("Directions 			|| $5 per 1000 requests", "Directions (Advanced) 	|| $10 per 1000 requests"),
+	),
+	Endpoint(
+		name="Geocode API",
+		url="https://maps.googleapis.com/maps/api/geocode/json?latlng=40,30&key={key}",
+		check=lacks_key("error_message"), reason=reason_json("error_message"),
+		costs=("Geocode 			|| $5 per 1000 requests",),
+	),
+	Endpoint(
+		name="Distance Matrix API",
+		url="https://maps.googleapis.com/maps/api/distancematrix/json?units=imperial&origins=40.6655101,-73.89188969999998&destinations=40.6905615%2C-73.9976592%7C40.6905615%2C-73.9976592%7C40.6905615%2C-73.9976592%7C40.6905615%2C-73.9976592%7C40.6905615%2C-73.9976592%7C40.6905615%2C-73.9976592%7C40.659569%2C-73.933783%7C40.729029%2C-73.851524%7C40.6860072%2C-73.6334271%7C40.598566%2C-73.7527626%7C40.659569%2C-73.933783%7C40.729029%2C-73.851524%7C40.6860072%2C-73.6334271%7C40.598566%2C-73.7527626&key={key}",
+		check=lacks_key("error_message"), reason=reason_json("error_message"),
+		costs=("Distance Matrix 		|| $5 per 1000 elements", "Distance Matrix (Advanced) 	|| $10 per 1000 elements"),
+	),
+	Endpoint(
+		name="Find Place From Text API",
+		url="https://maps.googleapis.com/maps/api/place/findplacefromtext/json?input=Museum%20of%20Contemporary%20Art%20Australia&inputtype=textquery&fields=photos,formatted_address,name,rating,opening_hours,geometry&key={key}",
+		check=lacks_key("error_message"), reason=reason_json("error_message"),
+		costs=("Find Place From Text 		|| $17 per 1000 elements",),
+	),
+	Endpoint(
+		name="Autocomplete API",
+		url="https://maps.googleapis.com/maps/api/place/autocomplete/json?input=Bingh&types=%28cities%29&key={key}",
+		check=lacks_key("error_message"), reason=reason_json("error_message"),
+		costs=("Autocomplete 			|| $2.83 per 1000 requests", "Autocomplete Per Session 	|| $17 per 1000 requests"),
+	),
+	Endpoint(
+		name="Elevation API",
+		url="https://maps.googleapis.com/maps/api/elevation/json?locations=39.7391536,-104.9847034&key={key}",
+		check=lacks_key("error_message"), reason=reason_json("error_message"),
+		costs=("Elevation 			|| $5 per 1000 requests",),
+	),
+	Endpoint(
+		name="Timezone API",
+		url="https://maps.googleapis.com/maps/api/timezone/json?location=39.6034810,-119.6822510&timestamp=1331161200&key={key}",
+		check=lacks_key("errorMessage"), reason=reason_json("errorMessage"),
+		costs=("Timezone 			|| $5 per 1000 requests",),
+	),
+	Endpoint(
+		name="Nearest Roads API",
+		url="https://roads.googleapis.com/v1/nearestRoads?points=60.170880,24.942795|60.170879,24.942796|60.170877,24.942796&key={key}",
+		check=lacks_key("error"), reason=reason_json("error", "message"),
+		costs=("Nearest Roads 		|| $10 per 1000 requests",),
+	),
+	Endpoint(
+		name="Geolocation API",
+		url="https://www.googleapis.com/geolocation/v1/geolocate?key={key}",
+		method='POST', data={'considerIp': 'true'},
+		check=lacks_key("error"), reason=reason_json("error", "message"),
+		costs=("Geolocation 			|| $5 per 1000 requests",),
+		poc="curl -i -s -k  -X $'POST' -H $'Host: www.googleapis.com' -H $'Content-Length: 22' --data-binary $'{\"considerIp\": \"true\"}' $'{url}'",
+	),
+	Endpoint(
+		name="Route to Traveled API",
+		title="Route to Traveled API (Snap to Roads)",
+		url="https://roads.googleapis.com/v1/snapToRoads?path=-35.27801,149.12958|-35.28032,149.12907&interpolate=true&key={key}",
+		check=lacks_key("error"), reason=reason_json("error", "message"),
+		costs=("Route to Traveled 		|| $10 per 1000 requests",),
+	),
+	Endpoint(
+		name="Speed Limit-Roads API",
+		url="https://roads.googleapis.com/v1/speedLimits?path=38.75807927603043,-9.03741754643809&key={key}",
+		check=lacks_key("error"), reason=reason_json("error", "message"),
+		costs=("Speed Limit-Roads 		|| $20 per 1000 requests",),
+	),
+	Endpoint(
+		name="Place Details API",
+		url="https://maps.googleapis.com/maps/api/place/details/json?place_id=ChIJN1t_tDeuEmsRUsoyG83frY4&fields=name,rating,formatted_phone_number&key={key}",
+		check=lacks_key("error_message"), reason=reason_json("error_message"),
+		costs=("Place Details 		|| $17 per 1000 requests",),
+	),
+	Endpoint(
+		name="Nearby Search-Places API",
+		url="https://maps.googleapis.com/maps/api/place/nearbysearch/json?location=-33.8670522,151.1957362&radius=100&types=food&name=harbour&key={key}",
+		check=lacks_key("error_message"), reason=reason_json("error_message"),
+		costs=("Nearby Search-Places		|| $32 per 1000 requests",),
+	),
+	Endpoint(
+		name="Text Search-Places API",
+		url="https://maps.googleapis.com/maps/api/place/textsearch/json?query=restaurants+in+Sydney&key={key}",
+		check=lacks_key("error_message"), reason=reason_json("error_message"),
+		costs=("Text Search-Places 		|| $32 per 1000 requests",),
+	),
+	Endpoint(
+		name="Places Photo API",
+		url="https://maps.googleapis.com/maps/api/place/photo?maxwidth=400&photoreference=CnRtAAAATLZNl354RwP_9UKbQ_5Psy40texXePv4oAlgP4qNEkdIrkyse7rPXYGd9D_Uj1rVsQdWT4oRz4QrYAJNpFX7rzqqMlZw2h2E2y5IKMUZ7ouD_SlcHxYq1yL4KbKUv3qtWgTK0A6QbGh87GB3sscrHRIQiG2RrmU_jF4tENr9wGS_YxoUSSDrYjWmrNfeEHSGSc3FyhNLlBU&key={key}",
+		allow_redirects=False, body_limit=BODY_PREFIX_BYTES,
+		check=status_is(302),
+		reason=lambda response, url: "Verbose responses are not enabled for this API, cannot determine the reason.",
+		costs=("Places Photo 			|| $7 per 1000 requests",),
+	),
+	Endpoint(
+		name="FCM API",
+		url="https://fcm.googleapis.com/fcm/send",
+		method='POST', data="{'registration_ids':['ABC']}",
+		headers={'Content-Type': 'application/json', 'Authorization': 'key={key}'},
+		check=status_is(200), reason=reason_html_title,
+		costs=("FCM Takeover 			|| https://abss.me/posts/fcm-takeover/",),
+		poc="curl --header \"Authorization: key={key}\" --header Content-Type:\"application/json\" https://fcm.googleapis.com/fcm/send -d '{\"registration_ids\":[\"ABC\"]}'",
+	),
+	Endpoint(
+		name="Query Autocomplete API",
+		url="https://maps.googleapis.com/maps/api/place/queryautocomplete/json?input=pizza+near%20Par&key={key}",
+		check=lacks_key("error_message"), reason=reason_json("error_message"),
+		costs=("Query Autocomplete 		|| $2.83 per 1000 requests",),
+	),
+	Endpoint(
+		name="Address Validation API",
+		url="https://addressvalidation.googleapis.com/v1:validateAddress?key={key}",
+		method='POST', headers=JSON_HEADERS,
+		data=json.dumps({"address": {"regionCode": "US","addressLines": ["1600 Amphitheatre Pkwy, Mountain View, CA 94043"]}}),
+		check=lacks_key("error", status=200), reason=reason_json_error,
+		costs=("Address Validation 		|| $17 per 1000 requests",),
+		poc="curl -X POST -H 'Content-Type: application/json' -d '{\"address\":{\"regionCode\":\"US\",\"addressLines\":[\"1600 Amphitheatre Pkwy\"]}}' '{url}'",
+	),
+	Endpoint(
+		name="Routes API (v2)",
+		title="Routes API (v2 - Compute Routes)",
+		url="https://routes.googleapis.com/directions/v2:computeRoutes?key={key}",
+		method='POST', headers={'Content-Type': 'application/json', 'X-Goog-FieldMask': 'routes.duration,routes.distanceMeters'},
+		data=json.dumps({"origin":{"location":{"latLng":{"latitude": 37.419734,"longitude": -122.0827784}}},"destination":{"location":{"latLng":{"latitude": 37.417670,"longitude": -122.079595}}},"travelMode": "DRIVE"}),
+		check=lacks_key("error", status=200), reason=reason_json_error,
+		costs=("Routes API (Compute Routes) 	|| $5 per 1000 requests",),
+		poc="curl -X POST -H 'Content-Type: application/json' -H 'X-Goog-FieldMask: routes.duration,routes.distanceMeters' -d '{\"origin\":{\"location\":{\"latLng\":{\"latitude\":37.419734,\"longitude\":-122.0827784}}},\"destination\":{\"location\":{\"latLng\":{\"latitude\":37.417670,\"longitude\":-122.079595}}},\"travelMode\":\"DRIVE\"}' '{url}'",
+	),
+	Endpoint(
+		name="Routes API - Route Matrix (v2)",
+		title="Routes API (v2 - Route Matrix)",
+		url="https://routes.googleapis.com/distanceMatrix/v2:computeRouteMatrix?key={key}",
+		method='POST', headers={'Content-Type': 'application/json', 'X-Goog-FieldMask': 'originIndex,destinationIndex,duration,distanceMeters'},
+		data=json.dumps({"origins":[{"waypoint":{"location":{"latLng":{"latitude":37.420761,"longitude":-122.081356}}}}],"destinations":[{"waypoint":{"location":{"latLng":{"latitude":37.420999,"longitude":-122.086894}}}}],"travelMode":"DRIVE"}),
+		check=lacks_key("error", status=200), reason=reason_json_error,
+		costs=("Routes API (Route Matrix) 	|| $10 per 1000 elements",),
+		poc="curl -X POST -H 'Content-Type: application/json' -H 'X-Goog-FieldMask: originIndex,destinationIndex,duration,distanceMeters' -d '{\"origins\":[{\"waypoint\":{\"location\":{\"latLng\":{\"latitude\":37.420761,\"longitude\":-122.081356}}}}],\"destinations\":[{\"waypoint\":{\"location\":{\"latLng\":{\"latitude\":37.420999,\"longitude\":-122.086894}}}}],\"travelMode\":\"DRIVE\"}' '{url}'",
+	),
+	Endpoint(
+		name="Places API - Nearby Search (New)",
+		url="https://places.googleapis.com/v1/places:searchNearby?key={key}",
+		method='POST', headers={'Content-Type': 'application/json', 'X-Goog-FieldMask': 'places.displayName,places.id'},
+		data=json.dumps({"includedTypes": ["restaurant"],"maxResultCount": 5,"locationRestriction": {"circle": {"center": {"latitude": 37.7937,"longitude": -122.3965},"radius": 500.0}}}),
+		check=lacks_key("error", status=200), reason=reason_json_error,
+		costs=("Places API - Nearby Search (New) || $32 per 1000 requests",),
+		poc="curl -X POST -H 'Content-Type: application/json' -H 'X-Goog-FieldMask: places.displayName' -d '{\"includedTypes\":[\"restaurant\"],\"maxResultCount\":5,\"locationRestriction\":{\"circle\":{\"center\":{\"latitude\":37.7937,\"longitude\":-122.3965},\"radius\":500.0}}}' '{url}'",
+	),
+	Endpoint(
+		name="Places API - Text Search (New)",
+		url="https://places.googleapis.com/v1/places:searchText?key={key}",
+		method='POST', headers={'Content-Type': 'application/json', 'X-Goog-FieldMask': 'places.displayName,places.formattedAddress'},
+		data=json.dumps({"textQuery": "Spicy Vegetarian Food in Sydney, Australia"}),
+		check=lacks_key("error", status=200), reason=reason_json_error,
+		costs=("Places API - Text Search (New) 	|| $32 per 1000 requests",),
+		poc="curl -X POST -H 'Content-Type: application/json' -H 'X-Goog-FieldMask: places.displayName' -d '{\"textQuery\":\"restaurants in Sydney\"}' '{url}'",
+	),
+	Endpoint(
+		name="Air Quality API",
+		url="https://airquality.googleapis.com/v1/currentConditions:lookup?key={key}",
+		method='POST', headers=JSON_HEADERS,
+		data=json.dumps({"location": {"latitude": 37.419734,"longitude": -122.0827784}}),
+		check=lacks_key("error", status=200), reason=reason_json_error,
+		costs=("Air Quality API 		|| Contact Google for pricing",),
+		poc="curl -X POST -H 'Content-Type: application/json' -d '{\"location\":{\"latitude\":37.419734,\"longitude\":-122.0827784}}' '{url}'",
+	),
+	Endpoint(
+		name="Pollen API",
+		url="https://pollen.googleapis.com/v1/forecast:lookup?key={key}&location.latitude=37.419734&location.longitude=-122.0827784&days=1",
+		check=lacks_key("error", status=200), reason=reason_json_error,
+		costs=("Pollen API 			|| Contact Google for pricing",),
+	),
+	Endpoint(
+		name="Solar API",
+		url="https://solar.googleapis.com/v1/buildingInsights:findClosest?location.latitude=37.4450&location.longitude=-122.1390&key={key}",
+		check=lacks_key("error", status=200), reason=reason_json_error,
+		costs=("Solar API 			|| Contact Google for pricing",),
+	),
+	Endpoint(
+		name="Playable Locations API",
+		url="https://playablelocations.googleapis.com/v3:samplePlayableLocations?key={key}",
+		method='POST', headers=JSON_HEADERS,
+		data=json.dumps({"area_filter": {"s2_cell_id": 7715420662885515264},"criteria": [{"gameObjectType": 1,"filter": {"maxLocationCount": 4,"includedTypes": ["food_and_drink"]}}]}),
+		check=lacks_key("error", status=200), reason=reason_json_error,
+		costs=("Playable Locations API 		|| Contact Google for pricing",),
+		poc="curl -X POST -H 'Content-Type: application/json' -d '{\"area_filter\":{\"s2_cell_id\":7715420662885515264},\"criteria\":[{\"gameObjectType\":1,\"filter\":{\"maxLocationCount\":4,\"includedTypes\":[\"food_and_drink\"]}}]}' '{url}'",
+	),
+	Endpoint(
+		name="Aerial View API",
+		url="https://aerialview.googleapis.com/v1/videos:renderVideo?key={key}",
+		method='POST', headers=JSON_HEADERS,
+		data=json.dumps({"address": "1600 Amphitheatre Parkway, Mountain View, CA 94043"}),
+		check=lacks_key("error", status=200), reason=reason_json_error,
+		costs=("Aerial View API 		|| Contact Google for pricing",),
+		poc="curl -X POST -H 'Content-Type: application/json' -d '{\"address\":\"1600 Amphitheatre Parkway, Mountain View, CA 94043\"}' '{url}'",
+	),
+	Endpoint(
+		name="Map Tiles API",
+		url="https://tile.googleapis.com/v1/2dtiles/2/2/2?session=&key={key}",
+		check=status_is(200), reason=reason_json_error, body_limit=BODY_PREFIX_BYTES,
+		costs=("Map Tiles API 			|| $2 per 1000 requests",),
+	),
+	Endpoint(
+		name="Maps Embed API",
+		url="https://www.google.com/maps/embed/v1/place?key={key}&q=Space+Needle,Seattle+WA",
+		allow_redirects=False,
+		check=status_is(200, 302), reason=reason_content,
+		costs=("Maps Embed API 			|| Free (with restrictions)",),
+		client_side=True,
+	),
+	Endpoint(
+		name="Maps JavaScript API",
+		url="https://maps.googleapis.com/maps/api/js?key={key}&callback=initMap",
+		check=lacks("InvalidKeyMapError", status=200, limit=None), reason=reason_jsapi,
+		costs=("Maps JavaScript API 		|| $7 per 1000 requests",),
+		client_side=True,
+	),
+]
+
+
+# Cheap probe sent first to every key to find dead ones before the full matrix
+TRIAGE_ENDPOINT = next(endpoint for endpoint in ENDPOINTS if endpoint.name == "Geocode API")
+
+# Position of each endpoint in ENDPOINTS, the order results are reported in
+ENDPOINT_INDEX = {endpoint.name: i for i, endpoint in enumerate(ENDPOINTS)}
+
+
+def list_price(endpoint: Endpoint) -> float:
+	"""Highest list price among the endpoint's cost lines, in USD per 1000 requests; 0 if Google publishes none."""
+	return max((float(match.group(1)) for match in map(PRICE_PATTERN.search, endpoint.costs) if match), default=0.0)
+
+
+# What an exposed key lets anyone bill to its owner, per endpoint, in USD per 1000 requests
+PRICES = {endpoint.name: list_price(endpoint) for endpoint in ENDPOINTS}
+
+
+def by_price(endpoints: Iterable[Endpoint]) -> List[Endpoint]:
+	"""Most expensive exposure first; endpoints with the same price keep their order."""
+	return sorted(endpoints, key=lambda endpoint: -PRICES.get(endpoint.name, 0.0))
+
+
+def exposure(results: Iterable["ProbeResult"]) -> float:
+	"""Summed list price of the APIs the results found exposed, in USD per 1000 requests to each."""
+	return sum(PRICES.get(r.endpoint.name, 0.0) for r in results if r.vulnerable)
+
+
+def format_exposure(amount: float) -> str:
+	return f"${amount:,.2f} per 1000 requests"
+
+
+@dataclass
+class ProbeTiming:
+	"""Where one probe's time went, in seconds; phases that did not happen or cannot be measured are None."""
+
+	PHASES = ('queue', 'dns', 'connect', 'tls', 'ttfb', 'body', 'classify')
+
+	queue: Optional[float] = None
+	dns: Optional[float] = None
+	connect: Optional[float] = None
+	tls: Optional[float] = None
+	ttfb: Optional[float] = None
+	body: Optional[float] = None
+	classify: Optional[float] = None
+	headers_at: Optional[float] = field(default=None, repr=False)
+
+	def add(self, phase: str, seconds: float) -> None:
+		setattr(self, phase, (getattr(self, phase) or 0.0) + seconds)
+
+	def as_dict(self) -> Dict[str, Optional[float]]:
+		return {phase: getattr(self, phase) for phase in self.PHASES}
+
+
+class Verdict(enum.Enum):
+	"""What a probe says about a key and one API."""
+	VULNERABLE = 'vulnerable'
+	# Refused by the key's restrictions (API, referer, IP or app)
+	DENIED = 'denied'
+	INVALID_KEY = 'invalid_key'
+	# Rate limited or out of quota: no verdict on the key
+	QUOTA = 'quota'
+	# The API is not enabled or billed on the key's project
+	NOT_ENABLED = 'not_enabled'
+	ERROR = 'error'
+
+
+class Restriction(enum.Enum):
+	"""Why a key is refused everywhere (or by every web service), read from a refusal reason."""
+	INVALID = 'invalid'
+	EXPIRED = 'expired'
+	# Restricted to browsers on some referrers: only client-side APIs may still answer
+	REFERER = 'referer'
+	# Restricted to other client IPs or to Android/iOS apps
+	IP = 'ip'
+	APP = 'app'
+
+	def blocks(self, endpoint: Endpoint) -> bool:
+		"""True if every probe of ``endpoint`` is bound to be refused the same way."""
+		if self in (Restriction.INVALID, Restriction.EXPIRED):
+			return True
+		return not endpoint.client_side
+
+
+def restriction_of(reason: Optional[str]) -> Optional[Restriction]:
+	"""The key-wide restriction a refusal reason reveals, or None if it only concerns one API."""
+	if reason:
+		for marker, restriction in RESTRICTION_MARKERS:
+			if marker in reason:
+				return Restriction(restriction)
+	return None
+
+
+@dataclass
+class ProbeResult:
+	"""Outcome of running one endpoint probe against one key.
+
+	``inferred`` results were never sent: their verdict was deduced from
+	another probe (e.g. the key failed triage as invalid). ``elapsed`` is the
+	wall time of the last attempt's request and classification, in seconds,
+	and ``timing`` breaks it (and the queue wait before it) into phases.
+	"""
+	endpoint: Endpoint
+	apikey: str
+	vulnerable: bool = False
+	status_code: Optional[int] = None
+	reason: Optional[str] = None
+	error: Optional[str] = None
+	throttled: bool = False
+	attempts: int = 1
+	invalid_key: bool = False
+	inferred: bool = False
+	cached: bool = False
+	elapsed: Optional[float] = None
+	timing: Optional[ProbeTiming] = None
+
+	@property
+	def verdict(self) -> Verdict:
+		"""Structured outcome, derived from the flags and the reason so cached results have one too."""
+		if self.throttled:
+			return Verdict.QUOTA
+		if self.error is not None:
+			return Verdict.ERROR
+		if self.vulnerable:
+			return Verdict.VULNERABLE
+		if self.invalid_key:
+			return Verdict.INVALID_KEY
+		if self.reason and any(marker in self.reason for marker in NOT_ENABLED_MARKERS):
+			return Verdict.NOT_ENABLED
+		return Verdict.DENIED
+
+	@property
+	def restriction(self) -> Optional[Restriction]:
+		"""Key-wide restriction behind a refusal, which lets the key's other probes be inferred."""
+		if self.vulnerable or self.throttled or self.error is not None:
+			return None
+		return restriction_of(self.reason)
+
+
+def is_throttled(response) -> bool:
+	"""True if Google rate limited the request (HTTP 429 or an OVER_QUERY_LIMIT style body)."""
+	if response.status_code == 429:
+		return True
+	return any(response.content.find(marker, 0, CLASSIFY_PREFIX_BYTES) >= 0 for marker in THROTTLE_MARKERS)
+
+
+def probe(session: requests.Session, endpoint: Endpoint, apikey: str, timeout: Optional[float] = None, base_url: Optional[str] = None) -> ProbeResult:
+	"""Run one endpoint probe against one key.
+
+	Transport errors are captured on the result rather than raised, so a single
+	failing request never aborts a scan.
+	"""
+	url = endpoint.render_url(apikey, base_url)
+	timing = ProbeTiming()
+	_probe_timing.current = timing
+	started = time.perf_counter()
+	try:
+		response = session.request(
+			endpoint.method, url,
+			data=endpoint.data,
+			headers=endpoint.render_headers(apikey) or None,
+			allow_redirects=endpoint.allow_redirects,
+			timeout=timeout,
+			stream=endpoint.body_limit is not None,
+		)
+		if endpoint.body_limit is not None:
+			response = read_prefix(response, endpoint.body_limit)
+	except Exception as e:
+		return ProbeResult(endpoint, apikey, error=str(e), elapsed=time.perf_counter() - started, timing=timing)
+	finally:
+		_probe_timing.current = None
+	received = time.perf_counter()
+	if timing.headers_at is not None:
+		timing.ttfb = timing.headers_at - started - (timing.connect or 0.0) - (timing.tls or 0.0)
+		timing.body = received - timing.headers_at
+	result = classify(endpoint, apikey, url, response)
+	result.elapsed = time.perf_counter() - started
+	timing.classify = result.elapsed - (received - started)
+	result.timing = timing
+	return result
+
+
+_UNPARSED = object()
+
+
+def read_prefix(response: requests.Response, limit: int) -> "BufferedResponse":
+	"""Read at most ``limit`` bytes of a streamed response, then release it.
+
+	A body that fits is read to the end, so its connection goes back to the
+	pool; a longer one is cut off and its connection closed instead of
+	downloading the rest.
+	"""
+	body = b""
+	try:
+		for chunk in response.iter_content(chunk_size=limit):
+			body += chunk
+			if len(body) >= limit:
+				break
+	finally:
+		response.close()
+	return BufferedResponse(response.status_code, body[:limit], response.headers, response.encoding)
+
+
+def classify(endpoint: Endpoint, apikey: str, url: str, response) -> ProbeResult:
+	"""Apply an endpoint's success predicate and reason extractor to a response.
+
+	The predicates look at the status and at most ``CLASSIFY_PREFIX_BYTES``
+	of the raw body; the body is never decoded to text and JSON is parsed
+	once, only when a refusal reason is needed. The result's ``verdict``
+	gives the outcome.
+	"""
+	if not isinstance(response, BufferedResponse):
+		response = BufferedResponse(response.status_code, response.content, response.headers, response.encoding)
+	result = ProbeResult(endpoint, apikey, status_code=response.status_code)
+	try:
+		if is_throttled(response):
+			result.throttled = True
+			result.error = f"Throttled (HTTP {response.status_code})"
+			return result
+		# A server-side failure says nothing about the key, so it is not a verdict
+		if response.status_code >= 500:
+			result.error = f"Server error (HTTP {response.status_code})"
+			return result
+		result.vulnerable = endpoint.check(response)
+	except Exception as e:
+		result.error = str(e)
+		return result
+	if not result.vulnerable:
+		try:
+			result.reason = endpoint.reason(response, url)
+		except Exception:
+			result.reason = str(response.content)
+		if result.reason and any(marker in result.reason for marker in INVALID_KEY_MARKERS):
+			result.invalid_key = True
+	return result
+
+
+def inferred_result(endpoint: Endpoint, apikey: str, decisive: ProbeResult) -> ProbeResult:
+	"""Result recorded for a probe skipped because ``decisive`` showed a restriction that blocks it."""
+	return ProbeResult(endpoint, apikey, reason=decisive.reason, invalid_key=decisive.invalid_key, inferred=True)
+
+
+def restriction_plan(endpoints: List[Endpoint], decisive: ProbeResult) -> Dict[str, ProbeResult]:
+	"""Inferred results, by endpoint name, for the probes that ``decisive``'s restriction makes pointless."""
+	restriction = decisive.restriction
+	if restriction is None and not decisive.invalid_key:
+		return {}
+	return {
+		endpoint.name: inferred_result(endpoint, decisive.apikey, decisive)
+		for endpoint in endpoints
+		if endpoint.name != decisive.endpoint.name and (restriction is None or restriction.blocks(endpoint))
+	}
+
+
+def completed_future(result: ProbeResult) -> Future:
+	future = Future()
+	future.set_result(result)
+	return future
+
+
+# ---------------------------------------------------------------------------
+# Rate limiting
+# ---------------------------------------------------------------------------
+
+class _HostBucket:
+	"""Token bucket and counters for one API host."""
+	__slots__ = ('rate', 'tokens', 'refilled', 'sent', 'last_send', 'throttles', 'last_cut')
+
+	def __init__(self, rate: float, now: float):
+		self.rate = rate
+		self.tokens = rate
+		self.refilled = now
+		self.sent = 0
+		self.last_send = now
+		self.throttles = 0
+		self.last_cut = float('-inf')
+
+
+class HostRateLimiter:
+	"""Adaptive token bucket per API host.
+
+	Each host starts at ``rate`` requests per second with one second of burst.
+	A throttled response halves that host's rate (at most once per
+	``THROTTLE_COOLDOWN``, so one burst of 429s counts as a single signal) and
+	every clean response adds ``RATE_INCREASE_STEP`` back (AIMD), so the
+	limiter settles just below the point where Google starts answering
+	OVER_QUERY_LIMIT / 429. Thread-safe; callers sleep for the delay returned
+	by ``reserve`` themselves, which lets the same limiter serve both the
+	thread and the asyncio engine.
+	"""
+
+	def __init__(self, rate: float = DEFAULT_HOST_RATE, min_rate: float = MIN_HOST_RATE, max_rate: float = MAX_HOST_RATE, backoff_base: float = BACKOFF_BASE, backoff_cap: float = BACKOFF_CAP):
+		self.initial_rate = rate
+		self.min_rate = min(min_rate, rate)
+		self.max_rate = max(max_rate, rate)
+		self.backoff_base = backoff_base
+		self.backoff_cap = backoff_cap
+		self.lock = threading.Lock()
+		self.buckets: Dict[str, _HostBucket] = {}
+		self.started = time.monotonic()
+
+	def _bucket(self, host: str, now: float) -> _HostBucket:
+		bucket = self.buckets.get(host)
+		if bucket is None:
+			bucket = self.buckets[host] = _HostBucket(self.initial_rate, now)
+		return bucket
+
+	def reserve(self, host: str) -> float:
+		"""Take one token for ``host`` and return how long to wait before sending."""
+		with self.lock:
+			now = time.monotonic()
+			bucket = self._bucket(host, now)
+			bucket.tokens = min(bucket.rate, bucket.tokens + (now - bucket.refilled) * bucket.rate) - 1
+			bucket.refilled = now
+			delay = -bucket.tokens / bucket.rate if bucket.tokens < 0 else 0.0
+			bucket.sent += 1
+			bucket.last_send = now + delay
+			return delay
+
+	def succeeded(self, host: str) -> None:
+		with self.lock:
+			bucket = self._bucket(host, time.monotonic())
+			bucket.rate = min(self.max_rate, bucket.rate + RATE_INCREASE_STEP)
+
+	def throttled(self, host: str) -> None:
+		with self.lock:
+			now = time.monotonic()
+			bucket = self._bucket(host, now)
+			bucket.throttles += 1
+			if now - bucket.last_cut >= THROTTLE_COOLDOWN:
+				bucket.rate = max(self.min_rate, bucket.rate / 2)
+				bucket.tokens = min(bucket.tokens, 0.0)
+				bucket.last_cut = now
+
+	def backoff(self, attempt: int) -> float:
+		"""Exponential backoff with full jitter for the ``attempt``-th retry."""
+		return random.uniform(0, min(self.backoff_cap, self.backoff_base * 2 ** attempt))
+
+	def rate(self, host: str) -> float:
+		"""Current allowed requests/sec for ``host``."""
+		with self.lock:
+			return self._bucket(host, time.monotonic()).rate
+
+	def effective_rps(self) -> Dict[str, float]:
+		"""Mean requests/sec sent to each host since the limiter was created; hosts sent fewer than two are left out."""
+		with self.lock:
+			return {
+				host: (bucket.sent - 1) / (bucket.last_send - self.started)
+				for host, bucket in self.buckets.items()
+				if bucket.sent >= 2 and bucket.last_send > self.started
+			}
+
+	def throttle_counts(self) -> Dict[str, int]:
+		with self.lock:
+			return {host: bucket.throttles for host, bucket in self.buckets.items()}
+
+
+class ProbeBudget:
+	"""Caps a scan at ``max_requests`` requests and stops it sending any after ``deadline`` seconds.
+
+	Engines call ``take`` right before each attempt goes out (retries
+	included); once it refuses, the probe is reported with a
+	``BUDGET_EXHAUSTED`` error, an unknown verdict, instead of being sent.
+	"""
+
+	def __init__(self, max_requests: Optional[int] = None, deadline: Optional[float] = None):
+		self.max_requests = max_requests
+		self.deadline_at = time.monotonic() + deadline if deadline is not None else None
+		self.sent = 0
+		self.refused = 0
+		self.lock = threading.Lock()
+
+	def take(self) -> bool:
+		with self.lock:
+			if (self.max_requests is not None and self.sent >= self.max_requests) or (self.deadline_at is not None and time.monotonic() >= self.deadline_at):
+				self.refused += 1
+				return False
+			self.sent += 1
+			return True
+
+
+def print_budget_summary(budget: Optional[ProbeBudget]) -> None:
+	if budget is not None:
+		print(f"[+] Budget: {budget.sent} requests sent, {budget.refused} probes not sent")
+
+
+# ---------------------------------------------------------------------------
+# Probe engines
+# ---------------------------------------------------------------------------
+
+class ThreadEngine:
+	"""Runs probes on a bounded thread pool sharing one pooled session.
+
+	Throttled probes are re-queued on the pool after a jittered backoff
+	instead of occupying a worker while they wait.
+	"""
+
+	def __init__(self, session: requests.Session, concurrency: int = 1, timeout: Optional[float] = BATCH_TIMEOUT, base_url: Optional[str] = None, limiter: Optional[HostRateLimiter] = None, max_retries: int = DEFAULT_MAX_RETRIES, budget: Optional[ProbeBudget] = None):
+		self.session = session
+		self.timeout = timeout
+		self.base_url = base_url
+		self.limiter = limiter or HostRateLimiter()
+		self.max_retries = max_retries
+		self.budget = budget
+		self.executor = ThreadPoolExecutor(max_workers=max(1, concurrency))
+		self.closing = False
+
+	def submit(self, endpoint: Endpoint, apikey: str) -> Future:
+		future = Future()
+		self.executor.submit(self._run, future, endpoint, apikey, 0, time.perf_counter())
+		return future
+
+	def _requeue(self, future: Future, result: ProbeResult, attempt: int, submitted: float) -> None:
+		timer = threading.Timer(self.limiter.backoff(attempt - 1), self._resubmit, (future, result, attempt, submitted))
+		timer.daemon = True
+		timer.start()
+
+	def _resubmit(self, future: Future, result: ProbeResult, attempt: int, submitted: float) -> None:
+		# The engine may have shut down while the backoff ran; settle for the throttled verdict
+		if not self.closing:
 			try:
-				print("Reason: "+ response.json()["error"]["message"])
-			except:
-				print("Reason: "+ str(response.content))
-
-	test_number += 1
-	print("\n--------------------------")
-	print(f"{test_number}. Testing Maps Embed API")
-	print("--------------------------")
-	url = "https://www.google.com/maps/embed/v1/place?key="+apikey+"&q=Space+Needle,Seattle+WA"
-	response = requests.get(url, verify=False, allow_redirects=False)
-	if response.status_code == 200 or response.status_code == 302:
-		print("API key is \033[1;31;40mvulnerable\033[0m for Maps Embed API! Here is the PoC link which can be used directly via browser:")
-		print(url)
-		vulnerable_apis.append("Maps Embed API 			|| Free (with restrictions)")
-	else:
-		print("API key is not vulnerable for Maps Embed API.")
-		print("Reason: "+ str(response.content))
-
-	test_number += 1
-	print("\n--------------------------")
-	print(f"{test_number}. Testing Maps JavaScript API")
-	print("--------------------------")
-	url = "https://maps.googleapis.com/maps/api/js?key="+apikey+"&callback=initMap"
-	response = requests.get(url, verify=False, proxies=proxies)
-	if response.status_code == 200 and response.text.find("InvalidKeyMapError") < 0:
-		print("API key is \033[1;31;40mvulnerable\033[0m for Maps JavaScript API! Here is the PoC link which can be used directly via browser:")
-		print(url)
-		vulnerable_apis.append("Maps JavaScript API 		|| $7 per 1000 requests")
-	else:
-		print("API key is not vulnerable for Maps JavaScript API.")
-		if response.text.find("InvalidKeyMapError") >= 0:
-			print("Reason: Invalid API key or key restrictions")
-		else:
-			print("Reason: "+ str(response.content)[:200])
+				self.executor.submit(self._run, future, result.endpoint, result.apikey, attempt, submitted)
+				return
+			except RuntimeError:
+				pass
+		future.set_result(result)
+
+	def _run(self, future: Future, endpoint: Endpoint, apikey: str, attempt: int, submitted: float) -> None:
+		if self.closing:
+			future.cancel()
+			return
+		try:
+			time.sleep(self.limiter.reserve(endpoint.host))
+			if self.budget is not None and not self.budget.take():
+				future.set_result(ProbeResult(endpoint, apikey, error=BUDGET_EXHAUSTED, attempts=attempt + 1))
+				return
+			started = time.perf_counter()
+			result = probe(self.session, endpoint, apikey, self.timeout, self.base_url)
+			result.attempts = attempt + 1
+			if result.timing is not None:
+				result.timing.queue = started - submitted
+			if result.throttled:
+				self.limiter.throttled(endpoint.host)
+				if attempt < self.max_retries:
+					self._requeue(future, result, attempt + 1, submitted)
+					return
+			elif result.error is None:
+				self.limiter.succeeded(endpoint.host)
+			future.set_result(result)
+		except Exception as e:
+			future.set_exception(e)
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, exc_type, exc_value, traceback):
+		# On an exception (e.g. Ctrl-C) drop queued probes instead of running them all
+		if exc_type is not None:
+			self.closing = True
+		self.executor.shutdown(wait=True)
+
+
+class BufferedResponse:
+	"""Minimal stand-in for requests.Response over a body (or body prefix) that has already been read.
+
+	Unlike requests, ``text`` never guesses the charset, and ``json`` parses
+	the body at most once.
+	"""
+
+	def __init__(self, status_code: int, content: bytes, headers=None, encoding: Optional[str] = None):
+		self.status_code = status_code
+		self.content = content
+		self.headers = headers or {}
+		self.encoding = encoding or 'utf-8'
+		self.parsed: Any = _UNPARSED
+
+	@property
+	def text(self) -> str:
+		return self.content.decode(self.encoding, errors='replace')
+
+	def json(self):
+		if self.parsed is _UNPARSED:
+			self.parsed = json.loads(self.content)
+		return self.parsed
+
+	def iter_lines(self):
+		return iter(self.content.splitlines())
+
+
+class AsyncEngine:
+	"""Runs probes as coroutines on one asyncio event loop in a background thread.
+
+	``concurrency`` bounds the number of in-flight probes overall and
+	``per_host`` bounds it per Google API host, so thousands of probes can be
+	queued without opening thousands of sockets to a single host. ``submit``
+	returns a ``concurrent.futures.Future`` so callers can treat both engines
+	the same way.
+	"""
+
+	def __init__(self, proxy_url: Optional[str] = None, concurrency: int = 100, per_host: int = DEFAULT_PER_HOST_LIMIT, timeout: Optional[float] = BATCH_TIMEOUT, base_url: Optional[str] = None, limiter: Optional[HostRateLimiter] = None, max_retries: int = DEFAULT_MAX_RETRIES, budget: Optional[ProbeBudget] = None):
+		if aiohttp is None:
+			raise ImportError("The async engine requires aiohttp: pip install 'eva-gmapsapiscanner[async]'")
+		self.proxy_url = proxy_url
+		self.concurrency = max(1, concurrency)
+		self.per_host = max(1, per_host)
+		self.timeout = timeout
+		self.base_url = base_url
+		self.limiter = limiter or HostRateLimiter()
+		self.max_retries = max_retries
+		self.budget = budget
+		self.loop = asyncio.new_event_loop()
+		self.thread = threading.Thread(target=self.loop.run_forever, name="eva-async-engine", daemon=True)
+		self.client = None
+		self.limit = None
+		self.host_limits: Dict[str, asyncio.Semaphore] = {}
+
+	async def _open(self):
+		self.limit = asyncio.Semaphore(self.concurrency)
+		self.client = aiohttp.ClientSession(
+			connector=aiohttp.TCPConnector(limit=self.concurrency, ssl=False),
+			timeout=aiohttp.ClientTimeout(total=self.timeout),
+			trace_configs=[self._trace_config()],
+		)
+
+	@staticmethod
+	def _trace_config():
+		"""Record DNS and connection setup on the ``ProbeTiming`` passed as ``trace_request_ctx``."""
+		config = aiohttp.TraceConfig()
+
+		async def dns_start(session, context, params):
+			context.dns_started = time.perf_counter()
+
+		async def dns_end(session, context, params):
+			context.trace_request_ctx.add('dns', time.perf_counter() - context.dns_started)
+
+		async def connect_start(session, context, params):
+			context.connect_started = time.perf_counter()
+			context.dns_before = context.trace_request_ctx.dns or 0.0
+
+		async def connect_end(session, context, params):
+			timing = context.trace_request_ctx
+			# Connection setup resolves the host itself; keep DNS in its own phase
+			resolving = (timing.dns or 0.0) - context.dns_before
+			timing.add('connect', time.perf_counter() - context.connect_started - resolving)
+
+		config.on_dns_resolvehost_start.append(dns_start)
+		config.on_dns_resolvehost_end.append(dns_end)
+		config.on_connection_create_start.append(connect_start)
+		config.on_connection_create_end.append(connect_end)
+		return config
+
+	async def _close(self, cancel: bool = False):
+		if cancel:
+			pending = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+			for task in pending:
+				task.cancel()
+			await asyncio.gather(*pending, return_exceptions=True)
+		await self.client.close()
+
+	async def probe(self, endpoint: Endpoint, apikey: str, submitted: Optional[float] = None) -> ProbeResult:
+		"""Probe with rate limiting; throttled attempts back off and go round again."""
+		host = endpoint.host
+		submitted = time.perf_counter() if submitted is None else submitted
+		# Always at least one attempt, whatever max_retries says
+		for attempt in range(max(self.max_retries, 0) + 1):
+			await asyncio.sleep(self.limiter.reserve(host))
+			result = await self._probe_once(endpoint, apikey, submitted)
+			result.attempts = attempt + 1
+			if not result.throttled:
+				if result.error is None:
+					self.limiter.succeeded(host)
+				break
+			self.limiter.throttled(host)
+			if attempt < self.max_retries:
+				await asyncio.sleep(self.limiter.backoff(attempt))
+		return result
+
+	async def _probe_once(self, endpoint: Endpoint, apikey: str, submitted: float) -> ProbeResult:
+		host_limit = self.host_limits.setdefault(endpoint.host, asyncio.Semaphore(self.per_host))
+		url = endpoint.render_url(apikey, self.base_url)
+		async with self.limit, host_limit:
+			if self.budget is not None and not self.budget.take():
+				return ProbeResult(endpoint, apikey, error=BUDGET_EXHAUSTED)
+			started = time.perf_counter()
+			timing = ProbeTiming(queue=started - submitted)
+			try:
+				async with self.client.request(
+					endpoint.method, url,
+					data=endpoint.data,
+					headers=endpoint.render_headers(apikey) or None,
+					allow_redirects=endpoint.allow_redirects,
+					proxy=self.proxy_url,
+					trace_request_ctx=timing,
+				) as response:
+					headers_at = time.perf_counter()
+					if endpoint.body_limit is None:
+						body = await response.read()
+					else:
+						# Leaving the block before the body has arrived closes the connection
+						try:
+							body = await response.content.readexactly(endpoint.body_limit)
+						except asyncio.IncompleteReadError as e:
+							body = e.partial
+					buffered = BufferedResponse(response.status, body, response.headers, response.charset)
+			except Exception as e:
+				return ProbeResult(endpoint, apikey, error=str(e) or type(e).__name__, elapsed=time.perf_counter() - started, timing=timing)
+		received = time.perf_counter()
+		timing.ttfb = headers_at - started - (timing.dns or 0.0) - (timing.connect or 0.0)
+		timing.body = received - headers_at
+		result = classify(endpoint, apikey, url, buffered)
+		result.elapsed = time.perf_counter() - started
+		timing.classify = result.elapsed - (received - started)
+		result.timing = timing
+		return result
+
+	def submit(self, endpoint: Endpoint, apikey: str) -> Future:
+		return asyncio.run_coroutine_threadsafe(self.probe(endpoint, apikey, time.perf_counter()), self.loop)
+
+	def __enter__(self):
+		self.thread.start()
+		asyncio.run_coroutine_threadsafe(self._open(), self.loop).result()
+		return self
+
+	def __exit__(self, exc_type, exc_value, traceback):
+		asyncio.run_coroutine_threadsafe(self._close(cancel=exc_type is not None), self.loop).result()
+		self.loop.call_soon_threadsafe(self.loop.stop)
+		self.thread.join()
+		self.loop.close()
+
+
+# ---------------------------------------------------------------------------
+# Result cache and checkpoint journal
+# ---------------------------------------------------------------------------
+
+def key_hash(apikey: str) -> str:
+	"""Stable identifier for a key that can be stored without storing the key."""
+	return hashlib.sha256(apikey.encode()).hexdigest()
+
+
+def scrubbed_reason(result: ProbeResult) -> Optional[str]:
+	"""The result's reason with the key replaced by a placeholder, safe to persist."""
+	return result.reason.replace(result.apikey, "{key}") if result.reason is not None else None
+
+
+class ResultCache:
+	"""Persistent SQLite cache of probe verdicts keyed by (target, SHA-256 of key, endpoint name).
+
+	Only definitive verdicts are stored (never transport errors or throttled
+	probes) and raw keys never touch the disk: they are hashed, and scrubbed
+	from stored reasons. Entries older than ``ttl`` seconds are ignored, and
+	``refresh`` skips lookups altogether while still recording fresh results.
+	Verdicts are scoped to ``base_url``, so a scan of a mock or stub server
+	never answers for the real Google APIs. Safe to share between engine threads.
+	"""
+
+	SCHEMA = """
+		CREATE TABLE IF NOT EXISTS verdicts (
+			target TEXT NOT NULL,
+			key_hash TEXT NOT NULL,
+			endpoint TEXT NOT NULL,
+			vulnerable INTEGER NOT NULL,
+			invalid_key INTEGER NOT NULL,
+			status_code INTEGER,
+			reason TEXT,
+			checked_at REAL NOT NULL,
+			PRIMARY KEY (target, key_hash, endpoint)
+		)
+	"""
+
+	def __init__(self, path: str = DEFAULT_CACHE_PATH, ttl: float = DEFAULT_CACHE_TTL, refresh: bool = False, base_url: Optional[str] = None):
+		directory = os.path.dirname(path)
+		if directory:
+			os.makedirs(directory, exist_ok=True)
+		self.path = path
+		self.ttl = ttl
+		self.refresh = refresh
+		# The real Google APIs are the empty target
+		self.target = base_url or ''
+		self.lock = threading.Lock()
+		self.db = sqlite3.connect(path, check_same_thread=False)
+		self.db.execute("PRAGMA journal_mode=WAL")
+		self.db.execute(self.SCHEMA)
+		self.pending = 0
+		self.hits = 0
+		self.misses = 0
+
+	def get(self, endpoint: Endpoint, apikey: str) -> Optional[ProbeResult]:
+		if self.refresh:
+			self.misses += 1
+			return None
+		with self.lock:
+			row = self.db.execute(
+				"SELECT vulnerable, invalid_key, status_code, reason FROM verdicts WHERE target = ? AND key_hash = ? AND endpoint = ? AND checked_at >= ?",
+				(self.target, key_hash(apikey), endpoint.name, time.time() - self.ttl),
+			).fetchone()
+			if row is None:
+				self.misses += 1
+				return None
+			self.hits += 1
+		vulnerable, invalid_key, status_code, reason = row
+		if reason is not None:
+			reason = reason.replace("{key}", apikey)
+		return ProbeResult(endpoint, apikey, vulnerable=bool(vulnerable), status_code=status_code, reason=reason, invalid_key=bool(invalid_key), cached=True)
+
+	def put(self, result: ProbeResult) -> None:
+		if result.error is not None or result.throttled or result.inferred or result.cached:
+			return
+		reason = scrubbed_reason(result)
+		with self.lock:
+			self.db.execute(
+				"INSERT OR REPLACE INTO verdicts VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+				(self.target, key_hash(result.apikey), result.endpoint.name, int(result.vulnerable), int(result.invalid_key), result.status_code, reason, time.time()),
+			)
+			self.pending += 1
+			if self.pending >= CACHE_COMMIT_EVERY:
+				self.db.commit()
+				self.pending = 0
+
+	def close(self) -> None:
+		with self.lock:
+			self.db.commit()
+			self.db.close()
+
+
+class CheckpointJournal:
+	"""Append-only JSONL journal of the verdicts completed during one scan.
+
+	Every definitive verdict is appended as it arrives and the file is
+	fsynced every ``CHECKPOINT_FLUSH_EVERY`` records or
+	``CHECKPOINT_FLUSH_INTERVAL`` seconds, so an interrupted scan loses at
+	most the last few seconds of work. With ``resume`` the existing journal is
+	loaded and its verdicts are answered without probing; otherwise it is
+	truncated. Like the cache it stores key hashes, never keys, and exposes
+	the same ``get``/``put`` interface so ``CachedEngine`` can front an engine
+	with it. Records are tagged with ``base_url`` and a resume only answers
+	from records of the same target.
+	"""
+
+	def __init__(self, path: str, resume: bool = False, base_url: Optional[str] = None):
+		directory = os.path.dirname(path)
+		if directory:
+			os.makedirs(directory, exist_ok=True)
+		self.path = path
+		self.target = base_url or ''
+		self.lock = threading.Lock()
+		self.entries: Dict[Tuple[str, str], Dict[str, Any]] = {}
+		if resume and os.path.exists(path):
+			self._load()
+		self.file = open(path, 'a' if resume else 'w', encoding='utf-8')
+		self.pending = 0
+		self.last_sync = time.monotonic()
+		self.hits = 0
+		self.misses = 0
+		self.recorded = 0
+
+	def _load(self) -> None:
+		intact = 0
+		with open(self.path, 'r+b') as journal:
+			for line in journal:
+				if not line.endswith(b"\n"):
+					# A torn final line from a crash mid-write; everything before it is intact
+					break
+				intact += len(line)
+				try:
+					entry = json.loads(line)
+				except ValueError:
+					continue
+				if entry.get('target', '') == self.target:
+					self.entries[(entry['key_hash'], entry['endpoint'])] = entry
+			# Cut the torn line off so the records appended next start on a line of their own
+			journal.truncate(intact)
+
+	def get(self, endpoint: Endpoint, apikey: str) -> Optional[ProbeResult]:
+		with self.lock:
+			entry = self.entries.get((key_hash(apikey), endpoint.name))
+			if entry is None:
+				self.misses += 1
+				return None
+			self.hits += 1
+		reason = entry['reason']
+		if reason is not None:
+			reason = reason.replace("{key}", apikey)
+		return ProbeResult(endpoint, apikey, vulnerable=entry['vulnerable'], status_code=entry['status_code'], reason=reason, invalid_key=entry['invalid_key'], cached=True)
+
+	def put(self, result: ProbeResult) -> None:
+		# Cached verdicts are journaled too: the resumed run should not depend on the cache TTL
+		if result.error is not None or result.throttled or result.inferred:
+			return
+		entry = {
+			'target': self.target,
+			'key_hash': key_hash(result.apikey),
+			'endpoint': result.endpoint.name,
+			'vulnerable': result.vulnerable,
+			'invalid_key': result.invalid_key,
+			'status_code': result.status_code,
+			'reason': scrubbed_reason(result),
+		}
+		with self.lock:
+			if self.file.closed:
+				return
+			self.entries[(entry['key_hash'], entry['endpoint'])] = entry
+			self.file.write(json.dumps(entry) + "\n")
+			self.recorded += 1
+			self.pending += 1
+			if self.pending >= CHECKPOINT_FLUSH_EVERY or time.monotonic() - self.last_sync >= CHECKPOINT_FLUSH_INTERVAL:
+				self._sync()
+
+	def _sync(self) -> None:
+		self.file.flush()
+		os.fsync(self.file.fileno())
+		self.pending = 0
+		self.last_sync = time.monotonic()
+
+	def close(self) -> None:
+		with self.lock:
+			if not self.file.closed:
+				self._sync()
+				self.file.close()
+
+
+class CachedEngine:
+	"""Wraps a probe engine so cached or journaled verdicts are answered without network I/O."""
+
+	def __init__(self, runner, cache):
+		self.runner = runner
+		self.cache = cache
+
+	def submit(self, endpoint: Endpoint, apikey: str) -> Future:
+		cached = self.cache.get(endpoint, apikey)
+		if cached is not None:
+			return completed_future(cached)
+		future = self.runner.submit(endpoint, apikey)
+		future.add_done_callback(self._store)
+		return future
+
+	def _store(self, future: Future) -> None:
+		if not future.cancelled() and future.exception() is None:
+			self.cache.put(future.result())
+
+	def __enter__(self):
+		self.runner.__enter__()
+		return self
+
+	def __exit__(self, *exc_info):
+		self.runner.__exit__(*exc_info)
+
+
+def create_engine(engine: str, proxy_url=None, concurrency: int = 1, session=None, base_url: Optional[str] = None, per_host: int = DEFAULT_PER_HOST_LIMIT, limiter: Optional[HostRateLimiter] = None, max_retries: int = DEFAULT_MAX_RETRIES, cache: Optional[ResultCache] = None, checkpoint: Optional[CheckpointJournal] = None, timeout: Optional[float] = BATCH_TIMEOUT, budget: Optional[ProbeBudget] = None):
+	"""Build the probe engine selected with --engine, optionally fronted by a result cache and a checkpoint journal."""
+	if engine == 'async':
+		runner = AsyncEngine(proxy_url, concurrency=concurrency, per_host=per_host, timeout=timeout, base_url=base_url, limiter=limiter, max_retries=max_retries, budget=budget)
+	else:
+		if session is None:
+			session = create_session(proxy_url, pool_size=concurrency)
+		runner = ThreadEngine(session, concurrency=concurrency, timeout=timeout, base_url=base_url, limiter=limiter, max_retries=max_retries, budget=budget)
+	if cache is not None:
+		runner = CachedEngine(runner, cache)
+	if checkpoint is not None:
+		runner = CachedEngine(runner, checkpoint)
+	return runner
+
+
+def print_cache_summary(cache: Optional[ResultCache]) -> None:
+	if cache is not None:
+		print(f"[+] Cache: {cache.hits} verdicts reused, {cache.misses} probed ({cache.path})")
+
+
+def print_checkpoint_summary(checkpoint: Optional[CheckpointJournal]) -> None:
+	if checkpoint is not None:
+		print(f"[+] Checkpoint: {checkpoint.hits} verdicts resumed, {checkpoint.recorded} recorded ({checkpoint.path})")
+
+
+# ---------------------------------------------------------------------------
+# Output sinks
+# ---------------------------------------------------------------------------
+
+def verdict_label(result: ProbeResult) -> str:
+	"""Single word describing a result, as used in structured output."""
+	return result.verdict.value
+
+
+def verdict_record(result: ProbeResult) -> Dict[str, Any]:
+	"""Flat, JSON-serialisable view of one (key, endpoint) verdict."""
+	endpoint = result.endpoint
+	return {
+		'key': result.apikey,
+		'endpoint': endpoint.name,
+		'host': endpoint.host,
+		'verdict': verdict_label(result),
+		'status_code': result.status_code,
+		'reason': result.reason,
+		'error': result.error,
+		'attempts': result.attempts,
+		'cached': result.cached,
+		'inferred': result.inferred,
+		'costs': list(endpoint.costs),
+		'price_per_1000': PRICES.get(endpoint.name),
+		'poc': endpoint.render_poc(result.apikey) if result.vulnerable else None,
+		'elapsed_ms': _milliseconds(result.elapsed),
+		**{f"{phase}_ms": _milliseconds(getattr(result.timing, phase, None)) for phase in ProbeTiming.PHASES},
+	}
+
+
+def _milliseconds(seconds: Optional[float]) -> Optional[float]:
+	return round(seconds * 1000, 3) if seconds is not None else None
+
+
+class OutputSink:
+	"""Writes verdicts to a file (or stdout for ``-``) as they complete.
+
+	Output goes through a large write buffer and nothing is kept once it is
+	written, so memory does not grow with the number of keys.
+	"""
+
+	newline: Optional[str] = None
+
+	def __init__(self, path: str = '-'):
+		self.path = path
+		if path == '-':
+			self.stream: TextIO = sys.stdout
+			self.owned = False
+		else:
+			self.stream = open(path, 'w', buffering=OUTPUT_BUFFER_SIZE, encoding='utf-8', newline=self.newline)
+			self.owned = True
+		self.count = 0
+
+	def write(self, result: ProbeResult) -> None:
+		self.count += 1
+		self._write(result)
+
+	def _write(self, result: ProbeResult) -> None:
+		raise NotImplementedError
+
+	def close(self) -> None:
+		self.stream.flush()
+		if self.owned:
+			self.stream.close()
+
+
+class JsonlSink(OutputSink):
+	"""One JSON object per line per verdict."""
+
+	def _write(self, result: ProbeResult) -> None:
+		self.stream.write(json.dumps(verdict_record(result)) + "\n")
+
+
+class CsvSink(OutputSink):
+	"""One CSV row per verdict; list columns are joined with ``; ``."""
+
+	newline = ''
+	FIELDS = ('key', 'endpoint', 'host', 'verdict', 'status_code', 'reason', 'error', 'attempts', 'cached', 'inferred', 'costs', 'price_per_1000', 'poc', 'elapsed_ms') + tuple(f"{phase}_ms" for phase in ProbeTiming.PHASES)
+
+	def __init__(self, path: str = '-'):
+		super().__init__(path)
+		self.writer = csv.DictWriter(self.stream, fieldnames=self.FIELDS)
+		self.writer.writeheader()
+
+	def _write(self, result: ProbeResult) -> None:
+		record = verdict_record(result)
+		record['costs'] = "; ".join(record['costs'])
+		self.writer.writerow(record)
+
+
+class SarifSink(OutputSink):
+	"""SARIF 2.1.0 log with one rule per endpoint and one result per vulnerable verdict.
+
+	The document is streamed: the header and rules are written up front,
+	each finding is appended as it arrives and ``close`` writes the footer.
+	Safe, invalid and failed probes are not findings and are left out.
+	Keys are shortened in findings unless ``full_keys`` is set.
+	"""
+
+	def __init__(self, path: str = '-', endpoints: List[Endpoint] = ENDPOINTS, full_keys: bool = False):
+		super().__init__(path)
+		self.full_keys = full_keys
+		self.rule_index = {endpoint.name: i for i, endpoint in enumerate(endpoints)}
+		rules = [
+			{
+				'id': self.rule_id(endpoint),
+				'name': endpoint.name,
+				'shortDescription': {'text': f"API key can call {endpoint.title or endpoint.name}"},
+				'help': {'text': "\n".join(endpoint.costs)},
+				'properties': {'host': endpoint.host},
+			}
+			for endpoint in endpoints
+		]
+		driver = {'name': TOOL_NAME, 'informationUri': TOOL_URI, 'rules': rules}
+		header = json.dumps({'$schema': SARIF_SCHEMA, 'version': '2.1.0', 'runs': [{'tool': {'driver': driver}, 'results': []}]})
+		# Leave the results array open so findings can be appended one by one
+		self.stream.write(header[:-len("]}]}")] + "\n")
+		self.findings = 0
+
+	@staticmethod
+	def rule_id(endpoint: Endpoint) -> str:
+		return re.sub(r'[^0-9A-Za-z]+', '-', endpoint.name).strip('-').lower()
+
+	def _write(self, result: ProbeResult) -> None:
+		if not result.vulnerable:
+			return
+		endpoint = result.endpoint
+		shown = result.apikey if self.full_keys else shorten_key(result.apikey)
+		finding = {
+			'ruleId': self.rule_id(endpoint),
+			'ruleIndex': self.rule_index.get(endpoint.name, -1),
+			'level': 'error',
+			'message': {'text': f"API key {shorten_key(result.apikey)} is accepted by {endpoint.name}. {' '.join(endpoint.costs)}"},
+			'partialFingerprints': {'keySha256/v1': key_hash(result.apikey)},
+			'properties': {'key': shown, 'statusCode': result.status_code, 'poc': endpoint.render_poc(shown)},
+		}
+		self.stream.write(("," if self.findings else "") + json.dumps(finding) + "\n")
+		self.findings += 1
+
+	def close(self) -> None:
+		self.stream.write("]}]}\n")
+		super().close()
+
+
+SINKS = {'jsonl': JsonlSink, 'csv': CsvSink, 'sarif': SarifSink}
+
+
+def open_sink(output_format: str, path: str = '-', full_keys: bool = False) -> Optional[OutputSink]:
+	"""Open the sink for ``--output-format``; plain text needs none."""
+	if output_format == 'text':
+		return None
+	if output_format == 'sarif':
+		return SarifSink(path, full_keys=full_keys)
+	return SINKS[output_format](path)
+
+
+# ---------------------------------------------------------------------------
+# Probe metrics
+# ---------------------------------------------------------------------------
+
+class LatencyHistogram:
+	"""Fixed-bucket histogram of probe wall time, plus per-phase totals."""
+
+	def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+		self.buckets = buckets
+		self.counts = [0] * (len(buckets) + 1)
+		self.count = 0
+		self.sum = 0.0
+		self.phase_sums = {phase: 0.0 for phase in ProbeTiming.PHASES}
+		self.phase_counts = {phase: 0 for phase in ProbeTiming.PHASES}
+
+	def observe(self, seconds: float, timing: Optional[ProbeTiming] = None) -> None:
+		index = next((i for i, bound in enumerate(self.buckets) if seconds <= bound), len(self.buckets))
+		self.counts[index] += 1
+		self.count += 1
+		self.sum += seconds
+		if timing is not None:
+			for phase, value in timing.as_dict().items():
+				if value is not None:
+					self.phase_sums[phase] += value
+					self.phase_counts[phase] += 1
+
+	def merge(self, other: "LatencyHistogram") -> None:
+		self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+		self.count += other.count
+		self.sum += other.sum
+		for phase in ProbeTiming.PHASES:
+			self.phase_sums[phase] += other.phase_sums[phase]
+			self.phase_counts[phase] += other.phase_counts[phase]
+
+	def cumulative(self) -> List[int]:
+		total, counts = 0, []
+		for count in self.counts:
+			total += count
+			counts.append(total)
+		return counts
+
+	def quantile(self, q: float) -> Optional[float]:
+		"""Estimate a quantile by linear interpolation inside its bucket, as Prometheus does."""
+		if not self.count:
+			return None
+		rank = q * self.count
+		lower, seen = 0.0, 0
+		for bound, count in zip(self.buckets + (None,), self.counts):
+			if seen + count >= rank and count:
+				if bound is None:
+					return lower
+				return lower + (bound - lower) * (rank - seen) / count
+			seen += count
+			lower = bound if bound is not None else lower
+		return lower
+
+	def mean(self) -> Optional[float]:
+		return self.sum / self.count if self.count else None
+
+	def phase_mean(self, phase: str) -> Optional[float]:
+		count = self.phase_counts[phase]
+		return self.phase_sums[phase] / count if count else None
+
+
+class ProbeMetrics:
+	"""Latency histograms per endpoint (and, merged, per host) for every probe actually sent.
+
+	Cached, inferred and never-sent results carry no timing and are skipped.
+	Safe to call ``observe`` from any thread.
+	"""
+
+	def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+		self.buckets = buckets
+		self.lock = threading.Lock()
+		self.endpoints: Dict[str, LatencyHistogram] = {}
+		self.hosts_by_endpoint: Dict[str, str] = {}
+
+	def observe(self, result: ProbeResult) -> None:
+		if result.elapsed is None:
+			return
+		name = result.endpoint.name
+		with self.lock:
+			histogram = self.endpoints.get(name)
+			if histogram is None:
+				histogram = self.endpoints[name] = LatencyHistogram(self.buckets)
+				self.hosts_by_endpoint[name] = result.endpoint.host
+			histogram.observe(result.elapsed, result.timing)
+
+	def hosts(self) -> Dict[str, LatencyHistogram]:
+		with self.lock:
+			merged: Dict[str, LatencyHistogram] = {}
+			for name, histogram in self.endpoints.items():
+				merged.setdefault(self.hosts_by_endpoint[name], LatencyHistogram(self.buckets)).merge(histogram)
+		return merged
+
+	def to_json(self) -> Dict[str, Any]:
+		def describe(histogram: LatencyHistogram) -> Dict[str, Any]:
+			return {
+				'count': histogram.count,
+				'sum_seconds': histogram.sum,
+				'buckets': dict(zip([str(b) for b in self.buckets] + ['+Inf'], histogram.cumulative())),
+				'p50_seconds': histogram.quantile(0.5),
+				'p90_seconds': histogram.quantile(0.9),
+				'p99_seconds': histogram.quantile(0.99),
+				'phase_mean_seconds': {phase: histogram.phase_mean(phase) for phase in ProbeTiming.PHASES},
+			}
+		with self.lock:
+			endpoints = {name: dict(describe(h), host=self.hosts_by_endpoint[name]) for name, h in self.endpoints.items()}
+		return {'endpoints': endpoints, 'hosts': {host: describe(h) for host, h in self.hosts().items()}}
+
+	def to_prometheus(self) -> str:
+		def labels(name: str, **extra) -> str:
+			pairs = {'endpoint': name, 'host': self.hosts_by_endpoint[name], **extra}
+			return ",".join(f'{k}="{v}"' for k, v in pairs.items())
+		lines = [
+			"# HELP eva_probe_duration_seconds Wall time of one probe request and its classification.",
+			"# TYPE eva_probe_duration_seconds histogram",
+		]
+		phases = [
+			"# HELP eva_probe_phase_seconds_total Time spent in each probe phase.",
+			"# TYPE eva_probe_phase_seconds_total counter",
+		]
+		with self.lock:
+			for name, histogram in sorted(self.endpoints.items()):
+				for bound, count in zip([f"{b:g}" for b in self.buckets] + ['+Inf'], histogram.cumulative()):
+					lines.append(f"eva_probe_duration_seconds_bucket{{{labels(name, le=bound)}}} {count}")
+				lines.append(f"eva_probe_duration_seconds_sum{{{labels(name)}}} {histogram.sum}")
+				lines.append(f"eva_probe_duration_seconds_count{{{labels(name)}}} {histogram.count}")
+				for phase in ProbeTiming.PHASES:
+					if histogram.phase_counts[phase]:
+						phases.append(f"eva_probe_phase_seconds_total{{{labels(name, phase=phase)}}} {histogram.phase_sums[phase]}")
+		return "\n".join(lines + phases) + "\n"
+
+	def write(self, path: str, fmt: str = 'prometheus') -> None:
+		with open(path, 'w', encoding='utf-8') as f:
+			if fmt == 'json':
+				json.dump(self.to_json(), f, indent=2)
+			else:
+				f.write(self.to_prometheus())
+
+
+def print_latency_summary(metrics: ProbeMetrics) -> None:
+	"""Per-endpoint and per-host latency tables, slowest p99 first."""
+	def ms(seconds: Optional[float]) -> str:
+		return f"{seconds * 1000:8.1f}" if seconds is not None else f"{'-':>8}"
+
+	def table(title: str, rows: Dict[str, LatencyHistogram]) -> None:
+		print(f"\n[+] {title} (ms)")
+		print(f"  {'':<40} {'n':>7} {'p50':>8} {'p90':>8} {'p99':>8} {'queue':>8} {'connect':>8} {'tls':>8} {'ttfb':>8} {'body':>8} {'classify':>8}")
+		for name, h in sorted(rows.items(), key=lambda item: -(item[1].quantile(0.99) or 0)):
+			phases = " ".join(ms(h.phase_mean(phase)) for phase in ('queue', 'connect', 'tls', 'ttfb', 'body', 'classify'))
+			print(f"  {name:<40} {h.count:>7} {ms(h.quantile(0.5))} {ms(h.quantile(0.9))} {ms(h.quantile(0.99))} {phases}")
+
+	with metrics.lock:
+		endpoints = dict(metrics.endpoints)
+	table("Probe latency per endpoint, phase columns are means", endpoints)
+	table("Probe latency per host", metrics.hosts())
+
+
+# ---------------------------------------------------------------------------
+# Console reporting
+# ---------------------------------------------------------------------------
+
+class Reporter:
+	"""Renders per-probe output and an optional progress bar from one background thread."""
+
+	def __init__(self, verbosity: int = NORMAL, progress: bool = False, total: Optional[int] = None, interval: float = REPORT_INTERVAL, metrics: Optional[ProbeMetrics] = None):
+		self.verbosity = verbosity
+		self.metrics = metrics
+		self.progress = progress
+		self.total = total
+		self.interval = interval
+		self.out: TextIO = sys.stdout
+		self.err: TextIO = sys.stderr
+		self.lines: "queue.Queue[str]" = queue.Queue()
+		self.stopping = threading.Event()
+		self.lock = threading.Lock()
+		self.done = 0
+		self.vulnerable = 0
+		self.unknown = 0
+		self.started = time.monotonic()
+		self.thread = threading.Thread(target=self._run, name="eva-reporter", daemon=True)
+
+	def emit(self, text: str, level: int = NORMAL) -> None:
+		if level <= self.verbosity:
+			self.lines.put(text)
+
+	def count(self, result: ProbeResult) -> None:
+		with self.lock:
+			self.done += 1
+			self.vulnerable += 1 if result.vulnerable else 0
+			self.unknown += 1 if result.error is not None else 0
+		if self.metrics is not None:
+			self.metrics.observe(result)
+
+	def track(self, future: Future) -> Future:
+		"""Count the probe when ``future`` completes, on whichever thread completes it."""
+		future.add_done_callback(lambda f: self.count(f.result()) if not f.cancelled() and f.exception() is None else None)
+		return future
+
+	def status(self) -> str:
+		with self.lock:
+			done, vulnerable, unknown = self.done, self.vulnerable, self.unknown
+		elapsed = time.monotonic() - self.started
+		rate = done / elapsed if elapsed > 0 else 0.0
+		if self.total:
+			filled = PROGRESS_WIDTH * min(done, self.total) // self.total
+			eta = (self.total - done) / rate if rate > 0 else 0.0
+			head = f"[{'#' * filled}{'-' * (PROGRESS_WIDTH - filled)}] {done}/{self.total} probes"
+			tail = f" | ETA {int(eta // 60):02d}:{int(eta % 60):02d}"
+		else:
+			head, tail = f"{done} probes", ""
+		return f"{head} | {vulnerable} vulnerable | {unknown} unknown | {rate:.1f}/s{tail}"
+
+	def _flush(self, final: bool = False) -> None:
+		lines = []
+		while True:
+			try:
+				lines.append(self.lines.get_nowait())
+			except queue.Empty:
+				break
+		if self.progress:
+			self.err.write("\r\033[K")
+			self.err.flush()
+		if lines:
+			self.out.write("\n".join(lines) + "\n")
+			self.out.flush()
+		if self.progress:
+			self.err.write(self.status() + ("\n" if final else ""))
+			self.err.flush()
+
+	def _run(self) -> None:
+		while not self.stopping.wait(self.interval):
+			self._flush()
+		self._flush(final=True)
+
+	def __enter__(self):
+		self.started = time.monotonic()
+		self.thread.start()
+		return self
+
+	def __exit__(self, *exc_info):
+		self.stopping.set()
+		self.thread.join()
+
+
+def print_probe_result(result: ProbeResult) -> None:
+	"""Print the single-key report section for one probe."""
+	endpoint = result.endpoint
+	if result.error is not None:
+		print(f"Could not test {endpoint.name}.")
+		print("Reason: "+ result.error)
+	elif result.vulnerable:
+		if endpoint.poc is None:
+			print(f"API key is \033[1;31;40mvulnerable\033[0m for {endpoint.name}! Here is the PoC link which can be used directly via browser:")
+		else:
+			print(f"API key is \033[1;31;40mvulnerable\033[0m for {endpoint.name}! Here is the PoC curl command which can be used from terminal:")
+		print(endpoint.render_poc(result.apikey))
+	else:
+		print(f"API key is not vulnerable for {endpoint.name}" + (" (inferred, not sent)." if result.inferred else "."))
+		if result.reason is not None:
+			print("Reason: "+ result.reason)
+
+
+def scan_gmaps(apikey, proxy_url=None, session=None, triage: bool = True, sink: Optional[OutputSink] = None, verbosity: int = NORMAL, base_url: Optional[str] = None, concurrency: int = len(ENDPOINTS), timeout: Optional[float] = BATCH_TIMEOUT, limiter: Optional[HostRateLimiter] = None, max_retries: int = DEFAULT_MAX_RETRIES, budget: Optional[ProbeBudget] = None):
+	"""Scan one key and print a report per test, in test order.
+
+	After the triage probe, every remaining probe is in flight at once (up to
+	``concurrency``), each bounded by ``timeout``, so a key costs about as
+	long as its slowest endpoint rather than the sum of all of them. Probes
+	are queued most expensive first, so a ``budget`` is spent on the APIs
+	that would cost the owner the most.
+	"""
+	vulnerable_apis = []
+	exposed = 0.0
+	
+	# Setup transport (proxy, TLS verification and connection pooling)
+	if session is None:
+		session = create_session(proxy_url, pool_size=concurrency)
+	if proxy_url:
+		print(f"[+] Using proxy: {proxy_url}")
+		print("")
+	
+	with ThreadEngine(session, concurrency=concurrency, timeout=timeout, base_url=base_url, limiter=limiter, max_retries=max_retries, budget=budget) as runner:
+		# Liveness check: a dead key would fail every test the same way
+		known = {}
+		live = True
+		if triage:
+			result = _future_result(runner.submit(TRIAGE_ENDPOINT, apikey), TRIAGE_ENDPOINT, apikey)
+			if result.invalid_key:
+				live = False
+				print("API key is \033[1;32;40minvalid\033[0m, skipping all tests.")
+				print("Reason: "+ result.reason)
+				if sink is not None:
+					sink.write(result)
+			else:
+				known[TRIAGE_ENDPOINT.name] = result
+				# A referer, IP or app restriction refuses every web service the same way
+				inferred = restriction_plan(ENDPOINTS, result)
+				if inferred:
+					print(f"API key has {result.restriction.value} restrictions, skipping {len(inferred)} web service tests.")
+					print("Reason: "+ result.reason)
+				known.update(inferred)
+		
+		endpoints = ENDPOINTS if live else []
+		futures = {endpoint.name: completed_future(known[endpoint.name]) if endpoint.name in known else runner.submit(endpoint, apikey) for endpoint in by_price(endpoints)}
+		# Results arrive in any order; each is reported as soon as the tests before it are
+		for test_number, endpoint in enumerate(endpoints, 1):
+			future = futures[endpoint.name]
+			result = _future_result(future, endpoint, apikey)
+			# Quiet mode only reports the endpoints the key is vulnerable for
+			if verbosity > QUIET or result.vulnerable:
+				print(("\n" if test_number > 1 else "") + "--------------------------")
+				print(f"{test_number}. Testing {endpoint.title or endpoint.name}")
+				print("--------------------------")
+				print_probe_result(result)
+			if sink is not None:
+				sink.write(result)
+			if result.vulnerable:
+				vulnerable_apis.extend(endpoint.costs)
+				exposed += PRICES[endpoint.name]
 
 	print("-------------------------------------------------------------")
 	print("  Results 			|| Cost Table/Reference to Exploit:")
@@ -604,163 +2171,1282 @@ def scan_gmaps(apikey, proxy_url=None):
 	for i in range (len(vulnerable_apis)):
 	    print("- " + vulnerable_apis[i])
 	print("-------------------------------------------------------------")
+	print(f"Total exposure at list price: {format_exposure(exposed)} to each exposed API")
+	if budget is not None:
+		print(f"Budget: {budget.sent} requests sent, {budget.refused} probes not sent")
+	print("-------------------------------------------------------------")
 	print("Reference for up-to-date pricing:")
 	print("https://cloud.google.com/maps-platform/pricing")
 	print("https://developers.google.com/maps/billing/gmp-billing")
 	print("-------------------------------------------------------------")
-	jsapi = input("Do you want to conduct manual tests for Javascript API? (Will need manual confirmation + file creation) (Y/N): ")
-	if jsapi == "Y" or jsapi == "y":
-		f = open("jsapi_test.html","w+")
-		f.write('<!DOCTYPE html><html><head><script src="https://maps.googleapis.com/maps/api/js?key='+apikey+'&callback=initMap&libraries=&v=weekly" defer></script><style type="text/css">#map{height:100%;}html,body{height:100%;margin:0;padding:0;}</style><script>let map;function initMap(){map=new google.maps.Map(document.getElementById("map"),{center:{lat:-34.397,lng:150.644},zoom:8,});}</script></head><body><div id="map"></div></body></html>')
-		print("jsapi_test.html file is created for manual confirmation. Open it at your browser and observe whether the map is successfully loaded or not.") 
-		f.close()
-		print("If you see 'Sorry! Something went wrong.' error on the page, it means that API key is not allowed to be used at JavaScript API.")
-		result = input("Press enter again for deletion of jsapi_test.html file automatically after manual confirmation is conducted.")
-		os.remove("jsapi_test.html")
+	if live:
+		jsapi = input("Do you want to conduct manual tests for Javascript API? (Will need manual confirmation + file creation) (Y/N): ")
+		if jsapi == "Y" or jsapi == "y":
+			f = open("jsapi_test.html","w+")
+			f.write('<!DOCTYPE html><html><head><script src="https://maps.googleapis.com/maps/api/js?key='+apikey+'&callback=initMap&libraries=&v=weekly" defer></script><style type="text/css">#map{height:100%;}html,body{height:100%;margin:0;padding:0;}</style><script>let map;function initMap(){map=new google.maps.Map(document.getElementById("map"),{center:{lat:-34.397,lng:150.644},zoom:8,});}</script></head><body><div id="map"></div></body></html>')
+			print("jsapi_test.html file is created for manual confirmation. Open it at your browser and observe whether the map is successfully loaded or not.") 
+			f.close()
+			print("If you see 'Sorry! Something went wrong.' error on the page, it means that API key is not allowed to be used at JavaScript API.")
+			result = input("Press enter again for deletion of jsapi_test.html file automatically after manual confirmation is conducted.")
+			os.remove("jsapi_test.html")
 	print("-------------------------------------------------------------")
 	print("Operation is over. Thanks for using EVA Upgraded - G-Maps API Scanner by Bar Hajby!")
 	return True
 
 
-def scan_gmaps_batch(api_keys: List[str], proxy_url=None):
-	"""Scan multiple API keys and generate a comparison table."""
-	# Setup proxy
-	proxies = None
-	if proxy_url:
-		proxies = {'http': proxy_url, 'https': proxy_url}
-		print(f"[+] Using proxy: {proxy_url}\n")
-	
-	print(f"[+] Batch mode: Testing {len(api_keys)} API keys against 32 endpoints")
-	print(f"[+] Strategy: Test each endpoint against all keys, then move to next endpoint\n")
-	
-	# Results dictionary: {api_name: {api_key: is_vulnerable}}
-	results = defaultdict(lambda: defaultdict(bool))
-	
-	test_number = 1
-	
-	# Test 1: Staticmap API
-	print("--------------------------")
-	print(f"{test_number}. Testing Staticmap API across all keys")
-	print("--------------------------")
-	for idx, apikey in enumerate(api_keys, 1):
+def _future_result(future: Future, endpoint: Endpoint, apikey: str) -> ProbeResult:
+	try:
+		return future.result()
+	except Exception as e:
+		return ProbeResult(endpoint, apikey, error=str(e))
+
+
+def submit_key(runner, apikey: str, endpoints: List[Endpoint] = ENDPOINTS, triage: Optional[Endpoint] = None) -> Future:
+	"""Probe one key against ``endpoints``; the future resolves to its results, in ``endpoints`` order.
+
+	With ``triage``, that endpoint is probed first; an invalid key skips the
+	rest, and a referer, IP or app restriction skips the probes it blocks.
+	"""
+	key_done: Future = Future()
+	
+	def submit_matrix(known):
+		futures = [known[e.name] if e.name in known else runner.submit(e, apikey) for e in endpoints]
+		remaining = [len(futures)]
+		lock = threading.Lock()
+		
+		def on_done(_):
+			with lock:
+				remaining[0] -= 1
+				finished = remaining[0] == 0
+			if finished:
+				key_done.set_result([_future_result(f, e, apikey) for f, e in zip(futures, endpoints)])
+		
+		if not futures:
+			key_done.set_result([])
+		for future in futures:
+			future.add_done_callback(on_done)
+	
+	if triage is None:
+		submit_matrix({})
+	else:
+		def after_triage(future):
+			known = {name: completed_future(r) for name, r in restriction_plan(endpoints, _future_result(future, triage, apikey)).items()}
+			known[triage.name] = future
+			submit_matrix(known)
+		
+		runner.submit(triage, apikey).add_done_callback(after_triage)
+	return key_done
+
+
+def iter_key_results(runner, keys: Iterable[str], endpoints: List[Endpoint] = ENDPOINTS, window: int = 2, triage: Optional[Endpoint] = None) -> Iterator[Tuple[str, List[ProbeResult]]]:
+	"""Feed keys into ``runner`` as they arrive and yield each key's results once all its probes finish.
+
+	At most ``window`` keys are in flight, which keeps the engine saturated
+	while memory stays proportional to the window rather than the input.
+	Keys are yielded in completion order, not input order; ``triage`` works
+	as in ``submit_key``.
+	"""
+	done: "queue.Queue[Tuple[str, List[ProbeResult]]]" = queue.Queue()
+	
+	def submit(apikey):
+		submit_key(runner, apikey, endpoints, triage).add_done_callback(lambda future: done.put((apikey, future.result())))
+	
+	pending = 0
+	for apikey in keys:
+		submit(apikey)
+		pending += 1
+		while pending >= window:
+			yield done.get()
+			pending -= 1
+		while pending:
+			try:
+				item = done.get_nowait()
+			except queue.Empty:
+				break
+			yield item
+			pending -= 1
+	while pending:
+		yield done.get()
+		pending -= 1
+
+
+def interleave_by_host(endpoints: List[Endpoint], keys: List[str]) -> Iterator[Tuple[Endpoint, str]]:
+	"""Yield every (endpoint, key) pair, taking one pair from each API host in turn.
+
+	Consecutive probes go to different hosts, so one host's rate limit or
+	throttling never holds up the whole queue.
+	"""
+	by_host: Dict[str, List[Endpoint]] = defaultdict(list)
+	for endpoint in endpoints:
+		by_host[endpoint.host].append(endpoint)
+	lanes = [iter([(endpoint, apikey) for endpoint in group for apikey in keys]) for group in by_host.values()]
+	while lanes:
+		for lane in list(lanes):
+			pair = next(lane, None)
+			if pair is None:
+				lanes.remove(lane)
+			else:
+				yield pair
+
+
+def stream_window(concurrency: int, endpoint_count: int) -> int:
+	"""Keys to keep in flight so ``concurrency`` probe slots stay busy."""
+	return max(1, -(-concurrency // max(1, endpoint_count))) + 1
+
+
+def format_key_report(index: int, apikey: str, key_results: List[ProbeResult], verbose: bool = False) -> str:
+	"""The one-line streaming verdict for a completed key; ``verbose`` adds a line per unknown probe."""
+	invalid = next((r for r in key_results if r.invalid_key and not r.inferred), None)
+	if invalid is not None:
+		return f"  [{index}] {shorten_key(apikey):<23} \033[0;32minvalid key\033[0m - {invalid.reason}"
+	vulnerable = [r.endpoint.name for r in key_results if r.vulnerable]
+	unknown = sum(1 for r in key_results if r.error is not None)
+	color = "\033[1;31m" if vulnerable else "\033[0;32m"
+	line = f"  [{index}] {shorten_key(apikey):<23} {color}{len(vulnerable)}/{len(key_results)} vulnerable\033[0m"
+	if unknown:
+		line += f" \033[1;33m({unknown} unknown)\033[0m"
+	inferred = sum(1 for r in key_results if r.inferred)
+	if inferred:
+		restriction = next((r.restriction for r in key_results if not r.inferred and r.restriction is not None), None)
+		line += f" ({inferred} inferred" + (f" from {restriction.value} restriction" if restriction is not None else "") + ")"
+	if vulnerable:
+		line += f" - {format_exposure(exposure(key_results))}: " + ", ".join(vulnerable)
+	if verbose:
+		line += "".join(f"\n      ? {r.endpoint.name}: {r.error}" for r in key_results if r.error is not None)
+	return line
+
+
+def key_report_level(key_results: List[ProbeResult]) -> int:
+	"""Verbosity a key's report line is emitted at; quiet mode still reports keys with findings."""
+	return QUIET if any(r.vulnerable for r in key_results) else NORMAL
+
+
+def scan_gmaps_stream(api_keys: Iterable[str], proxy_url=None, concurrency: int = 1, session=None, engine: str = 'threads', base_url: Optional[str] = None, per_host: int = DEFAULT_PER_HOST_LIMIT, limiter: Optional[HostRateLimiter] = None, max_retries: int = DEFAULT_MAX_RETRIES, key_filter: Optional[KeyFilter] = None, triage: bool = True, cache: Optional[ResultCache] = None, checkpoint: Optional[CheckpointJournal] = None, sink: Optional[OutputSink] = None, verbosity: int = NORMAL, progress: bool = False, metrics: Optional[ProbeMetrics] = None, budget: Optional[ProbeBudget] = None) -> Dict[str, int]:
+	"""Scan a (possibly unbounded) stream of keys, printing each key's verdict as soon as it completes.
+
+	Keys are read only as probe capacity frees up, so memory stays flat;
+	returns summary counters instead of the full results matrix.
+	"""
+	if limiter is None:
+		limiter = HostRateLimiter()
+	if key_filter is None:
+		key_filter = KeyFilter(validate=False)
+	endpoints = ENDPOINTS if budget is None else by_price(ENDPOINTS)
+	if proxy_url:
+		print(f"[+] Using proxy: {proxy_url}\n")
+	print(f"[+] Streaming mode: Testing keys against {len(ENDPOINTS)} endpoints as they are read")
+	print(f"[+] Engine: {engine}, {concurrency} parallel probes\n")
+	
+	summary = {'keys': 0, 'vulnerable_keys': 0, 'vulnerable_probes': 0, 'invalid_keys': 0}
+	with create_engine(engine, proxy_url, concurrency=concurrency, session=session, base_url=base_url, per_host=per_host, limiter=limiter, max_retries=max_retries, cache=cache, checkpoint=checkpoint, budget=budget) as runner:
+		window = stream_window(concurrency, len(ENDPOINTS))
+		triage_endpoint = TRIAGE_ENDPOINT if triage else None
+		with Reporter(verbosity, progress, metrics=metrics) as reporter:
+			for apikey, key_results in iter_key_results(runner, key_filter(api_keys), endpoints, window, triage_endpoint):
+				summary['keys'] += 1
+				summary['invalid_keys'] += 1 if any(r.invalid_key for r in key_results) else 0
+				hits = sum(1 for r in key_results if r.vulnerable)
+				summary['vulnerable_probes'] += hits
+				summary['vulnerable_keys'] += 1 if hits else 0
+				reporter.emit(format_key_report(summary['keys'], apikey, key_results, verbosity >= VERBOSE), key_report_level(key_results))
+				for result in key_results:
+					reporter.count(result)
+					if sink is not None:
+						sink.write(result)
+	
+	print_rate_summary(limiter)
+	print_cache_summary(cache)
+	print_checkpoint_summary(checkpoint)
+	print_budget_summary(budget)
+	print(f"\n[+] Key filter: {key_filter.summary()}")
+	print(f"\n📈 SUMMARY: {summary['vulnerable_keys']}/{summary['keys']} keys have at least one vulnerable API, {summary['invalid_keys']} invalid")
+	print("Operation is over. Thanks for using EVA Upgraded - G-Maps API Scanner by Bar Hajby!")
+	return summary
+
+
+def _scan_endpoint_major(runner, api_keys: List[str], results, triage: bool, order: str, reporter: Reporter, sink: Optional[OutputSink] = None) -> None:
+	"""Queue the whole matrix, then print and record it one endpoint at a time."""
+	futures = {}
+	if triage:
+		invalid = restricted = 0
+		for apikey in api_keys:
+			futures[(TRIAGE_ENDPOINT.name, apikey)] = reporter.track(runner.submit(TRIAGE_ENDPOINT, apikey))
+		for apikey in api_keys:
+			result = futures[(TRIAGE_ENDPOINT.name, apikey)].result()
+			inferred = restriction_plan(ENDPOINTS, result)
+			for name, skipped in inferred.items():
+				futures[(name, apikey)] = reporter.track(completed_future(skipped))
+			if result.invalid_key:
+				invalid += 1
+			elif inferred:
+				restricted += 1
+		reporter.emit(f"[+] Triage: {invalid}/{len(api_keys)} keys are invalid and skip the remaining probes, {restricted} are restricted and skip the web services", QUIET)
+	
+	# Queue the rest of the matrix up front; the engine bounds how many run at once
+	schedule = by_price(ENDPOINTS) if order == 'cost' else ENDPOINTS
+	if order == 'interleaved':
+		pairs = interleave_by_host(ENDPOINTS, api_keys)
+	else:
+		pairs = ((endpoint, apikey) for endpoint in schedule for apikey in api_keys)
+	for endpoint, apikey in pairs:
+		if (endpoint.name, apikey) not in futures:
+			futures[(endpoint.name, apikey)] = reporter.track(runner.submit(endpoint, apikey))
+	
+	verbose = reporter.verbosity >= VERBOSE
+	for test_num, endpoint in enumerate(schedule, 1):
+		reporter.emit(f"\n--------------------------\n{test_num}. Testing {endpoint.name} across all keys\n--------------------------")
+		verdicts = results[endpoint.name]
+		for idx, apikey in enumerate(api_keys, 1):
+			result = futures[(endpoint.name, apikey)].result()
+			if sink is not None:
+				sink.write(result)
+			if result.throttled:
+				reporter.emit(f"  Key {idx}: ⚠ Throttled - gave up after {result.attempts} attempts")
+			elif result.error is not None:
+				reporter.emit(f"  Key {idx}: ✗ Error - {result.error if verbose else result.error[:50]}")
+			elif result.invalid_key:
+				verdicts[apikey] = False
+				reporter.emit(f"  Key {idx}: ✗ Invalid key" + (" (skipped)" if result.inferred else ""))
+			elif result.vulnerable:
+				verdicts[apikey] = True
+				reporter.emit(f"  Key {idx}: ✓ VULNERABLE")
+			else:
+				verdicts[apikey] = False
+				reporter.emit(f"  Key {idx}: ✗ Safe" + (" (skipped)" if result.inferred else "") + (f" - {result.reason}" if verbose and result.reason else ""))
+
+
+def _scan_key_major(runner, api_keys: List[str], results, concurrency: int, triage: bool, reporter: Reporter, sink: Optional[OutputSink] = None, endpoints: List[Endpoint] = ENDPOINTS) -> None:
+	"""Run each key's whole matrix in turn, printing and recording keys as they complete."""
+	index = {apikey: idx for idx, apikey in enumerate(api_keys, 1)}
+	invalid = restricted = 0
+	window = stream_window(concurrency, len(ENDPOINTS))
+	triage_endpoint = TRIAGE_ENDPOINT if triage else None
+	for apikey, key_results in iter_key_results(runner, api_keys, endpoints, window, triage_endpoint):
+		for result in key_results:
+			verdicts = results[result.endpoint.name]
+			if result.error is None:
+				verdicts[apikey] = result.vulnerable
+			reporter.count(result)
+			if sink is not None:
+				sink.write(result)
+		if any(r.invalid_key for r in key_results):
+			invalid += 1
+		elif any(r.inferred for r in key_results):
+			restricted += 1
+		reporter.emit(format_key_report(index[apikey], apikey, key_results, reporter.verbosity >= VERBOSE), key_report_level(key_results))
+	if triage:
+		reporter.emit(f"[+] Triage: {invalid}/{len(api_keys)} keys were invalid and skipped the remaining probes, {restricted} were restricted and skipped the web services", QUIET)
+
+
+def scan_gmaps_batch(api_keys: List[str], proxy_url=None, concurrency: int = 1, session=None, engine: str = 'threads', base_url: Optional[str] = None, per_host: int = DEFAULT_PER_HOST_LIMIT, limiter: Optional[HostRateLimiter] = None, max_retries: int = DEFAULT_MAX_RETRIES, triage: bool = True, cache: Optional[ResultCache] = None, checkpoint: Optional[CheckpointJournal] = None, order: str = 'endpoint', sink: Optional[OutputSink] = None, verbosity: int = NORMAL, progress: bool = False, metrics: Optional[ProbeMetrics] = None, budget: Optional[ProbeBudget] = None):
+	"""Scan multiple API keys and generate a comparison table.
+
+	``order`` picks the schedule (see ``ORDERS``); with ``sink`` the verdicts
+	are written as structured records instead of the table.
+	"""
+	if limiter is None:
+		limiter = HostRateLimiter()
+	if proxy_url:
+		print(f"[+] Using proxy: {proxy_url}\n")
+	
+	print(f"[+] Batch mode: Testing {len(api_keys)} API keys against {len(ENDPOINTS)} endpoints")
+	if order == 'key':
+		print(f"[+] Strategy: Test each key against all endpoints, reporting keys as they complete")
+	elif order == 'interleaved':
+		print(f"[+] Strategy: Spread probes round-robin across API hosts, report endpoint by endpoint")
+	elif order == 'cost':
+		print(f"[+] Strategy: Test each endpoint against all keys, most expensive exposure first")
+	else:
+		print(f"[+] Strategy: Test each endpoint against all keys, then move to next endpoint")
+	if concurrency > 1 or engine != 'threads':
+		print(f"[+] Engine: {engine}, {concurrency} parallel probes")
+	print()
+	
+	# Results dictionary: {api_name: {api_key: is_vulnerable}}; keys whose
+	# probe errored or stayed throttled are left out (unknown, not safe)
+	results = defaultdict(lambda: defaultdict(bool))
+	
+	with create_engine(engine, proxy_url, concurrency=concurrency, session=session, base_url=base_url, per_host=per_host, limiter=limiter, max_retries=max_retries, cache=cache, checkpoint=checkpoint, budget=budget) as runner:
+		with Reporter(verbosity, progress, total=len(api_keys) * len(ENDPOINTS), metrics=metrics) as reporter:
+			if order == 'key':
+				# Under a budget each key's probes are queued most expensive first
+				_scan_key_major(runner, api_keys, results, concurrency, triage, reporter, sink=sink, endpoints=ENDPOINTS if budget is None else by_price(ENDPOINTS))
+			else:
+				_scan_endpoint_major(runner, api_keys, results, triage, order, reporter, sink)
+	
+	print_rate_summary(limiter)
+	print_cache_summary(cache)
+	print_checkpoint_summary(checkpoint)
+	print_budget_summary(budget)
+	
+	# Print results table (structured output already holds every verdict)
+	if sink is None:
+		print_results_table(results, api_keys)
+	
+	print("Operation is over. Thanks for using EVA Upgraded - G-Maps API Scanner by Bar Hajby!")
+	return results
+
+
+# ---------------------------------------------------------------------------
+# Distributed scanning
+# ---------------------------------------------------------------------------
+
+class ShardQueue:
+	"""SQLite-backed work queue shared by a scan coordinator and its workers."""
+
+	SCHEMA = """
+		CREATE TABLE IF NOT EXISTS shards (
+			id INTEGER PRIMARY KEY,
+			keys TEXT NOT NULL,
+			worker TEXT,
+			lease_until REAL,
+			attempts INTEGER NOT NULL DEFAULT 0,
+			done INTEGER NOT NULL DEFAULT 0,
+			merged INTEGER NOT NULL DEFAULT 0
+		);
+		CREATE TABLE IF NOT EXISTS results (
+			shard INTEGER NOT NULL,
+			position INTEGER NOT NULL,
+			endpoint TEXT NOT NULL,
+			vulnerable INTEGER NOT NULL,
+			invalid_key INTEGER NOT NULL,
+			throttled INTEGER NOT NULL,
+			inferred INTEGER NOT NULL,
+			status_code INTEGER,
+			reason TEXT,
+			error TEXT,
+			attempts INTEGER NOT NULL,
+			elapsed REAL,
+			PRIMARY KEY (shard, position, endpoint)
+		);
+		CREATE TABLE IF NOT EXISTS meta (
+			name TEXT PRIMARY KEY,
+			value TEXT
+		);
+	"""
+
+	def __init__(self, path: str, timeout: float = 30.0):
+		self.path = path
+		self.db = sqlite3.connect(path, timeout=timeout, isolation_level=None)
+		self.db.execute("PRAGMA journal_mode=WAL")
+		self.db.executescript(self.SCHEMA)
+
+	def add_shard(self, keys: List[str]) -> int:
+		return self.db.execute("INSERT INTO shards (keys) VALUES (?)", ("\n".join(keys),)).lastrowid
+
+	def close_input(self) -> None:
+		"""Tell workers no more shards are coming, so they exit once the queue is drained."""
+		self.db.execute("INSERT OR REPLACE INTO meta (name, value) VALUES ('closed', '1')")
+
+	def claim(self, worker: str, lease: float = SHARD_LEASE) -> Optional[Tuple[int, List[str]]]:
+		"""Take the oldest shard that is neither done nor leased to a live worker."""
+		now = time.time()
+		self.db.execute("BEGIN IMMEDIATE")
+		try:
+			row = self.db.execute(
+				"SELECT id, keys FROM shards WHERE done = 0 AND (lease_until IS NULL OR lease_until < ?) ORDER BY id LIMIT 1",
+				(now,),
+			).fetchone()
+			if row is not None:
+				self.db.execute(
+					"UPDATE shards SET worker = ?, lease_until = ?, attempts = attempts + 1 WHERE id = ?",
+					(worker, now + lease, row[0]),
+				)
+		finally:
+			self.db.execute("COMMIT")
+		if row is None:
+			return None
+		return row[0], row[1].split("\n")
+
+	def renew(self, shard: int, worker: str, lease: float = SHARD_LEASE) -> None:
+		self.db.execute("UPDATE shards SET lease_until = ? WHERE id = ? AND worker = ?", (time.time() + lease, shard, worker))
+
+	def complete(self, shard: int, keys: List[str], results: Iterable[ProbeResult]) -> None:
+		"""Store a shard's verdicts and mark it done, atomically."""
+		position = {apikey: i for i, apikey in enumerate(keys)}
+		rows = [
+			(shard, position[r.apikey], r.endpoint.name, int(r.vulnerable), int(r.invalid_key), int(r.throttled), int(r.inferred), r.status_code, r.reason, r.error, r.attempts, r.elapsed)
+			for r in results
+		]
+		self.db.execute("BEGIN IMMEDIATE")
+		try:
+			self.db.executemany("INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+			self.db.execute("UPDATE shards SET done = 1, lease_until = NULL WHERE id = ?", (shard,))
+		finally:
+			self.db.execute("COMMIT")
+
+	def take_completed(self) -> Iterator[Tuple[str, List[ProbeResult]]]:
+		"""Yield (key, results) for every shard finished since the last call, then drop their rows."""
+		by_name = {endpoint.name: endpoint for endpoint in ENDPOINTS}
+		for shard, keys in self.db.execute("SELECT id, keys FROM shards WHERE done = 1 AND merged = 0 ORDER BY id").fetchall():
+			keys = keys.split("\n")
+			per_key: Dict[int, List[ProbeResult]] = defaultdict(list)
+			for position, name, vulnerable, invalid_key, throttled, inferred, status_code, reason, error, attempts, elapsed in self.db.execute(
+				"SELECT position, endpoint, vulnerable, invalid_key, throttled, inferred, status_code, reason, error, attempts, elapsed FROM results WHERE shard = ?",
+				(shard,),
+			):
+				per_key[position].append(ProbeResult(
+					by_name[name], keys[position], vulnerable=bool(vulnerable), status_code=status_code, reason=reason, error=error,
+					throttled=bool(throttled), attempts=attempts, invalid_key=bool(invalid_key), inferred=bool(inferred), elapsed=elapsed,
+				))
+			for position, apikey in enumerate(keys):
+				yield apikey, sorted(per_key[position], key=lambda r: ENDPOINT_INDEX[r.endpoint.name])
+			self.db.execute("BEGIN IMMEDIATE")
+			try:
+				self.db.execute("DELETE FROM results WHERE shard = ?", (shard,))
+				self.db.execute("UPDATE shards SET merged = 1, keys = '' WHERE id = ?", (shard,))
+			finally:
+				self.db.execute("COMMIT")
+
+	def finished(self) -> bool:
+		"""True once the input is closed and every shard is done."""
+		closed = self.db.execute("SELECT value FROM meta WHERE name = 'closed'").fetchone() is not None
+		return closed and self.db.execute("SELECT 1 FROM shards WHERE done = 0 LIMIT 1").fetchone() is None
+
+	def counts(self) -> Dict[str, int]:
+		total, done = self.db.execute("SELECT COUNT(*), COALESCE(SUM(done), 0) FROM shards").fetchone()
+		return {'shards': total, 'done': done}
+
+	def close(self) -> None:
+		self.db.close()
+
+
+def default_worker_id() -> str:
+	return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def run_worker(queue_path: str, worker_id: Optional[str] = None, proxy_url=None, concurrency: int = 1, engine: str = 'threads', base_url: Optional[str] = None, per_host: int = DEFAULT_PER_HOST_LIMIT, rate: float = DEFAULT_HOST_RATE, max_retries: int = DEFAULT_MAX_RETRIES, triage: bool = True, lease: float = SHARD_LEASE, poll: float = SHARD_POLL_INTERVAL) -> int:
+	"""Scan shards from the queue at ``queue_path`` until the coordinator's input is drained.
+
+	Each worker runs its own engine and rate limiter, so ``rate`` is per
+	worker. The shard's lease is renewed after every key. Returns the
+	number of shards this worker completed.
+	"""
+	worker_id = worker_id or default_worker_id()
+	shards = ShardQueue(queue_path)
+	triage_endpoint = TRIAGE_ENDPOINT if triage else None
+	completed = 0
+	try:
+		with create_engine(engine, proxy_url, concurrency=concurrency, base_url=base_url, per_host=per_host, limiter=HostRateLimiter(rate), max_retries=max_retries) as runner:
+			while True:
+				claimed = shards.claim(worker_id, lease)
+				if claimed is None:
+					if shards.finished():
+						return completed
+					time.sleep(poll)
+					continue
+				shard, keys = claimed
+				results: List[ProbeResult] = []
+				for _, key_results in iter_key_results(runner, keys, ENDPOINTS, stream_window(concurrency, len(ENDPOINTS)), triage_endpoint):
+					results.extend(key_results)
+					shards.renew(shard, worker_id, lease)
+				shards.complete(shard, keys, results)
+				completed += 1
+	finally:
+		shards.close()
+
+
+def iter_shards(api_keys: Iterable[str], size: int) -> Iterator[List[str]]:
+	shard: List[str] = []
+	for apikey in api_keys:
+		shard.append(apikey)
+		if len(shard) >= size:
+			yield shard
+			shard = []
+	if shard:
+		yield shard
+
+
+def scan_gmaps_distributed(api_keys: Iterable[str], workers: int = 2, shard_size: int = DEFAULT_SHARD_SIZE, queue_path: Optional[str] = None, proxy_url=None, concurrency: int = 1, engine: str = 'threads', base_url: Optional[str] = None, per_host: int = DEFAULT_PER_HOST_LIMIT, rate: float = DEFAULT_HOST_RATE, max_retries: int = DEFAULT_MAX_RETRIES, triage: bool = True, sink: Optional[OutputSink] = None, verbosity: int = NORMAL, progress: bool = False, metrics: Optional[ProbeMetrics] = None, poll: float = SHARD_POLL_INTERVAL):
+	"""Split the keys into shards, scan them on worker processes and merge the verdicts.
+
+	With ``workers=0`` the coordinator only waits for ``--worker`` processes
+	to drain the queue; returns the same mapping as ``scan_gmaps_batch``.
+	"""
+	api_keys = list(dict.fromkeys(api_keys))
+	if proxy_url:
+		print(f"[+] Using proxy: {proxy_url}\n")
+	print(f"[+] Distributed mode: Testing {len(api_keys)} API keys against {len(ENDPOINTS)} endpoints")
+	print(f"[+] {-(-len(api_keys) // shard_size)} shards of up to {shard_size} keys, {workers} local worker processes with {concurrency} parallel probes each\n")
+	
+	temporary = queue_path is None
+	if temporary:
+		handle, queue_path = tempfile.mkstemp(prefix='eva-shards-', suffix='.sqlite3')
+		os.close(handle)
+	shards = ShardQueue(queue_path)
+	options = dict(proxy_url=proxy_url, concurrency=concurrency, engine=engine, base_url=base_url, per_host=per_host, rate=rate, max_retries=max_retries, triage=triage, poll=poll)
+	processes = [multiprocessing.Process(target=run_worker, args=(queue_path, f"{default_worker_id()}/{i}"), kwargs=options, daemon=True) for i in range(workers)]
+	
+	results = defaultdict(lambda: defaultdict(bool))
+	index = {apikey: idx for idx, apikey in enumerate(api_keys, 1)}
+	invalid = restricted = 0
+	try:
+		for shard in iter_shards(api_keys, shard_size):
+			shards.add_shard(shard)
+		shards.close_input()
+		for process in processes:
+			process.start()
+		with Reporter(verbosity, progress, total=len(api_keys) * len(ENDPOINTS), metrics=metrics) as reporter:
+			while True:
+				drained = shards.finished()
+				for apikey, key_results in shards.take_completed():
+					for result in key_results:
+						if result.error is None:
+							results[result.endpoint.name][apikey] = result.vulnerable
+						reporter.count(result)
+						if sink is not None:
+							sink.write(result)
+					if any(r.invalid_key for r in key_results):
+						invalid += 1
+					elif any(r.inferred for r in key_results):
+						restricted += 1
+					reporter.emit(format_key_report(index[apikey], apikey, key_results, reporter.verbosity >= VERBOSE), key_report_level(key_results))
+				if drained:
+					break
+				if processes and not any(process.is_alive() for process in processes) and not shards.finished():
+					raise RuntimeError(f"every worker exited before the queue was drained ({shards.counts()['done']}/{shards.counts()['shards']} shards done)")
+				time.sleep(poll)
+		if triage:
+			print(f"[+] Triage: {invalid}/{len(api_keys)} keys were invalid and skipped the remaining probes, {restricted} were restricted and skipped the web services")
+	finally:
+		for process in processes:
+			if process.is_alive():
+				process.terminate()
+			process.join()
+		shards.close()
+		if temporary:
+			for suffix in ('', '-wal', '-shm'):
+				with contextlib.suppress(OSError):
+					os.remove(queue_path + suffix)
+	
+	if sink is None:
+		print_results_table(results, api_keys)
+	
+	print("Operation is over. Thanks for using EVA Upgraded - G-Maps API Scanner by Bar Hajby!")
+	return results
+
+
+# ---------------------------------------------------------------------------
+# Process-pool scanning
+# ---------------------------------------------------------------------------
+
+# Set in pool processes so an interrupted parent can stop them taking new keys
+_pool_stop: Optional[Any] = None
+# Each pool process's engine, built once and reused for every partition it scans
+_pool_runner: Optional[Any] = None
+_pool_options: Dict[str, Any] = {}
+
+
+def pack_result(result: ProbeResult) -> Tuple:
+	"""Compact, cheaply pickled form of a result: (endpoint index, flags, status, attempts, elapsed, reason, error, phases)."""
+	flags = result.vulnerable | result.invalid_key << 1 | result.throttled << 2 | result.inferred << 3
+	phases = None if result.timing is None else tuple(getattr(result.timing, phase) for phase in ProbeTiming.PHASES)
+	return (ENDPOINT_INDEX[result.endpoint.name], flags, result.status_code, result.attempts, result.elapsed, result.reason, result.error, phases)
+
+
+def unpack_result(apikey: str, packed: Tuple) -> ProbeResult:
+	index, flags, status_code, attempts, elapsed, reason, error, phases = packed
+	return ProbeResult(
+		ENDPOINTS[index], apikey, vulnerable=bool(flags & 1), status_code=status_code, reason=reason, error=error,
+		throttled=bool(flags & 4), attempts=attempts, invalid_key=bool(flags & 2), inferred=bool(flags & 8), elapsed=elapsed,
+		timing=None if phases is None else ProbeTiming(*phases),
+	)
+
+
+def _init_pool_process(stop, options: Dict[str, Any]) -> None:
+	"""Set up a pool process: one engine and rate limiter, like ``run_worker``, kept warm across partitions."""
+	global _pool_stop, _pool_runner, _pool_options
+	# Ctrl-C is handled by the parent, which sets ``stop`` instead
+	signal.signal(signal.SIGINT, signal.SIG_IGN)
+	_pool_stop = stop
+	_pool_options = options
+	_pool_runner = create_engine(
+		options['engine'], options['proxy_url'], concurrency=options['concurrency'], base_url=options['base_url'],
+		per_host=options['per_host'], limiter=HostRateLimiter(options['rate']), max_retries=options['max_retries'],
+	).__enter__()
+	# Pool processes leave through multiprocessing's exit handlers, not atexit
+	multiprocessing.util.Finalize(None, _pool_runner.__exit__, args=(None, None, None), exitpriority=10)
+
+
+def scan_partition(keys: List[str], first_index: int) -> List[Tuple[int, List[Tuple], str]]:
+	"""Scan one partition of keys on this pool process's engine.
+
+	Returns (position in ``keys``, packed results, report line) per key, in
+	completion order, so the parent never classifies or formats anything.
+	"""
+	position = {apikey: i for i, apikey in enumerate(keys)}
+	pending = (apikey for apikey in keys if _pool_stop is None or not _pool_stop.is_set())
+	triage_endpoint = TRIAGE_ENDPOINT if _pool_options['triage'] else None
+	window = stream_window(_pool_options['concurrency'], len(ENDPOINTS))
+	scanned = []
+	for apikey, key_results in iter_key_results(_pool_runner, pending, ENDPOINTS, window, triage_endpoint):
+		i = position[apikey]
+		scanned.append((i, [pack_result(r) for r in key_results], format_key_report(first_index + i, apikey, key_results, _pool_options['verbose'])))
+	return scanned
+
+
+def scan_gmaps_parallel(api_keys: Iterable[str], processes: Optional[int] = None, partition_size: int = DEFAULT_PARTITION_SIZE, proxy_url=None, concurrency: int = 1, engine: str = 'threads', base_url: Optional[str] = None, per_host: int = DEFAULT_PER_HOST_LIMIT, rate: float = DEFAULT_HOST_RATE, max_retries: int = DEFAULT_MAX_RETRIES, key_filter: Optional[KeyFilter] = None, triage: bool = True, sink: Optional[OutputSink] = None, verbosity: int = NORMAL, progress: bool = False, metrics: Optional[ProbeMetrics] = None) -> Dict[str, int]:
+	"""Scan a stream of keys on a pool of ``processes`` processes (default: one per core).
+
+	Each pool process keeps one engine and rate limiter for every partition it
+	scans; returns the same summary counters as ``scan_gmaps_stream``.
+	"""
+	processes = processes or os.cpu_count() or 1
+	if key_filter is None:
+		key_filter = KeyFilter(validate=False)
+	if proxy_url:
+		print(f"[+] Using proxy: {proxy_url}\n")
+	print(f"[+] Process-pool mode: Testing keys against {len(ENDPOINTS)} endpoints on {processes} processes")
+	print(f"[+] Engine: {engine}, {concurrency} parallel probes per process, {partition_size} keys per partition\n")
+	
+	summary = {'keys': 0, 'vulnerable_keys': 0, 'vulnerable_probes': 0, 'invalid_keys': 0}
+	options = dict(verbose=verbosity >= VERBOSE, proxy_url=proxy_url, concurrency=concurrency, engine=engine, base_url=base_url, per_host=per_host, rate=rate, max_retries=max_retries, triage=triage)
+	stop = multiprocessing.Event()
+	pool = ProcessPoolExecutor(max_workers=processes, initializer=_init_pool_process, initargs=(stop, options))
+	in_flight: Dict[Future, List[str]] = {}
+	partitions = iter_shards(key_filter(api_keys), partition_size)
+	next_index = 1
+	try:
+		with Reporter(verbosity, progress, metrics=metrics) as reporter:
+			while True:
+				for keys in itertools.islice(partitions, 2 * processes - len(in_flight)):
+					in_flight[pool.submit(scan_partition, keys, next_index)] = keys
+					next_index += len(keys)
+				if not in_flight:
+					break
+				done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+				for future in done:
+					keys = in_flight.pop(future)
+					for i, packed, line in future.result():
+						key_results = [unpack_result(keys[i], p) for p in packed]
+						summary['keys'] += 1
+						summary['invalid_keys'] += 1 if any(r.invalid_key for r in key_results) else 0
+						hits = sum(1 for r in key_results if r.vulnerable)
+						summary['vulnerable_probes'] += hits
+						summary['vulnerable_keys'] += 1 if hits else 0
+						reporter.emit(line, key_report_level(key_results))
+						for result in key_results:
+							reporter.count(result)
+							if sink is not None:
+								sink.write(result)
+	except BaseException:
+		# Stop the pool taking new keys; probes already in flight finish first
+		stop.set()
+		for future in in_flight:
+			future.cancel()
+		raise
+	finally:
+		pool.shutdown(wait=True)
+	
+	print(f"\n[+] Key filter: {key_filter.summary()}")
+	print(f"\n📈 SUMMARY: {summary['vulnerable_keys']}/{summary['keys']} keys have at least one vulnerable API, {summary['invalid_keys']} invalid")
+	print("Operation is over. Thanks for using EVA Upgraded - G-Maps API Scanner by Bar Hajby!")
+	return summary
+
+
+# ---------------------------------------------------------------------------
+# Programmatic API
+# ---------------------------------------------------------------------------
+
+@dataclass
+class KeyReport:
+	"""Everything one scan found out about one key; ``results`` follow the scanner's endpoint order."""
+	apikey: str
+	results: List[ProbeResult]
+
+	@property
+	def vulnerable(self) -> List[Endpoint]:
+		"""Endpoints the key can be used against."""
+		return [r.endpoint for r in self.results if r.vulnerable]
+
+	@property
+	def invalid(self) -> bool:
+		return any(r.invalid_key for r in self.results)
+
+	@property
+	def restriction(self) -> Optional[Restriction]:
+		"""Key-wide restriction found by a probe that was sent, if any."""
+		return next((r.restriction for r in self.results if not r.inferred and r.restriction is not None), None)
+
+	@property
+	def unknown(self) -> List[ProbeResult]:
+		"""Probes that gave no verdict (transport errors, or still throttled after retries)."""
+		return [r for r in self.results if r.error is not None]
+
+	@property
+	def costs(self) -> List[str]:
+		"""Pricing lines for every vulnerable endpoint, as in the single-key cost table."""
+		return [cost for endpoint in self.vulnerable for cost in endpoint.costs]
+
+	@property
+	def exposure(self) -> float:
+		"""Summed list price of the exposed APIs, in USD per 1000 requests to each."""
+		return exposure(self.results)
+
+	def verdicts(self) -> Dict[str, Verdict]:
+		return {r.endpoint.name: r.verdict for r in self.results}
+
+	def to_json(self) -> Dict[str, Any]:
+		restriction = self.restriction
+		return {
+			'key': self.apikey,
+			'vulnerable': [endpoint.name for endpoint in self.vulnerable],
+			'exposure_per_1000': self.exposure,
+			'invalid': self.invalid,
+			'restriction': restriction.value if restriction is not None else None,
+			'unknown': len(self.unknown),
+			'results': [verdict_record(r) for r in self.results],
+		}
+
+
+class Scanner:
+	"""Reusable scanner for embedding in other programs."""
+
+	def __init__(self, proxy_url=None, concurrency: int = len(ENDPOINTS), engine: str = 'threads', base_url: Optional[str] = None, per_host: int = DEFAULT_PER_HOST_LIMIT, rate: float = DEFAULT_HOST_RATE, max_retries: int = DEFAULT_MAX_RETRIES, timeout: Optional[float] = BATCH_TIMEOUT, triage: bool = True, endpoints: Optional[List[Endpoint]] = None, cache: Optional[ResultCache] = None):
+		if engine not in ENGINES:
+			raise ValueError(f"unknown engine {engine!r} (choose from {', '.join(ENGINES)})")
+		self.concurrency = max(1, concurrency)
+		self.endpoints = list(ENDPOINTS if endpoints is None else endpoints)
+		self.triage = TRIAGE_ENDPOINT if triage else None
+		self.limiter = HostRateLimiter(rate)
+		self.runner = create_engine(engine, proxy_url, concurrency=self.concurrency, base_url=base_url, per_host=per_host, limiter=self.limiter, max_retries=max_retries, cache=cache, timeout=timeout)
+		self.runner.__enter__()
+		self.closed = False
+
+	@property
+	def window(self) -> int:
+		return stream_window(self.concurrency, len(self.endpoints))
+
+	def submit(self, apikey: str) -> Future:
+		"""Start scanning ``apikey`` without waiting; the future resolves to its ``KeyReport``."""
+		report: Future = Future()
+		submit_key(self.runner, apikey, self.endpoints, self.triage).add_done_callback(lambda future: report.set_result(KeyReport(apikey, future.result())))
+		return report
+
+	def scan(self, apikey: str) -> KeyReport:
+		return self.submit(apikey).result()
+
+	def scan_many(self, keys: Iterable[str]) -> Iterator[KeyReport]:
+		for apikey, results in iter_key_results(self.runner, keys, self.endpoints, self.window, self.triage):
+			yield KeyReport(apikey, results)
+
+	async def ascan(self, apikey: str) -> KeyReport:
+		return await asyncio.wrap_future(self.submit(apikey))
+
+	async def ascan_many(self, keys: Iterable[str]):
+		"""Async generator of reports, in completion order."""
+		pending = set()
+		for apikey in keys:
+			pending.add(asyncio.ensure_future(self.ascan(apikey)))
+			if len(pending) >= self.window:
+				done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+				for task in done:
+					yield task.result()
+		while pending:
+			done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+			for task in done:
+				yield task.result()
+
+	def close(self) -> None:
+		if not self.closed:
+			self.closed = True
+			self.runner.__exit__(None, None, None)
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, exc_type, exc_value, traceback):
+		if not self.closed:
+			self.closed = True
+			self.runner.__exit__(exc_type, exc_value, traceback)
+
+
+# ---------------------------------------------------------------------------
+# Scan daemon
+# ---------------------------------------------------------------------------
+
+class ScanJob:
+	"""Keys submitted to the daemon in one request, and the reports finished so far (in completion order)."""
+
+	def __init__(self, job_id: str, keys: List[str], rejected: int = 0):
+		self.id = job_id
+		self.keys = keys
+		self.rejected = rejected
+		self.reports: List[KeyReport] = []
+		self.created = time.time()
+		self.finished: Optional[float] = self.created if not keys else None
+		self.changed = threading.Condition()
+
+	@property
+	def done(self) -> bool:
+		return len(self.reports) == len(self.keys)
+
+	def add(self, report: KeyReport) -> None:
+		with self.changed:
+			self.reports.append(report)
+			if self.done:
+				self.finished = time.time()
+			self.changed.notify_all()
+
+	def wait(self, seen: int = 0, timeout: Optional[float] = None) -> List[KeyReport]:
+		"""Reports after the first ``seen``, once there are any or the job is done (or ``timeout`` passes)."""
+		with self.changed:
+			self.changed.wait_for(lambda: len(self.reports) > seen or self.done, timeout)
+			return self.reports[seen:]
+
+	def status(self) -> Dict[str, Any]:
+		end = self.finished if self.finished is not None else time.time()
+		return {
+			'id': self.id,
+			'status': 'done' if self.done else 'running',
+			'keys': len(self.keys),
+			'completed': len(self.reports),
+			'rejected': self.rejected,
+			'elapsed_ms': _milliseconds(end - self.created),
+		}
+
+	def to_json(self) -> Dict[str, Any]:
+		with self.changed:
+			reports = list(self.reports)
+		return {**self.status(), 'reports': [report.to_json() for report in reports]}
+
+
+class ScanDaemon:
+	"""Job table of the ``--serve`` daemon; every job is scanned on one shared, warm ``Scanner``.
+
+	Submitted keys go through a ``KeyFilter`` (malformed and repeated keys
+	are counted as rejected) and straight onto the scanner's engine. Up to
+	``keep`` jobs are remembered; the oldest finished ones are dropped first.
+	"""
+
+	def __init__(self, scanner: Scanner, keep: int = SERVE_KEEP_JOBS, max_keys: int = SERVE_MAX_KEYS, validate: bool = True):
+		self.scanner = scanner
+		self.keep = keep
+		self.max_keys = max_keys
+		self.validate = validate
+		self.jobs: Dict[str, ScanJob] = {}
+		self.lock = threading.Lock()
+		self.started = time.time()
+		self.submitted = 0
+		self.scanned = 0
+
+	def submit(self, keys: Iterable[str]) -> ScanJob:
+		key_filter = KeyFilter(validate=self.validate)
+		accepted = list(itertools.islice(key_filter(keys), self.max_keys + 1))
+		if len(accepted) > self.max_keys:
+			raise ValueError(f"at most {self.max_keys} keys per job")
+		job = ScanJob(secrets.token_hex(8), accepted, sum(key_filter.rejected.values()))
+		with self.lock:
+			self.jobs[job.id] = job
+			self.submitted += 1
+			self.scanned += len(accepted)
+			finished = [old for old in self.jobs.values() if old.done and old is not job]
+			while len(self.jobs) > self.keep and finished:
+				del self.jobs[finished.pop(0).id]
+		for apikey in accepted:
+			self.scanner.submit(apikey).add_done_callback(lambda future: job.add(future.result()))
+		return job
+
+	def get(self, job_id: str) -> Optional[ScanJob]:
+		with self.lock:
+			return self.jobs.get(job_id)
+
+	def forget(self, job_id: str) -> bool:
+		with self.lock:
+			return self.jobs.pop(job_id, None) is not None
+
+	def health(self) -> Dict[str, Any]:
+		with self.lock:
+			running = sum(1 for job in self.jobs.values() if not job.done)
+			return {'status': 'ok', 'jobs': len(self.jobs), 'running': running, 'submitted': self.submitted, 'keys': self.scanned, 'uptime_s': round(time.time() - self.started, 1)}
+
+
+def parse_submission(body: bytes, content_type: str = '') -> List[str]:
+	"""Keys from a POST body: a JSON list, ``{"keys": [...]}``/``{"key": "..."}``, or text with one key per line or comma."""
+	text = body.decode('utf-8', errors='replace').strip()
+	if 'json' in content_type or text[:1] in ('[', '{'):
 		try:
-			url = f"https://maps.googleapis.com/maps/api/staticmap?center=45%2C10&zoom=7&size=400x400&key={apikey}"
-			response = requests.get(url, verify=False, proxies=proxies, timeout=10)
-			if response.status_code == 200:
-				results["Staticmap API"][apikey] = True
-				print(f"  Key {idx}: ✓ VULNERABLE")
-			else:
-				print(f"  Key {idx}: ✗ Safe")
-		except Exception as e:
-			print(f"  Key {idx}: ✗ Error - {str(e)[:50]}")
-	
-	test_number += 1
-	# Test 2: Streetview API
-	print(f"\n--------------------------")
-	print(f"{test_number}. Testing Streetview API across all keys")
-	print("--------------------------")
-	for idx, apikey in enumerate(api_keys, 1):
+			payload = json.loads(text)
+		except ValueError as e:
+			raise ValueError(f"invalid JSON: {e}")
+		if isinstance(payload, dict):
+			payload = payload.get('keys', [payload['key']] if 'key' in payload else None)
+		if not isinstance(payload, list) or not all(isinstance(key, str) for key in payload):
+			raise ValueError('expected a list of keys')
+		return [key.strip() for key in payload if key.strip()]
+	return [key for key in re.split(r'[\s,]+', text) if key]
+
+
+class ScanDaemonHandler(BaseHTTPRequestHandler):
+	"""HTTP API of the ``--serve`` daemon.
+
+	``POST /jobs`` takes keys (see ``parse_submission``) and answers 202 with
+	the job's status. ``GET /jobs/ID`` returns the status and the reports so
+	far; ``?wait=S`` first waits up to S seconds for the job to finish.
+	``GET /jobs/ID/stream`` sends one NDJSON report per key as it completes,
+	then the final status. ``DELETE /jobs/ID`` forgets a job and
+	``GET /health`` reports liveness and counters.
+	"""
+
+	protocol_version = "HTTP/1.1"
+	disable_nagle_algorithm = True
+
+	def log_message(self, format, *args):
+		pass
+
+	def _send_json(self, status: int, payload: Dict[str, Any], headers: Optional[Dict[str, str]] = None) -> None:
+		body = json.dumps(payload).encode()
+		self.send_response(status)
+		self.send_header("Content-Type", "application/json")
+		self.send_header("Content-Length", str(len(body)))
+		for name, value in (headers or {}).items():
+			self.send_header(name, value)
+		self.end_headers()
+		self.wfile.write(body)
+
+	def _error(self, status: int, message: str) -> None:
+		self._send_json(status, {'error': message})
+
+	def _job(self) -> Tuple[Optional[ScanJob], str]:
+		"""The job named in the path (None if unknown) and the rest of the path after its ID."""
+		path = urlsplit(self.path).path
+		if not path.startswith('/jobs/'):
+			return None, ''
+		job_id, _, action = path[len('/jobs/'):].partition('/')
+		return self.server.jobs.get(job_id), action
+
+	def do_POST(self):
+		if urlsplit(self.path).path != '/jobs':
+			return self._error(404, 'not found')
+		if self.headers.get('Content-Length') is None:
+			return self._error(411, 'Content-Length required')
 		try:
-			url = f"https://maps.googleapis.com/maps/api/streetview?size=400x400&location=40.720032,-73.988354&fov=90&heading=235&pitch=10&key={apikey}"
-			response = requests.get(url, verify=False, proxies=proxies, timeout=10)
-			if response.status_code == 200:
-				results["Streetview API"][apikey] = True
-				print(f"  Key {idx}: ✓ VULNERABLE")
-			else:
-				print(f"  Key {idx}: ✗ Safe")
-		except Exception as e:
-			print(f"  Key {idx}: ✗ Error - {str(e)[:50]}")
-	
-	test_number += 1
-	# Test 3: Directions API
-	print(f"\n--------------------------")
-	print(f"{test_number}. Testing Directions API across all keys")
-	print("--------------------------")
-	for idx, apikey in enumerate(api_keys, 1):
+			length = int(self.headers['Content-Length'])
+		except ValueError:
+			length = -1
+		if length < 0:
+			return self._error(400, 'invalid Content-Length')
+		if length > SERVE_MAX_BODY:
+			return self._error(413, f"request body over {SERVE_MAX_BODY} bytes")
 		try:
-			url = f"https://maps.googleapis.com/maps/api/directions/json?origin=Disneyland&destination=Universal+Studios+Hollywood4&key={apikey}"
-			response = requests.get(url, verify=False, proxies=proxies, timeout=10)
-			if response.text.find("error_message") < 0:
-				results["Directions API"][apikey] = True
-				print(f"  Key {idx}: ✓ VULNERABLE")
-			else:
-				print(f"  Key {idx}: ✗ Safe")
-		except Exception as e:
-			print(f"  Key {idx}: ✗ Error - {str(e)[:50]}")
-	
-	test_number += 1
-	# Test 4: Geocode API
-	print(f"\n--------------------------")
-	print(f"{test_number}. Testing Geocode API across all keys")
-	print("--------------------------")
-	for idx, apikey in enumerate(api_keys, 1):
+			job = self.server.jobs.submit(parse_submission(self.rfile.read(length), self.headers.get('Content-Type', '')))
+		except ValueError as e:
+			return self._error(400, str(e))
+		self._send_json(202, job.status(), {'Location': f"/jobs/{job.id}"})
+
+	def do_GET(self):
+		if urlsplit(self.path).path == '/health':
+			return self._send_json(200, self.server.jobs.health())
+		job, action = self._job()
+		if job is None:
+			return self._error(404, 'unknown job')
+		if action == 'stream':
+			return self._stream(job)
+		if action:
+			return self._error(404, 'not found')
 		try:
-			url = f"https://maps.googleapis.com/maps/api/geocode/json?latlng=40,30&key={apikey}"
-			response = requests.get(url, verify=False, proxies=proxies, timeout=10)
-			if response.text.find("error_message") < 0:
-				results["Geocode API"][apikey] = True
-				print(f"  Key {idx}: ✓ VULNERABLE")
-			else:
-				print(f"  Key {idx}: ✗ Safe")
-		except Exception as e:
-			print(f"  Key {idx}: ✗ Error - {str(e)[:50]}")
-	
-	test_number += 1
-	# Test 5: Distance Matrix API
-	print(f"\n--------------------------")
-	print(f"{test_number}. Testing Distance Matrix API across all keys")
-	print("--------------------------")
-	for idx, apikey in enumerate(api_keys, 1):
+			wait = float(parse_qs(urlsplit(self.path).query).get('wait', ['0'])[0])
+		except ValueError:
+			return self._error(400, 'wait must be a number of seconds')
+		if wait > 0:
+			with job.changed:
+				job.changed.wait_for(lambda: job.done, min(wait, SERVE_MAX_WAIT))
+		self._send_json(200, job.to_json())
+
+	def do_DELETE(self):
+		job, action = self._job()
+		if job is None or action:
+			return self._error(404, 'unknown job')
+		self.server.jobs.forget(job.id)
+		self._send_json(200, job.status())
+
+	def _stream(self, job: ScanJob) -> None:
+		# No length up front: the stream ends when the connection closes
+		self.send_response(200)
+		self.send_header("Content-Type", "application/x-ndjson")
+		self.send_header("Connection", "close")
+		self.end_headers()
+		self.close_connection = True
+		sent = 0
+		while True:
+			reports = job.wait(sent)
+			for report in reports:
+				self.wfile.write(json.dumps(report.to_json()).encode() + b"\n")
+			self.wfile.flush()
+			sent += len(reports)
+			if sent == len(job.keys):
+				break
+		self.wfile.write(json.dumps(job.status()).encode() + b"\n")
+
+
+class _DaemonServerMixin:
+	daemon_threads = True
+	request_queue_size = 1024
+
+	def handle_error(self, request, client_address):
+		# A client that stops reading a stream is not a server error
+		if not isinstance(sys.exc_info()[1], ConnectionError):
+			super().handle_error(request, client_address)
+
+
+class ScanDaemonServer(_DaemonServerMixin, ThreadingHTTPServer):
+	def __init__(self, address: Tuple[str, int], jobs: ScanDaemon):
+		super().__init__(address, ScanDaemonHandler)
+		self.jobs = jobs
+
+	@property
+	def url(self) -> str:
+		host, port = self.server_address[:2]
+		return f"http://{host}:{port}"
+
+
+if hasattr(socketserver, 'ThreadingUnixStreamServer'):
+	class UnixScanDaemonHandler(ScanDaemonHandler):
+		# TCP_NODELAY does not exist on Unix sockets
+		disable_nagle_algorithm = False
+
+	class UnixScanDaemonServer(_DaemonServerMixin, socketserver.ThreadingUnixStreamServer):
+		"""The daemon's HTTP API on a Unix socket, for callers on the same host."""
+
+		def __init__(self, path: str, jobs: ScanDaemon):
+			super().__init__(path, UnixScanDaemonHandler)
+			self.jobs = jobs
+
+		@property
+		def url(self) -> str:
+			return f"unix:{self.server_address}"
+else:  # Windows
+	UnixScanDaemonServer = None
+
+
+def create_daemon_server(address: str, jobs: ScanDaemon):
+	"""Listen on ``host:port`` (or just ``port``, on localhost) or on ``unix:PATH``."""
+	if address.startswith('unix:'):
+		if UnixScanDaemonServer is None:
+			raise ValueError("Unix sockets are not supported on this platform")
+		return UnixScanDaemonServer(address[len('unix:'):], jobs)
+	host, _, port = address.rpartition(':')
+	if not port.isdigit():
+		raise ValueError(f"expected HOST:PORT or unix:PATH, got {address!r}")
+	return ScanDaemonServer((host or '127.0.0.1', int(port)), jobs)
+
+
+def serve_scanner(address: str = DEFAULT_SERVE_ADDRESS, validate: bool = True, **options) -> None:
+	"""Run the scan daemon in the foreground until interrupted; ``options`` configure its ``Scanner``."""
+	with Scanner(**options) as scanner:
+		jobs = ScanDaemon(scanner, validate=validate)
+		server = create_daemon_server(address, jobs)
+		print(f"[+] Scan daemon listening on {server.url}")
+		if isinstance(server, ScanDaemonServer):
+			print(f"[+] Submit keys with: curl -d 'AIza...' {server.url}/jobs")
 		try:
-			url = f"https://maps.googleapis.com/maps/api/distancematrix/json?units=imperial&origins=40.6655101,-73.89188969999998&destinations=40.6905615%2C-73.9976592&key={apikey}"
-			response = requests.get(url, verify=False, proxies=proxies, timeout=10)
-			if response.text.find("error_message") < 0:
-				results["Distance Matrix API"][apikey] = True
-				print(f"  Key {idx}: ✓ VULNERABLE")
-			else:
-				print(f"  Key {idx}: ✗ Safe")
-		except Exception as e:
-			print(f"  Key {idx}: ✗ Error - {str(e)[:50]}")
-	
-	# Continue for all other APIs... (I'll add the remaining 27 APIs)
-	# For brevity, I'll add them in a more compact way
-	
-	apis_to_test = [
-		(6, "Find Place From Text API", "https://maps.googleapis.com/maps/api/place/findplacefromtext/json?input=Museum&inputtype=textquery&fields=name&key={}", "error_message"),
-		(7, "Autocomplete API", "https://maps.googleapis.com/maps/api/place/autocomplete/json?input=Bingh&types=%28cities%29&key={}", "error_message"),
-		(8, "Elevation API", "https://maps.googleapis.com/maps/api/elevation/json?locations=39.7391536,-104.9847034&key={}", "error_message"),
-		(9, "Timezone API", "https://maps.googleapis.com/maps/api/timezone/json?location=39.6034810,-119.6822510&timestamp=1331161200&key={}", "errorMessage"),
-		(10, "Nearest Roads API", "https://roads.googleapis.com/v1/nearestRoads?points=60.170880,24.942795&key={}", "error"),
-		(11, "Geolocation API", "https://www.googleapis.com/geolocation/v1/geolocate?key={}", "error"),
-		(12, "Snap to Roads API", "https://roads.googleapis.com/v1/snapToRoads?path=-35.27801,149.12958&key={}", "error"),
-		(13, "Speed Limit-Roads API", "https://roads.googleapis.com/v1/speedLimits?path=38.7580,-9.0374&key={}", "error"),
-		(14, "Place Details API", "https://maps.googleapis.com/maps/api/place/details/json?place_id=ChIJN1t_tDeuEmsRUsoyG83frY4&fields=name&key={}", "error_message"),
-		(15, "Nearby Search-Places API", "https://maps.googleapis.com/maps/api/place/nearbysearch/json?location=-33.8670522,151.1957362&radius=100&key={}", "error_message"),
-		(16, "Text Search-Places API", "https://maps.googleapis.com/maps/api/place/textsearch/json?query=restaurants+in+Sydney&key={}", "error_message"),
-		(17, "Query Autocomplete API", "https://maps.googleapis.com/maps/api/place/queryautocomplete/json?input=pizza&key={}", "error_message"),
-	]
-	
-	for test_num, api_name, url_template, error_key in apis_to_test:
-		print(f"\n--------------------------")
-		print(f"{test_num}. Testing {api_name} across all keys")
-		print("--------------------------")
-		for idx, apikey in enumerate(api_keys, 1):
-			try:
-				url = url_template.format(apikey)
-				response = requests.get(url, verify=False, proxies=proxies, timeout=10)
-				if response.text.find(error_key) < 0:
-					results[api_name][apikey] = True
-					print(f"  Key {idx}: ✓ VULNERABLE")
-				else:
-					print(f"  Key {idx}: ✗ Safe")
-			except Exception as e:
-				print(f"  Key {idx}: ✗ Error - {str(e)[:50]}")
-	
-	# Print results table
-	print_results_table(results, api_keys)
-	
-	print("Operation is over. Thanks for using EVA Upgraded - G-Maps API Scanner by Bar Hajby!")
-	return results
+			server.serve_forever()
+		except KeyboardInterrupt:
+			pass
+		finally:
+			server.server_close()
+			if address.startswith('unix:'):
+				with contextlib.suppress(OSError):
+					os.remove(address[len('unix:'):])
+			print(f"\n[+] Served {jobs.submitted} jobs, {jobs.scanned} keys")
+
+
+# ---------------------------------------------------------------------------
+# Mock Google server
+# ---------------------------------------------------------------------------
+
+class MockGoogleHandler(BaseHTTPRequestHandler):
+	"""Answers every registered endpoint the way Google does for the key's behavior."""
+
+	protocol_version = "HTTP/1.1"
+	# Headers and body go out in separate writes; without this Nagle + delayed ACK add ~40 ms per response
+	disable_nagle_algorithm = True
+
+	def log_message(self, format, *args):
+		pass
+
+	def _key(self) -> str:
+		authorization = self.headers.get("Authorization", "")
+		if authorization.startswith("key="):
+			return authorization[4:]
+		return parse_qs(urlsplit(self.path).query).get("key", [""])[0]
+
+	def _send(self, status: int, body: bytes = b"", content_type: str = "application/json", headers: Optional[Dict[str, str]] = None) -> None:
+		self.send_response(status)
+		self.send_header("Content-Type", content_type)
+		self.send_header("Content-Length", str(len(body)))
+		for name, value in (headers or {}).items():
+			self.send_header(name, value)
+		self.end_headers()
+		self.wfile.write(body)
+
+	def _send_json(self, status: int, payload: Dict[str, Any]) -> None:
+		self._send(status, json.dumps(payload).encode())
+
+	def _throttled(self, path: str) -> None:
+		if path.startswith("/maps/api/") and path.endswith("/json"):
+			return self._send_json(200, {"error_message": "You have exceeded your rate-limit for this API.", "status": "OVER_QUERY_LIMIT"})
+		return self._send_json(429, {"error": {"code": 429, "message": "Quota exceeded.", "status": "RESOURCE_EXHAUSTED"}})
+
+	def _allowed(self, path: str) -> None:
+		if path.startswith("/maps/api/place/photo") or path.startswith("/maps/embed/"):
+			return self._send(302, headers={"Location": "https://lh3.googleusercontent.com/photo"})
+		if path.startswith("/maps/api/js"):
+			return self._send(200, b"initMap()", "text/javascript")
+		if path.startswith("/maps/api/staticmap") or path.startswith("/maps/api/streetview") or path.startswith("/v1/2dtiles"):
+			return self._send(200, b"\x89PNG\r\n\x1a\n".ljust(MOCK_IMAGE_BYTES, b"\0"), "image/png")
+		return self._send_json(200, {"status": "OK", "results": []})
+
+	def _refused(self, path: str, behavior: str) -> None:
+		if path.startswith("/maps/api/place/photo") or path.startswith("/maps/embed/"):
+			return self._send(403, b"<html><title>403 Forbidden</title></html>", "text/html")
+		if path.startswith("/maps/api/js"):
+			return self._send(200, b"google.maps.InvalidKeyMapError", "text/javascript")
+		if path.startswith("/maps/api/staticmap") or path.startswith("/maps/api/streetview") or path.startswith("/v1/2dtiles"):
+			return self._send(403, b"The Google Maps Platform server rejected your request.", "text/plain")
+		message = "This API key is not authorized to use this service or API."
+		if behavior == 'not_enabled':
+			message = "This API project is not authorized to use this API."
+		if behavior == 'referer':
+			if not path.startswith("/maps/api/"):
+				return self._send_json(403, {"error": {"code": 403, "message": "Requests from referer <empty> are blocked.", "status": "PERMISSION_DENIED", "details": [{"reason": "API_KEY_HTTP_REFERRER_BLOCKED"}]}})
+			message = "API keys with referer restrictions cannot be used with this API."
+		if behavior == 'invalid':
+			if not path.startswith("/maps/api/"):
+				return self._send_json(400, {"error": {"code": 400, "message": "API key not valid. Please pass a valid API key.", "status": "INVALID_ARGUMENT"}})
+			message = "The provided API key is invalid. "
+		if path.startswith("/maps/api/timezone"):
+			return self._send_json(200, {"errorMessage": message, "status": "REQUEST_DENIED"})
+		if path.startswith("/maps/api/") and path.endswith("/json"):
+			return self._send_json(200, {"error_message": message, "results": [], "status": "REQUEST_DENIED"})
+		return self._send_json(403, {"error": {"code": 403, "message": message, "status": "PERMISSION_DENIED"}})
+
+	def _handle(self) -> None:
+		length = int(self.headers.get("Content-Length") or 0)
+		if length:
+			self.rfile.read(length)
+		path = urlsplit(self.path).path
+		key = self._key()
+		behavior, latency, failed = self.server.plan(key)
+		if latency:
+			time.sleep(latency)
+		if failed:
+			return self._send_json(503, {"error": {"code": 503, "message": "The service is currently unavailable.", "status": "UNAVAILABLE"}})
+		if behavior == 'throttled':
+			return self._throttled(path)
+		if behavior == 'allowed':
+			return self._allowed(path)
+		return self._refused(path, behavior)
+
+	do_GET = _handle
+	do_POST = _handle
+
+
+class MockGoogleServer(ThreadingHTTPServer):
+	"""Local imitation of every Google API host the scanner probes, for tests and benchmarks."""
+
+	daemon_threads = True
+	# The stock backlog of 5 drops connection bursts into a 1 s SYN retransmit
+	request_queue_size = 1024
+
+	def __init__(self, host: str = '127.0.0.1', port: int = 0, behaviors: Optional[Dict[str, str]] = None, mix: Optional[Dict[str, float]] = None, default: str = 'denied', latency: float = 0.0, jitter: float = 0.0, error_rate: float = 0.0, seed: Optional[int] = None):
+		super().__init__((host, port), MockGoogleHandler)
+		self.behaviors = dict(behaviors or {})
+		self.mix = mix
+		self.default = default
+		self.latency = latency
+		self.jitter = jitter
+		self.error_rate = error_rate
+		self.random = random.Random(seed)
+		self.lock = threading.Lock()
+		self.requests = 0
+		self.connections = 0
+		self.throttle_remaining: Dict[str, int] = {}
+		self.thread: Optional[threading.Thread] = None
+
+	@property
+	def base_url(self) -> str:
+		host, port = self.server_address[:2]
+		return f"http://{host}:{port}"
+
+	def behavior_for(self, key: str) -> str:
+		if key in self.behaviors:
+			return self.behaviors[key]
+		if not self.mix:
+			return self.default
+		point = int(key_hash(key)[:8], 16) / 0x100000000 * sum(self.mix.values())
+		for behavior, share in self.mix.items():
+			if point < share:
+				return behavior
+			point -= share
+		return self.default
+
+	def process_request(self, request, client_address):
+		with self.lock:
+			self.connections += 1
+		super().process_request(request, client_address)
+
+	def handle_error(self, request, client_address):
+		# Image and tile probes hang up after a body prefix; that is not a server error
+		if not isinstance(sys.exc_info()[1], ConnectionError):
+			super().handle_error(request, client_address)
+
+	def plan(self, key: str) -> Tuple[str, float, bool]:
+		"""Count the request and decide its (behavior, latency, injected failure)."""
+		with self.lock:
+			self.requests += 1
+			failed = self.error_rate > 0 and self.random.random() < self.error_rate
+			latency = self.latency * self.random.lognormvariate(0, self.jitter) if self.jitter > 0 else self.latency
+			if self.throttle_remaining.get(key, 0) > 0:
+				self.throttle_remaining[key] -= 1
+				return 'throttled', latency, failed
+		return self.behavior_for(key), latency, failed
+
+	def start(self) -> "MockGoogleServer":
+		"""Serve from a background thread."""
+		self.thread = threading.Thread(target=self.serve_forever, name="eva-mock-server", daemon=True)
+		self.thread.start()
+		return self
+
+	def stop(self) -> None:
+		self.shutdown()
+		self.server_close()
+		if self.thread is not None:
+			self.thread.join()
+
+	def __enter__(self):
+		return self.start()
+
+	def __exit__(self, *exc_info):
+		self.stop()
+
+
+def parse_mock_mix(spec: str) -> Dict[str, float]:
+	"""Parse ``allowed=0.1,denied=0.8,invalid=0.1`` into a behavior mix."""
+	mix = {}
+	for part in spec.split(','):
+		behavior, _, share = part.partition('=')
+		behavior = behavior.strip()
+		if behavior not in MOCK_BEHAVIORS:
+			raise ValueError(f"unknown behavior {behavior!r} (choose from {', '.join(MOCK_BEHAVIORS)})")
+		mix[behavior] = float(share)
+		if mix[behavior] < 0:
+			raise ValueError(f"share for {behavior} must not be negative")
+	return mix
+
+
+def serve_mock(host: str = '127.0.0.1', port: int = DEFAULT_MOCK_PORT, **options) -> None:
+	"""Run the mock server in the foreground until interrupted."""
+	server = MockGoogleServer(host, port, **options)
+	print(f"[+] Mock Google API server listening on {server.base_url}")
+	print(f"[+] Scan against it with: --base-url {server.base_url}")
+	try:
+		server.serve_forever()
+	except KeyboardInterrupt:
+		pass
+	finally:
+		server.server_close()
+		print(f"\n[+] Served {server.requests} requests")
 
 
 def main() -> None:
@@ -778,6 +3464,26 @@ Examples:
   # Batch scan (multiple keys)
   python eva_gmaps_scanner.py --list keys.txt
   python eva_gmaps_scanner.py -l keys.txt -p
+  python eva_gmaps_scanner.py -l keys.txt --concurrency 32
+  python eva_gmaps_scanner.py -l keys.txt --engine async --concurrency 1000
+  
+  # Spend at most 5000 requests / 10 minutes, most expensive APIs first on every key
+  python eva_gmaps_scanner.py -l keys.txt -c 32 --max-requests 5000 --deadline 600
+  
+  # Streaming scan of a huge dump (or '-' for stdin), one line per key
+  grep -oh 'AIza[0-9A-Za-z_-]*' -r dump/ | python eva_gmaps_scanner.py -l - --stream -c 64
+  
+  # Shard a big list across 8 local worker processes (more can join from other shells)
+  python eva_gmaps_scanner.py -l keys.txt -c 32 --workers 8 --queue shards.sqlite3
+  python eva_gmaps_scanner.py --worker shards.sqlite3 -c 32
+  
+  # Daemon: keep a warm scanner up and submit keys over HTTP
+  python eva_gmaps_scanner.py --serve 127.0.0.1:8766 -c 64
+  curl -d 'AIzaSyD...' http://127.0.0.1:8766/jobs
+  
+  # Offline: serve the bundled mock Google API, then scan against it
+  python eva_gmaps_scanner.py --mock-server --mock-latency 0.05
+  python eva_gmaps_scanner.py -l keys.txt -c 64 --base-url http://127.0.0.1:8765
   
   # File format for batch mode (keys.txt):
   AIzaSyD...
@@ -796,7 +3502,133 @@ Examples:
 	parser.add_argument(
 		'-l', '--list',
 		type=str,
-		help='File containing multiple API keys (newline or comma separated)'
+		help="File containing multiple API keys (newline or comma separated), or '-' for stdin"
+	)
+	
+	parser.add_argument(
+		'--stream',
+		action='store_true',
+		help='Read keys lazily and print each key\'s verdict as it completes instead of one final table'
+	)
+	
+	parser.add_argument(
+		'--cache',
+		type=str,
+		nargs='?',
+		const=DEFAULT_CACHE_PATH,
+		default=None,
+		help=f'Reuse verdicts from a persistent SQLite cache (default path if flag is used without value: {DEFAULT_CACHE_PATH})'
+	)
+	
+	parser.add_argument(
+		'--cache-ttl',
+		type=float,
+		default=DEFAULT_CACHE_TTL,
+		help=f'Seconds a cached verdict stays valid (default: {DEFAULT_CACHE_TTL})'
+	)
+	
+	parser.add_argument(
+		'--refresh',
+		action='store_true',
+		help='Ignore cached verdicts and re-probe everything (results are still written to --cache)'
+	)
+	
+	parser.add_argument(
+		'--output-format',
+		choices=OUTPUT_FORMATS,
+		default='text',
+		help='Also write one record per verdict as it completes: JSON lines, CSV or a SARIF log (default: text only)'
+	)
+	
+	parser.add_argument(
+		'-o', '--output',
+		type=str,
+		default='-',
+		help='File for --output-format records; with - (default) records go to stdout and the human-readable report to stderr'
+	)
+	
+	parser.add_argument(
+		'--sarif-full-keys',
+		action='store_true',
+		help='Write full API keys into SARIF findings and PoCs (default: keys are shortened; the keySha256 fingerprint is always present)'
+	)
+	
+	levels = parser.add_mutually_exclusive_group()
+	levels.add_argument(
+		'-q', '--quiet',
+		action='store_true',
+		help='Only print findings and summaries, no per-probe lines (fastest at high concurrency)'
+	)
+	levels.add_argument(
+		'-v', '--verbose',
+		action='store_true',
+		help='Include refusal reasons and full error messages in per-probe lines'
+	)
+	
+	parser.add_argument(
+		'--progress',
+		action='store_true',
+		help='Show a live progress bar (probes done, vulnerable, unknown, rate, ETA) on stderr'
+	)
+	
+	parser.add_argument(
+		'--timings',
+		action='store_true',
+		help='After a --list scan, print per-endpoint and per-host latency percentiles with a queue/connect/TLS/TTFB/body/classify breakdown'
+	)
+	
+	parser.add_argument(
+		'--metrics',
+		type=str,
+		default=None,
+		metavar='FILE',
+		help='After a --list scan, write probe latency histograms to FILE'
+	)
+	
+	parser.add_argument(
+		'--metrics-format',
+		choices=METRICS_FORMATS,
+		default='prometheus',
+		help='Format for --metrics: Prometheus text exposition or JSON (default: prometheus)'
+	)
+	
+	parser.add_argument(
+		'--checkpoint',
+		type=str,
+		default=None,
+		help='Journal completed verdicts to this file so an interrupted --list scan can be resumed'
+	)
+	
+	parser.add_argument(
+		'--resume',
+		action='store_true',
+		help='Continue the scan recorded in --checkpoint, skipping verdicts it already holds'
+	)
+	
+	parser.add_argument(
+		'--no-triage',
+		action='store_true',
+		help='Run every test even for keys the initial liveness probe finds invalid'
+	)
+	
+	parser.add_argument(
+		'--no-key-filter',
+		action='store_true',
+		help='Scan every entry from --list, even ones that do not look like AIza... keys'
+	)
+	
+	parser.add_argument(
+		'--dedupe',
+		choices=('set', 'bloom', 'none'),
+		default='set',
+		help='Duplicate key detection: exact set, fixed-memory Bloom filter, or none (default: set)'
+	)
+	
+	parser.add_argument(
+		'--expected-keys',
+		type=int,
+		default=DEFAULT_EXPECTED_KEYS,
+		help=f'Bloom filter capacity for --dedupe bloom (default: {DEFAULT_EXPECTED_KEYS})'
 	)
 	
 	parser.add_argument(
@@ -808,25 +3640,382 @@ Examples:
 		help='Proxy URL (default: http://127.0.0.1:8080 if flag is used without value)'
 	)
 	
+	parser.add_argument(
+		'-c', '--concurrency',
+		type=int,
+		default=None,
+		help=f'Number of probes to run in parallel (default: 1, or {len(ENDPOINTS)} for a single key)'
+	)
+	
+	parser.add_argument(
+		'--engine',
+		choices=ENGINES,
+		default='threads',
+		help='Batch probe engine: thread pool or asyncio event loop (default: threads)'
+	)
+	
+	parser.add_argument(
+		'--order',
+		choices=ORDERS,
+		default=None,
+		help='Batch schedule: each endpoint across all keys, each key across all endpoints (reported as it completes), round-robin across API hosts, or each endpoint across all keys from the most expensive API down (default: cost with a budget, otherwise endpoint)'
+	)
+	
+	parser.add_argument(
+		'--per-host',
+		type=int,
+		default=DEFAULT_PER_HOST_LIMIT,
+		help=f'Maximum in-flight probes per API host with --engine async (default: {DEFAULT_PER_HOST_LIMIT})'
+	)
+	
+	parser.add_argument(
+		'--rate',
+		type=float,
+		default=DEFAULT_HOST_RATE,
+		help=f'Starting request rate per API host in req/s; adapts to throttling (default: {DEFAULT_HOST_RATE:g})'
+	)
+	
+	parser.add_argument(
+		'--max-retries',
+		type=int,
+		default=DEFAULT_MAX_RETRIES,
+		help=f'Times a throttled probe is re-queued before it is reported as throttled (default: {DEFAULT_MAX_RETRIES})'
+	)
+	
+	parser.add_argument(
+		'--max-requests',
+		type=int,
+		default=None,
+		metavar='N',
+		help='Send at most N requests; the most expensive APIs are probed first and the rest are reported as not sent'
+	)
+	
+	parser.add_argument(
+		'--deadline',
+		type=float,
+		default=None,
+		metavar='SECONDS',
+		help='Stop sending requests SECONDS after the scan starts; the most expensive APIs are probed first'
+	)
+	
+	parser.add_argument(
+		'--base-url',
+		type=str,
+		default=None,
+		help='Send every probe to this scheme://host[:port] instead of the Google API hosts (e.g. the --mock-server)'
+	)
+	
+	distributed = parser.add_argument_group('distributed scanning', 'Spread a --list scan over a local process pool, or shard it across worker processes through a shared SQLite queue')
+	distributed.add_argument(
+		'--processes',
+		type=int,
+		default=None,
+		metavar='N',
+		help='Stream the --list through a pool of N processes, each running --concurrency probes and its own --rate limit (0: one per CPU core)'
+	)
+	distributed.add_argument(
+		'--partition-size',
+		type=int,
+		default=DEFAULT_PARTITION_SIZE,
+		help=f'Keys handed to a pool process at a time (default: {DEFAULT_PARTITION_SIZE})'
+	)
+	distributed.add_argument(
+		'--workers',
+		type=int,
+		default=None,
+		metavar='N',
+		help='Scan the --list on N local worker processes, each running --concurrency probes (0: only wait for --worker processes started elsewhere)'
+	)
+	distributed.add_argument(
+		'--shard-size',
+		type=int,
+		default=DEFAULT_SHARD_SIZE,
+		help=f'Keys per shard handed to a worker (default: {DEFAULT_SHARD_SIZE})'
+	)
+	distributed.add_argument(
+		'--queue',
+		type=str,
+		default=None,
+		metavar='FILE',
+		help='Shard queue shared with the workers (default: a temporary file, removed afterwards)'
+	)
+	distributed.add_argument(
+		'--worker',
+		type=str,
+		default=None,
+		metavar='QUEUE',
+		help="Work for the coordinator using QUEUE with this command's probe options (--engine, --concurrency, --rate, ...) until it is drained"
+	)
+	
+	daemon = parser.add_argument_group('scan daemon', 'Keep a warm scanner running and take keys over a local HTTP API')
+	daemon.add_argument(
+		'--serve',
+		nargs='?',
+		const=DEFAULT_SERVE_ADDRESS,
+		default=None,
+		metavar='ADDRESS',
+		help=f'Serve POST /jobs, GET /jobs/ID[/stream] on HOST:PORT or unix:PATH (default: {DEFAULT_SERVE_ADDRESS}) with this command\'s probe options until Ctrl-C'
+	)
+	
+	mock = parser.add_argument_group('mock server', 'Serve an offline imitation of the Google Maps APIs instead of scanning')
+	mock.add_argument(
+		'--mock-server',
+		action='store_true',
+		help=f'Run the bundled mock Google API server on 127.0.0.1:--mock-port (default: {DEFAULT_MOCK_PORT}) until Ctrl-C'
+	)
+	mock.add_argument(
+		'--mock-port',
+		type=int,
+		default=DEFAULT_MOCK_PORT,
+		help=f'Port for --mock-server (default: {DEFAULT_MOCK_PORT})'
+	)
+	mock.add_argument(
+		'--mock-key',
+		action='append',
+		default=[],
+		metavar='KEY=BEHAVIOR',
+		help=f'Fix one key\'s behavior ({", ".join(MOCK_BEHAVIORS)}); repeatable'
+	)
+	mock.add_argument(
+		'--mock-mix',
+		type=str,
+		default=','.join(f"{b}={share:g}" for b, share in DEFAULT_MOCK_MIX.items()),
+		help='How other keys are spread across behaviors, by key hash (default: %(default)s)'
+	)
+	mock.add_argument(
+		'--mock-latency',
+		type=float,
+		default=0.0,
+		help='Seconds to delay every mock response (default: 0)'
+	)
+	mock.add_argument(
+		'--mock-jitter',
+		type=float,
+		default=0.0,
+		help='Spread of mock latency as a log-normal sigma; --mock-latency becomes the median (default: 0, fixed)'
+	)
+	mock.add_argument(
+		'--mock-error-rate',
+		type=float,
+		default=0.0,
+		help='Fraction of mock requests answered with 503 (default: 0)'
+	)
+	
 	args = parser.parse_args()
 	
+	if args.mock_server:
+		try:
+			mix = parse_mock_mix(args.mock_mix)
+			behaviors = dict(spec.split('=', 1) for spec in args.mock_key)
+		except ValueError as e:
+			print(f"Error: Invalid mock configuration: {e}")
+			sys.exit(1)
+		unknown = set(behaviors.values()) - set(MOCK_BEHAVIORS)
+		if unknown:
+			print(f"Error: Unknown mock behavior {', '.join(sorted(unknown))} (choose from {', '.join(MOCK_BEHAVIORS)}).")
+			sys.exit(1)
+		if not 0 <= args.mock_error_rate <= 1:
+			print("Error: --mock-error-rate must be between 0 and 1.")
+			sys.exit(1)
+		serve_mock(port=args.mock_port, behaviors=behaviors, mix=mix, latency=args.mock_latency, jitter=args.mock_jitter, error_rate=args.mock_error_rate)
+		return
+	
 	# Check for conflicting arguments
 	if args.api_key and args.list:
 		print("Error: Cannot use both --api-key and --list together. Choose one.")
 		sys.exit(1)
 	
-	# Batch mode: multiple keys from file
-	if args.list:
-		api_keys = parse_api_keys_from_file(args.list)
-		print(f"[+] Loaded {len(api_keys)} API keys from {args.list}")
-		scan_gmaps_batch(api_keys, args.proxy)
-	# Single key mode
-	elif args.api_key:
-		scan_gmaps(args.api_key, args.proxy)
-	# Interactive mode
-	else:
-		apikey = input("Please enter the Google Maps API key you wanted to test: ")
-		scan_gmaps(apikey, args.proxy)
+	if args.concurrency is None:
+		# A single key sends every test at once; larger scans start gently
+		single_key = not (args.list or args.serve or args.worker)
+		args.concurrency = len(ENDPOINTS) if single_key else 1
+	
+	if args.concurrency < 1:
+		print("Error: --concurrency must be at least 1.")
+		sys.exit(1)
+	
+	if args.rate <= 0:
+		print("Error: --rate must be positive.")
+		sys.exit(1)
+	
+	if args.max_retries < 0:
+		print("Error: --max-retries must be at least 0.")
+		sys.exit(1)
+	
+	if args.expected_keys < 1:
+		print("Error: --expected-keys must be at least 1.")
+		sys.exit(1)
+	
+	if args.engine == 'async' and aiohttp is None:
+		print("Error: --engine async requires aiohttp (pip install 'eva-gmapsapiscanner[async]').")
+		sys.exit(1)
+	
+	budgeted = args.max_requests is not None or args.deadline is not None
+	if (args.max_requests is not None and args.max_requests < 0) or (args.deadline is not None and args.deadline <= 0):
+		print("Error: --max-requests must be at least 0 and --deadline positive.")
+		sys.exit(1)
+	
+	if budgeted and (args.serve or args.worker or args.workers is not None or args.processes is not None):
+		print("Error: --max-requests and --deadline are not supported with --serve, --worker, --workers or --processes.")
+		sys.exit(1)
+	
+	if args.order is None:
+		args.order = 'cost' if budgeted else 'endpoint'
+	
+	if args.serve:
+		if args.api_key or args.list or args.worker or args.workers is not None or args.processes is not None:
+			print("Error: --serve takes keys over its API; it cannot be combined with --api-key, --list, --workers, --processes or --worker.")
+			sys.exit(1)
+		cache = ResultCache(args.cache, args.cache_ttl, args.refresh, base_url=args.base_url) if args.cache else None
+		try:
+			serve_scanner(args.serve, validate=not args.no_key_filter, proxy_url=args.proxy, concurrency=args.concurrency, engine=args.engine, base_url=args.base_url, per_host=args.per_host, rate=args.rate, max_retries=args.max_retries, triage=not args.no_triage, cache=cache)
+		except (OSError, ValueError) as e:
+			print(f"Error: Cannot serve on {args.serve}: {e}")
+			sys.exit(1)
+		finally:
+			if cache is not None:
+				cache.close()
+		return
+	
+	if args.worker:
+		print(f"[+] Worker {default_worker_id()} scanning shards from {args.worker}")
+		try:
+			completed = run_worker(args.worker, proxy_url=args.proxy, concurrency=args.concurrency, engine=args.engine, base_url=args.base_url, per_host=args.per_host, rate=args.rate, max_retries=args.max_retries, triage=not args.no_triage)
+		except KeyboardInterrupt:
+			print("\n[!] Worker interrupted; its shard goes back to the queue when the lease runs out.")
+			sys.exit(130)
+		print(f"[+] Queue drained, {completed} shards scanned by this worker.")
+		return
+	
+	if args.workers is not None:
+		if not args.list:
+			print("Error: --workers only applies to --list scans.")
+			sys.exit(1)
+		if args.workers < 0 or args.shard_size < 1:
+			print("Error: --workers must be at least 0 and --shard-size at least 1.")
+			sys.exit(1)
+		if args.workers == 0 and not args.queue:
+			print("Error: --workers 0 needs a --queue for the remote workers to share.")
+			sys.exit(1)
+		if args.cache or args.checkpoint or args.stream:
+			print("Error: --cache, --checkpoint and --stream are not supported with --workers.")
+			sys.exit(1)
+		if args.queue and os.path.isfile(args.queue) and os.path.getsize(args.queue):
+			print(f"Error: Queue {args.queue} already exists. Delete it to start a new scan.")
+			sys.exit(1)
+	elif args.queue:
+		print("Error: --queue requires --workers.")
+		sys.exit(1)
+	
+	if args.processes is not None:
+		if not args.list:
+			print("Error: --processes only applies to --list scans.")
+			sys.exit(1)
+		if args.processes < 0 or args.partition_size < 1:
+			print("Error: --processes must be at least 0 and --partition-size at least 1.")
+			sys.exit(1)
+		if args.workers is not None:
+			print("Error: Choose either --processes or --workers.")
+			sys.exit(1)
+		if args.cache or args.checkpoint:
+			print("Error: --cache and --checkpoint are not supported with --processes.")
+			sys.exit(1)
+	
+	if args.resume and not args.checkpoint:
+		print("Error: --resume requires --checkpoint.")
+		sys.exit(1)
+	
+	if args.checkpoint and not args.list:
+		print("Error: --checkpoint only applies to --list scans.")
+		sys.exit(1)
+	
+	if args.cache and not args.list:
+		print("Error: --cache only applies to --list scans and --serve.")
+		sys.exit(1)
+	
+	if (args.timings or args.metrics) and not args.list:
+		print("Error: --timings and --metrics only apply to --list scans.")
+		sys.exit(1)
+	
+	if args.checkpoint and not args.resume and os.path.isfile(args.checkpoint) and os.path.getsize(args.checkpoint):
+		print(f"Error: Checkpoint {args.checkpoint} already exists. Use --resume to continue it or delete it to start over.")
+		sys.exit(1)
+	
+	key_filter = KeyFilter(validate=not args.no_key_filter, dedupe=args.dedupe, expected_keys=args.expected_keys)
+	cache = ResultCache(args.cache, args.cache_ttl, args.refresh, base_url=args.base_url) if args.cache else None
+	checkpoint = CheckpointJournal(args.checkpoint, resume=args.resume, base_url=args.base_url) if args.checkpoint else None
+	metrics = ProbeMetrics() if args.timings or args.metrics else None
+	try:
+		sink = open_sink(args.output_format, args.output, full_keys=args.sarif_full_keys)
+	except OSError as e:
+		print(f"Error opening output file: {e}")
+		sys.exit(1)
+	verbosity = QUIET if args.quiet else VERBOSE if args.verbose else NORMAL
+	# The deadline clock starts here, once the inputs are validated
+	budget = ProbeBudget(args.max_requests, args.deadline) if budgeted else None
+	# Keep stdout machine-readable when records are written there
+	report = contextlib.redirect_stdout(sys.stderr) if sink is not None and args.output == '-' else contextlib.nullcontext()
+	
+	with report:
+		try:
+			# Process-pool mode: partitions of the list scanned on every core
+			if args.list and args.processes is not None:
+				try:
+					api_keys = iter_api_keys(args.list)
+				except OSError as e:
+					print(f"Error reading file: {e}")
+					sys.exit(1)
+				scan_gmaps_parallel(api_keys, args.processes or None, args.partition_size, args.proxy, args.concurrency, engine=args.engine, base_url=args.base_url, per_host=args.per_host, rate=args.rate, max_retries=args.max_retries, key_filter=key_filter, triage=not args.no_triage, sink=sink, verbosity=verbosity, progress=args.progress, metrics=metrics)
+			# Streaming mode: keys read lazily from file or stdin
+			elif args.list and args.stream:
+				try:
+					api_keys = iter_api_keys(args.list)
+				except OSError as e:
+					print(f"Error reading file: {e}")
+					sys.exit(1)
+				scan_gmaps_stream(api_keys, args.proxy, args.concurrency, engine=args.engine, per_host=args.per_host, limiter=HostRateLimiter(args.rate), max_retries=args.max_retries, key_filter=key_filter, triage=not args.no_triage, cache=cache, base_url=args.base_url, checkpoint=checkpoint, sink=sink, verbosity=verbosity, progress=args.progress, metrics=metrics, budget=budget)
+			# Distributed mode: shards of the list scanned by worker processes
+			elif args.list and args.workers is not None:
+				api_keys = list(key_filter(parse_api_keys_from_file(args.list)))
+				print(f"[+] Loaded {len(api_keys)} API keys from {args.list}: {key_filter.summary()}")
+				if not api_keys:
+					print("Error: No valid API keys to scan (use --no-key-filter to scan them anyway).")
+					sys.exit(1)
+				scan_gmaps_distributed(api_keys, args.workers, args.shard_size, args.queue, args.proxy, args.concurrency, engine=args.engine, base_url=args.base_url, per_host=args.per_host, rate=args.rate, max_retries=args.max_retries, triage=not args.no_triage, sink=sink, verbosity=verbosity, progress=args.progress, metrics=metrics)
+			# Batch mode: multiple keys from file
+			elif args.list:
+				api_keys = list(key_filter(parse_api_keys_from_file(args.list)))
+				print(f"[+] Loaded {len(api_keys)} API keys from {args.list}: {key_filter.summary()}")
+				if not api_keys:
+					print("Error: No valid API keys to scan (use --no-key-filter to scan them anyway).")
+					sys.exit(1)
+				scan_gmaps_batch(api_keys, args.proxy, args.concurrency, engine=args.engine, per_host=args.per_host, limiter=HostRateLimiter(args.rate), max_retries=args.max_retries, triage=not args.no_triage, cache=cache, checkpoint=checkpoint, order=args.order, base_url=args.base_url, sink=sink, verbosity=verbosity, progress=args.progress, metrics=metrics, budget=budget)
+			# Single key mode
+			elif args.api_key:
+				scan_gmaps(args.api_key, args.proxy, triage=not args.no_triage, sink=sink, verbosity=verbosity, base_url=args.base_url, concurrency=args.concurrency, limiter=HostRateLimiter(args.rate), max_retries=args.max_retries, budget=budget)
+			# Interactive mode
+			else:
+				apikey = input("Please enter the Google Maps API key you wanted to test: ")
+				scan_gmaps(apikey, args.proxy, triage=not args.no_triage, sink=sink, verbosity=verbosity, base_url=args.base_url, concurrency=args.concurrency, limiter=HostRateLimiter(args.rate), max_retries=args.max_retries, budget=budget)
+			if args.timings:
+				print_latency_summary(metrics)
+		except KeyboardInterrupt:
+			print("\n[!] Scan interrupted.")
+			if checkpoint is not None:
+				print(f"[!] {checkpoint.recorded} new verdicts saved to {checkpoint.path}; rerun with --resume to continue.")
+			sys.exit(130)
+		finally:
+			if cache is not None:
+				cache.close()
+			if checkpoint is not None:
+				checkpoint.close()
+			if sink is not None:
+				sink.close()
+			if args.metrics:
+				try:
+					metrics.write(args.metrics, args.metrics_format)
+				except OSError as e:
+					print(f"Error writing metrics: {e}")
 
 if __name__ == "__main__":
     main()
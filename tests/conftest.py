@@ -16,6 +16,14 @@ def temp_dir() -> Generator[Path, None, None]:
     shutil.rmtree(temp_path)
 
 
+@pytest.fixture
+def vulnerable_pairs():
+    """Flatten a batch results mapping into the (endpoint, key) pairs found vulnerable."""
+    def pairs(results):
+        return {(api, key) for api, keys in results.items() for key, vulnerable in keys.items() if vulnerable}
+    return pairs
+
+
 @pytest.fixture
 def mock_env_vars(monkeypatch) -> Dict[str, str]:
     """Mock environment variables for testing."""
@@ -0,0 +1,53 @@
+"""Integration tests for the throughput benchmark harness."""
+import importlib.util
+import json
+from pathlib import Path
+
+import pytest
+
+
+BENCH_PATH = Path(__file__).resolve().parents[2] / "benchmarks" / "bench_scan.py"
+
+
+@pytest.fixture(scope="module")
+def bench():
+    spec = importlib.util.spec_from_file_location("bench_scan", BENCH_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.mark.integration
+def test_run_case_measures_a_child_scan(bench):
+    case = bench.run_case(3, "threads", 8, "stream", "none")
+
+    assert case["probes"] == 3 * len(bench.scanner.ENDPOINTS)
+    assert case["requests_served"] == case["probes_sent"] > 0
+    assert case["connections_opened"] >= 1
+    assert case["probes_per_second"] > 0
+    assert case["latency_p50_ms"] <= case["latency_p99_ms"]
+    assert sum(case["verdicts"].values()) == case["probes"]
+
+
+@pytest.mark.integration
+def test_results_file_and_baseline_comparison(bench, temp_dir, monkeypatch, capsys):
+    first = temp_dir / "first.json"
+    second = temp_dir / "second.json"
+    monkeypatch.setattr("sys.argv", ["bench", "--sizes", "1", "--latency", "none", "--output", str(first)])
+    bench.main()
+    monkeypatch.setattr("sys.argv", ["bench", "--sizes", "1", "--latency", "none", "--output", str(second), "--baseline", str(first)])
+    bench.main()
+
+    report = json.loads(second.read_text())
+    assert report["environment"]["python"]
+    assert [bench.case_id(case) for case in report["cases"]] == ["stream/threads/c64/none/1"]
+    assert "vs baseline" in capsys.readouterr().out
+
+
+@pytest.mark.unit
+def test_synthetic_keys_pass_the_key_filter(bench):
+    keys = bench.synthetic_keys(50)
+
+    assert len(set(keys)) == 50
+    assert list(bench.scanner.KeyFilter()(keys)) == keys
+    assert bench.percentile([3.0, 1.0, 2.0], 0.5) == 2.0
@@ -0,0 +1,72 @@
+"""Integration tests for sharded scans on worker processes against the local stub server."""
+import threading
+
+import pytest
+
+import eva_gmaps_scanner as scanner
+
+from .conftest import DENIED_KEY, INVALID_KEY, OPEN_KEY
+
+
+def _verdicts(results):
+    return {api: dict(keys) for api, keys in results.items()}
+
+
+@pytest.mark.integration
+def test_worker_processes_match_a_single_process_scan(stub_google_server, capsys):
+    keys = [OPEN_KEY, DENIED_KEY, INVALID_KEY]
+
+    distributed = scanner.scan_gmaps_distributed(
+        keys, workers=2, shard_size=1, concurrency=4, base_url=stub_google_server.base_url, poll=0.01)
+    batch = scanner.scan_gmaps_batch(keys, concurrency=4, base_url=stub_google_server.base_url)
+
+    assert _verdicts(distributed) == _verdicts(batch)
+    out = capsys.readouterr().out
+    assert "3 shards of up to 1 keys" in out
+    assert "Triage: 1/3 keys were invalid" in out
+
+
+@pytest.mark.integration
+def test_coordinator_waits_for_remote_workers(stub_google_server, temp_dir, capsys):
+    queue = str(temp_dir / "shards.sqlite3")
+    worker = threading.Thread(target=scanner.run_worker, args=(queue,), kwargs=dict(base_url=stub_google_server.base_url, poll=0.01))
+    worker.start()
+
+    results = scanner.scan_gmaps_distributed(
+        [OPEN_KEY, DENIED_KEY], workers=0, queue_path=queue, base_url=stub_google_server.base_url, poll=0.01)
+    worker.join(timeout=30)
+
+    assert not worker.is_alive()
+    assert all(results[endpoint.name][OPEN_KEY] for endpoint in scanner.ENDPOINTS)
+    assert not any(results[endpoint.name][DENIED_KEY] for endpoint in scanner.ENDPOINTS)
+
+
+class _RecordingSink(scanner.OutputSink):
+    def __init__(self):
+        self.count = 0
+        self.results = []
+
+    def _write(self, result):
+        self.results.append(result)
+
+    def close(self):
+        pass
+
+
+@pytest.mark.integration
+def test_process_pool_matches_a_single_process_scan(stub_google_server, capsys):
+    keys = [OPEN_KEY, DENIED_KEY, INVALID_KEY]
+    sink = _RecordingSink()
+
+    summary = scanner.scan_gmaps_parallel(
+        iter(keys), processes=2, partition_size=1, concurrency=4, base_url=stub_google_server.base_url, sink=sink)
+    batch = scanner.scan_gmaps_batch(keys, concurrency=4, base_url=stub_google_server.base_url)
+
+    parallel = {}
+    for result in sink.results:
+        parallel.setdefault(result.endpoint.name, {})[result.apikey] = result.vulnerable
+    assert parallel == _verdicts(batch)
+    assert summary == {'keys': 3, 'vulnerable_keys': 1, 'vulnerable_probes': len(scanner.ENDPOINTS), 'invalid_keys': 1}
+    out = capsys.readouterr().out
+    assert "on 2 processes" in out
+    assert "Key 3:" in out
@@ -0,0 +1,291 @@
+"""Integration tests for the probe engines against the local stub server."""
+import json
+import time
+
+import pytest
+
+import eva_gmaps_scanner as scanner
+
+from .conftest import DENIED_KEY, INVALID_KEY, OPEN_KEY
+
+
+@pytest.mark.integration
+@pytest.mark.parametrize("engine", scanner.ENGINES)
+def test_engine_classifies_every_endpoint(stub_google_server, engine, capsys, vulnerable_pairs):
+    results = scanner.scan_gmaps_batch(
+        [OPEN_KEY, DENIED_KEY], concurrency=8, engine=engine, base_url=stub_google_server.base_url)
+
+    assert vulnerable_pairs(results) == {(endpoint.name, OPEN_KEY) for endpoint in scanner.ENDPOINTS}
+    assert "Error" not in capsys.readouterr().out
+
+
+@pytest.mark.integration
+def test_async_engine_reads_reasons_from_error_shapes(stub_google_server):
+    by_name = {endpoint.name: endpoint for endpoint in scanner.ENDPOINTS}
+
+    with scanner.AsyncEngine(concurrency=4, per_host=2, base_url=stub_google_server.base_url) as engine:
+        results = {name: engine.submit(by_name[name], DENIED_KEY).result()
+                   for name in ("Geocode API", "Timezone API", "Nearest Roads API", "Solar API")}
+
+    for result in results.values():
+        assert result.vulnerable is False
+        assert result.reason == "This API key is not authorized to use this service or API."
+        assert result.verdict is scanner.Verdict.DENIED
+
+
+@pytest.mark.integration
+def test_async_engine_reports_connection_errors():
+    with scanner.AsyncEngine(concurrency=2, timeout=2, base_url="http://127.0.0.1:9") as engine:
+        result = engine.submit(scanner.ENDPOINTS[2], OPEN_KEY).result()
+
+    assert result.vulnerable is False
+    assert result.error
+
+
+@pytest.mark.integration
+def test_async_engine_probes_once_with_negative_retries(stub_google_server):
+    with scanner.AsyncEngine(max_retries=-1, base_url=stub_google_server.base_url) as engine:
+        result = engine.submit(scanner.ENDPOINTS[2], OPEN_KEY).result()
+
+    assert result.vulnerable is True and result.attempts == 1
+
+
+@pytest.mark.integration
+@pytest.mark.parametrize("engine", scanner.ENGINES)
+def test_throttled_probes_are_retried_not_marked_safe(stub_google_server, engine, capsys):
+    stub_google_server.throttle_remaining[OPEN_KEY] = 10
+    limiter = scanner.HostRateLimiter(backoff_base=0.01, backoff_cap=0.05)
+
+    results = scanner.scan_gmaps_batch(
+        [OPEN_KEY], concurrency=4, engine=engine, base_url=stub_google_server.base_url, limiter=limiter, triage=False)
+
+    assert all(results[endpoint.name][OPEN_KEY] for endpoint in scanner.ENDPOINTS)
+    assert sum(limiter.throttle_counts().values()) == 10
+    assert "Effective request rate per host" in capsys.readouterr().out
+
+
+@pytest.mark.integration
+def test_probes_that_stay_throttled_are_unknown(stub_google_server, capsys):
+    stub_google_server.throttle_remaining[OPEN_KEY] = 10_000
+    limiter = scanner.HostRateLimiter(rate=1000, min_rate=1000, backoff_base=0.001, backoff_cap=0.002)
+
+    results = scanner.scan_gmaps_batch(
+        [OPEN_KEY], concurrency=4, base_url=stub_google_server.base_url, limiter=limiter, max_retries=2)
+
+    assert all(results[endpoint.name].get(OPEN_KEY) is None for endpoint in scanner.ENDPOINTS)
+    out = capsys.readouterr().out
+    assert "Throttled - gave up after 3 attempts" in out
+    assert "? Unknown" in out
+
+
+@pytest.mark.integration
+def test_stream_scan_reports_each_key_and_skips_duplicates(stub_google_server, capsys):
+    keys = iter([DENIED_KEY, OPEN_KEY, DENIED_KEY, OPEN_KEY])
+
+    summary = scanner.scan_gmaps_stream(keys, concurrency=8, base_url=stub_google_server.base_url)
+
+    assert summary == {"keys": 2, "vulnerable_keys": 1, "vulnerable_probes": len(scanner.ENDPOINTS), "invalid_keys": 0}
+    out = capsys.readouterr().out
+    assert "32/32 vulnerable" in out
+    assert "0/32 vulnerable" in out
+
+
+@pytest.mark.integration
+@pytest.mark.parametrize("engine", scanner.ENGINES)
+def test_triage_skips_invalid_keys_in_batch(stub_google_server, engine, capsys):
+    results = scanner.scan_gmaps_batch(
+        [OPEN_KEY, INVALID_KEY], concurrency=4, engine=engine, base_url=stub_google_server.base_url)
+
+    assert stub_google_server.requests == len(scanner.ENDPOINTS) + 1
+    assert all(results[endpoint.name][INVALID_KEY] is False for endpoint in scanner.ENDPOINTS)
+    assert all(results[endpoint.name][OPEN_KEY] for endpoint in scanner.ENDPOINTS)
+    out = capsys.readouterr().out
+    assert "Triage: 1/2 keys are invalid" in out
+    assert "Invalid key (skipped)" in out
+
+
+@pytest.mark.integration
+@pytest.mark.parametrize("engine", scanner.ENGINES)
+def test_triage_skips_invalid_keys_in_stream(stub_google_server, engine, capsys):
+    summary = scanner.scan_gmaps_stream(
+        iter([INVALID_KEY, DENIED_KEY]), concurrency=4, engine=engine, base_url=stub_google_server.base_url)
+
+    assert summary["invalid_keys"] == 1
+    assert stub_google_server.requests == len(scanner.ENDPOINTS) + 1
+    out = capsys.readouterr().out
+    assert "invalid key" in out
+    assert "The provided API key is invalid." in out
+
+
+@pytest.mark.integration
+def test_stream_without_triage_probes_everything(stub_google_server, capsys):
+    scanner.scan_gmaps_stream(iter([INVALID_KEY]), base_url=stub_google_server.base_url, triage=False)
+
+    assert stub_google_server.requests == len(scanner.ENDPOINTS)
+
+
+@pytest.mark.integration
+@pytest.mark.parametrize("engine", scanner.ENGINES)
+def test_rescan_with_cache_needs_no_network(stub_google_server, temp_dir, engine, capsys, vulnerable_pairs):
+    path = str(temp_dir / "results.sqlite3")
+    keys = [OPEN_KEY, DENIED_KEY]
+
+    cache = scanner.ResultCache(path)
+    first = scanner.scan_gmaps_batch(keys, concurrency=4, engine=engine, base_url=stub_google_server.base_url, cache=cache)
+    cache.close()
+    sent = stub_google_server.requests
+
+    cache = scanner.ResultCache(path)
+    second = scanner.scan_gmaps_batch(keys, concurrency=4, engine=engine, base_url=stub_google_server.base_url, cache=cache)
+    cache.close()
+
+    assert stub_google_server.requests == sent
+    assert vulnerable_pairs(first) == vulnerable_pairs(second)
+    assert f"{2 * len(scanner.ENDPOINTS)} verdicts reused, 0 probed" in capsys.readouterr().out
+
+
+@pytest.mark.integration
+@pytest.mark.parametrize("engine", scanner.ENGINES)
+def test_resumed_scan_skips_journaled_work(stub_google_server, temp_dir, engine, capsys, vulnerable_pairs):
+    path = str(temp_dir / "scan.jsonl")
+    keys = [OPEN_KEY, DENIED_KEY]
+
+    journal = scanner.CheckpointJournal(path)
+    scanner.scan_gmaps_batch(keys[:1], concurrency=4, engine=engine, base_url=stub_google_server.base_url, checkpoint=journal)
+    journal.close()
+    sent = stub_google_server.requests
+
+    journal = scanner.CheckpointJournal(path, resume=True)
+    results = scanner.scan_gmaps_batch(keys, concurrency=4, engine=engine, base_url=stub_google_server.base_url, checkpoint=journal)
+    journal.close()
+
+    assert stub_google_server.requests - sent == len(scanner.ENDPOINTS)
+    assert vulnerable_pairs(results) == {(endpoint.name, OPEN_KEY) for endpoint in scanner.ENDPOINTS}
+    assert f"{len(scanner.ENDPOINTS)} verdicts resumed" in capsys.readouterr().out
+
+
+@pytest.mark.integration
+def test_thread_engine_counts_the_attempt_refused_by_the_budget(stub_google_server):
+    budget = scanner.ProbeBudget(max_requests=1)
+
+    with scanner.ThreadEngine(scanner.create_session(), base_url=stub_google_server.base_url, budget=budget) as engine:
+        results = [engine.submit(endpoint, OPEN_KEY).result() for endpoint in scanner.ENDPOINTS[:2]]
+
+    assert results[1].error == scanner.BUDGET_EXHAUSTED
+    assert [result.attempts for result in results] == [1, 1]
+
+
+@pytest.mark.integration
+def test_retry_after_thread_engine_shutdown_keeps_throttled_verdict(stub_google_server):
+    stub_google_server.throttle_remaining[OPEN_KEY] = 10
+    limiter = scanner.HostRateLimiter(backoff_base=0.2, backoff_cap=0.2)
+    endpoint = scanner.ENDPOINTS[0]
+
+    with scanner.ThreadEngine(scanner.create_session(), base_url=stub_google_server.base_url, limiter=limiter) as engine:
+        future = engine.submit(endpoint, OPEN_KEY)
+        while stub_google_server.requests == 0:
+            time.sleep(0.01)
+
+    result = future.result(timeout=5)
+    assert result.throttled
+    assert result.attempts == 1
+
+
+@pytest.mark.integration
+def test_interrupted_thread_engine_drops_queued_probes(stub_google_server):
+    engine = scanner.ThreadEngine(scanner.create_session(), concurrency=1, base_url=stub_google_server.base_url)
+
+    with pytest.raises(KeyboardInterrupt):
+        with engine:
+            futures = [engine.submit(endpoint, OPEN_KEY) for endpoint in scanner.ENDPOINTS]
+            raise KeyboardInterrupt
+
+    assert any(future.cancelled() for future in futures)
+    assert stub_google_server.requests < len(scanner.ENDPOINTS)
+
+
+@pytest.mark.integration
+def test_stream_writes_jsonl_records(stub_google_server, temp_dir, capsys):
+    path = temp_dir / "verdicts.jsonl"
+    sink = scanner.JsonlSink(str(path))
+
+    scanner.scan_gmaps_stream(iter([OPEN_KEY, INVALID_KEY]), concurrency=8, base_url=stub_google_server.base_url, sink=sink)
+    sink.close()
+
+    records = [json.loads(line) for line in path.read_text().splitlines()]
+    by_key = {key: [r["verdict"] for r in records if r["key"] == key] for key in (OPEN_KEY, INVALID_KEY)}
+    assert by_key[OPEN_KEY] == ["vulnerable"] * len(scanner.ENDPOINTS)
+    assert set(by_key[INVALID_KEY]) == {"invalid_key"}
+    assert len(by_key[INVALID_KEY]) == len(scanner.ENDPOINTS)
+
+
+@pytest.mark.integration
+@pytest.mark.parametrize("engine", scanner.ENGINES)
+def test_batch_scan_records_probe_timings(stub_google_server, engine, capsys):
+    metrics = scanner.ProbeMetrics()
+
+    scanner.scan_gmaps_batch(
+        [OPEN_KEY, DENIED_KEY], concurrency=4, engine=engine, base_url=stub_google_server.base_url, triage=False, metrics=metrics)
+
+    assert set(metrics.endpoints) == {endpoint.name for endpoint in scanner.ENDPOINTS}
+    assert all(histogram.count == 2 for histogram in metrics.endpoints.values())
+    histogram = metrics.hosts()["maps.googleapis.com"]
+    for phase in ("queue", "connect", "ttfb", "body", "classify"):
+        assert histogram.phase_mean(phase) is not None, phase
+
+
+@pytest.mark.integration
+def test_single_key_scan_runs_probes_concurrently(mocker, capsys):
+    mocker.patch("builtins.input", return_value="N")
+    with scanner.MockGoogleServer(behaviors={OPEN_KEY: "allowed"}, latency=0.2) as server:
+        started = scanner.time.perf_counter()
+        scanner.scan_gmaps(OPEN_KEY, base_url=server.base_url)
+        elapsed = scanner.time.perf_counter() - started
+
+    # Triage, then one concurrent round; a sequential scan takes 32 x 0.2 s
+    assert elapsed < 2.0
+    out = capsys.readouterr().out
+    positions = [out.index(f"{i}. Testing {e.title or e.name}") for i, e in enumerate(scanner.ENDPOINTS, 1)]
+    assert positions == sorted(positions)
+    assert "not vulnerable" not in out
+
+
+@pytest.mark.integration
+@pytest.mark.parametrize("order,triage_line", [("endpoint", "1 are restricted"), ("key", "1 were restricted")])
+def test_referer_restricted_keys_skip_web_services(order, triage_line, capsys):
+    key = "AIzaSyRefererKey000000000000000000000000"
+    with scanner.MockGoogleServer(behaviors={key: "referer"}) as server:
+        results = scanner.scan_gmaps_batch([key], concurrency=4, base_url=server.base_url, order=order)
+        sent = server.requests
+
+    assert sent == 1 + sum(1 for e in scanner.ENDPOINTS if e.client_side)
+    assert not any(results[e.name][key] for e in scanner.ENDPOINTS)
+    assert triage_line in capsys.readouterr().out
+
+
+@pytest.mark.integration
+@pytest.mark.parametrize("engine", scanner.ENGINES)
+def test_budget_probes_most_expensive_endpoints_first(stub_google_server, engine, capsys, vulnerable_pairs):
+    budget = scanner.ProbeBudget(max_requests=10)
+
+    results = scanner.scan_gmaps_batch(
+        [OPEN_KEY, DENIED_KEY], concurrency=1, engine=engine, base_url=stub_google_server.base_url,
+        order="cost", triage=False, budget=budget)
+
+    assert stub_google_server.requests == 10
+    probed = {api for api, key in vulnerable_pairs(results)}
+    assert probed == {e.name for e in scanner.by_price(scanner.ENDPOINTS)[:5]}
+    out = capsys.readouterr().out
+    assert scanner.BUDGET_EXHAUSTED in out
+    assert "10 requests sent" in out
+
+
+@pytest.mark.integration
+def test_key_order_budget_probes_most_expensive_endpoints_first(stub_google_server, capsys, vulnerable_pairs):
+    budget = scanner.ProbeBudget(max_requests=5)
+
+    results = scanner.scan_gmaps_batch(
+        [OPEN_KEY], concurrency=1, base_url=stub_google_server.base_url, order="key", triage=False, budget=budget)
+
+    probed = {api for api, key in vulnerable_pairs(results)}
+    assert probed == {e.name for e in scanner.by_price(scanner.ENDPOINTS)[:5]}
@@ -0,0 +1,76 @@
+"""Integration tests for the bundled mock Google server."""
+import pytest
+
+import eva_gmaps_scanner as scanner
+
+
+KEYS = [f"AIzaSyMockKey{i:026d}" for i in range(200)]
+
+
+@pytest.mark.integration
+def test_mix_assigns_behaviors_deterministically():
+    mix = {"allowed": 0.25, "denied": 0.5, "invalid": 0.25}
+    first = scanner.MockGoogleServer(mix=mix)
+    second = scanner.MockGoogleServer(mix=mix)
+    try:
+        behaviors = [first.behavior_for(key) for key in KEYS]
+
+        assert behaviors == [second.behavior_for(key) for key in KEYS]
+        assert {"allowed", "denied", "invalid"} == set(behaviors)
+    finally:
+        first.server_close()
+        second.server_close()
+
+
+@pytest.mark.integration
+def test_throttled_keys_are_reported_as_throttled(capsys):
+    key = KEYS[0]
+    limiter = scanner.HostRateLimiter(rate=1000, min_rate=1000, backoff_base=0.001, backoff_cap=0.002)
+
+    with scanner.MockGoogleServer(behaviors={key: "throttled"}) as server:
+        results = scanner.scan_gmaps_batch([key], concurrency=8, base_url=server.base_url, limiter=limiter, max_retries=1, triage=False)
+
+    assert all(key not in verdicts for verdicts in results.values())
+    assert "Throttled - gave up after 2 attempts" in capsys.readouterr().out
+
+
+@pytest.mark.integration
+def test_error_rate_injects_unavailable_responses():
+    with scanner.MockGoogleServer(error_rate=1.0, seed=1) as server:
+        result = scanner.probe(scanner.create_session(), scanner.TRIAGE_ENDPOINT, KEYS[0], base_url=server.base_url)
+
+    assert result.status_code == 503
+    assert not result.vulnerable
+    assert result.error == "Server error (HTTP 503)"
+
+
+@pytest.mark.integration
+def test_latency_is_injected():
+    with scanner.MockGoogleServer(latency=0.05) as server:
+        started = scanner.time.monotonic()
+        scanner.probe(scanner.create_session(), scanner.TRIAGE_ENDPOINT, KEYS[0], base_url=server.base_url)
+
+    assert scanner.time.monotonic() - started >= 0.05
+
+
+@pytest.mark.unit
+def test_parse_mock_mix_rejects_unknown_behaviors():
+    assert scanner.parse_mock_mix("allowed=1,denied=3") == {"allowed": 1.0, "denied": 3.0}
+    with pytest.raises(ValueError):
+        scanner.parse_mock_mix("open=1")
+
+
+@pytest.mark.integration
+def test_image_probes_drop_the_connection_instead_of_downloading():
+    key = KEYS[0]
+    staticmap = scanner.ENDPOINTS[0]
+
+    with scanner.MockGoogleServer(behaviors={key: "allowed"}) as server:
+        with scanner.ThreadEngine(scanner.create_session(), base_url=server.base_url) as runner:
+            results = [runner.submit(staticmap, key).result() for _ in range(3)]
+            runner.submit(scanner.TRIAGE_ENDPOINT, key).result()
+            runner.submit(scanner.TRIAGE_ENDPOINT, key).result()
+
+    assert all(result.vulnerable for result in results)
+    # Each cut-off image closes its connection; the JSON probes then share one
+    assert server.connections == 4
@@ -0,0 +1,57 @@
+"""Integration tests for the --serve daemon's HTTP API against the local stub server."""
+import json
+import threading
+
+import pytest
+import requests
+
+import eva_gmaps_scanner as scanner
+
+from .conftest import DENIED_KEY, OPEN_KEY
+
+
+@pytest.fixture
+def daemon(stub_google_server):
+    with scanner.Scanner(concurrency=16, base_url=stub_google_server.base_url) as api:
+        server = scanner.create_daemon_server("127.0.0.1:0", scanner.ScanDaemon(api))
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        yield server
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.mark.integration
+def test_submitted_job_can_be_waited_for(daemon):
+    submitted = requests.post(daemon.url + "/jobs", data=f"{OPEN_KEY}\n{DENIED_KEY}\nnot-a-key")
+
+    assert submitted.status_code == 202
+    assert submitted.json()["keys"] == 2 and submitted.json()["rejected"] == 1
+    job = requests.get(daemon.url + submitted.headers["Location"], params={"wait": 10}).json()
+
+    assert job["status"] == "done"
+    reports = {report["key"]: report for report in job["reports"]}
+    assert len(reports[OPEN_KEY]["vulnerable"]) == len(scanner.ENDPOINTS)
+    assert reports[DENIED_KEY]["vulnerable"] == []
+    assert reports[DENIED_KEY]["results"][0]["verdict"] == "denied"
+
+
+@pytest.mark.integration
+def test_job_stream_sends_a_line_per_key_then_the_status(daemon):
+    submitted = requests.post(daemon.url + "/jobs", json={"keys": [OPEN_KEY, DENIED_KEY]})
+
+    lines = [json.loads(line) for line in requests.get(daemon.url + submitted.headers["Location"] + "/stream").text.splitlines()]
+
+    assert {line["key"] for line in lines[:-1]} == {OPEN_KEY, DENIED_KEY}
+    assert lines[-1]["status"] == "done" and lines[-1]["completed"] == 2
+
+
+@pytest.mark.integration
+def test_unknown_and_forgotten_jobs_are_not_found(daemon):
+    submitted = requests.post(daemon.url + "/jobs", json={"key": OPEN_KEY})
+    location = daemon.url + submitted.headers["Location"]
+
+    assert requests.delete(location).status_code == 200
+    assert requests.get(location).status_code == 404
+    assert requests.get(daemon.url + "/jobs/unknown").status_code == 404
+    assert requests.get(daemon.url + "/health").json()["submitted"] == 1
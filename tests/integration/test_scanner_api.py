@@ -0,0 +1,48 @@
+"""Integration tests for the programmatic Scanner API against the local stub server."""
+import asyncio
+
+import pytest
+
+import eva_gmaps_scanner as scanner
+
+from .conftest import DENIED_KEY, INVALID_KEY, OPEN_KEY
+
+
+@pytest.mark.integration
+@pytest.mark.parametrize("engine", scanner.ENGINES)
+def test_scan_returns_a_report_without_printing(stub_google_server, engine, mocker, capsys):
+    prompt = mocker.patch("builtins.input")
+
+    with scanner.Scanner(engine=engine, base_url=stub_google_server.base_url) as api:
+        report = api.scan(OPEN_KEY)
+
+    assert [r.endpoint for r in report.results] == scanner.ENDPOINTS
+    assert report.vulnerable == scanner.ENDPOINTS
+    assert report.costs[0] == scanner.ENDPOINTS[0].costs[0]
+    assert capsys.readouterr() == ("", "")
+    prompt.assert_not_called()
+
+
+@pytest.mark.integration
+def test_scan_many_reuses_one_transport(stub_google_server):
+    with scanner.Scanner(concurrency=8, base_url=stub_google_server.base_url) as api:
+        reports = {report.apikey: report for report in api.scan_many(iter([OPEN_KEY, DENIED_KEY, INVALID_KEY]))}
+
+    assert set(reports) == {OPEN_KEY, DENIED_KEY, INVALID_KEY}
+    assert reports[INVALID_KEY].invalid and reports[INVALID_KEY].restriction is scanner.Restriction.INVALID
+    assert reports[DENIED_KEY].vulnerable == [] and not reports[DENIED_KEY].invalid
+    assert stub_google_server.connections < stub_google_server.requests
+
+
+@pytest.mark.integration
+def test_async_scans_run_on_the_callers_loop(stub_google_server):
+    async def scan_all(api):
+        single = await api.ascan(OPEN_KEY)
+        many = [report async for report in api.ascan_many([DENIED_KEY, INVALID_KEY])]
+        return single, many
+
+    with scanner.Scanner(base_url=stub_google_server.base_url) as api:
+        single, many = asyncio.run(scan_all(api))
+
+    assert len(single.vulnerable) == len(scanner.ENDPOINTS)
+    assert {report.apikey for report in many} == {DENIED_KEY, INVALID_KEY}
@@ -0,0 +1,33 @@
+"""Fixtures shared by the unit tests."""
+import time
+
+import pytest
+
+
+def _key_of(url, headers):
+    if headers and "Authorization" in headers:
+        return headers["Authorization"].split("key=")[-1]
+    return url.split("key=")[-1].split("&")[0]
+
+
+@pytest.fixture
+def fake_request():
+    """Factory for Session.request replacements that report the keys in ``vulnerable_keys`` as open."""
+    def build(vulnerable_keys, delay=0.0):
+        def request(method, url, headers=None, allow_redirects=True, **kwargs):
+            time.sleep(delay)
+            response = type("Response", (), {})()
+            key = _key_of(url, headers)
+            if key not in vulnerable_keys:
+                response.status_code = 403
+            else:
+                response.status_code = 200 if allow_redirects else 302
+            response.text = "{}" if key in vulnerable_keys else '{"error_message": "denied", "errorMessage": "denied", "error": {}}'
+            response.content = response.text.encode()
+            response.headers = {}
+            response.encoding = None
+            response.iter_content = lambda chunk_size=1: iter([response.content])
+            response.close = lambda: None
+            return response
+        return request
+    return build
@@ -0,0 +1,121 @@
+"""Unit tests for batch mode scanning."""
+import threading
+
+import pytest
+
+import eva_gmaps_scanner as scanner
+
+
+@pytest.mark.unit
+def test_batch_covers_every_registered_endpoint(mocker, capsys, fake_request, vulnerable_pairs):
+    mocker.patch.object(scanner.requests.Session, "request", side_effect=fake_request({"AIzaKeyTwo"}))
+
+    results = scanner.scan_gmaps_batch(["AIzaKeyOne", "AIzaKeyTwo"])
+
+    assert vulnerable_pairs(results) == {(endpoint.name, "AIzaKeyTwo") for endpoint in scanner.ENDPOINTS}
+
+
+@pytest.mark.unit
+def test_batch_results_match_between_serial_and_concurrent(mocker, capsys, fake_request, vulnerable_pairs):
+    keys = ["AIzaKeyOne", "AIzaKeyTwo", "AIzaKeyThree"]
+    mocker.patch.object(scanner.requests.Session, "request", side_effect=fake_request({"AIzaKeyTwo"}))
+
+    serial = scanner.scan_gmaps_batch(keys, concurrency=1)
+    concurrent = scanner.scan_gmaps_batch(keys, concurrency=8)
+
+    assert vulnerable_pairs(serial) == vulnerable_pairs(concurrent)
+
+
+@pytest.mark.unit
+def test_batch_concurrency_bounds_in_flight_probes(mocker, capsys, fake_request):
+    in_flight = 0
+    peak = 0
+    lock = threading.Lock()
+    inner = fake_request(set(), delay=0.01)
+
+    def tracking_request(method, url, **kwargs):
+        nonlocal in_flight, peak
+        with lock:
+            in_flight += 1
+            peak = max(peak, in_flight)
+        try:
+            return inner(method, url, **kwargs)
+        finally:
+            with lock:
+                in_flight -= 1
+
+    mocker.patch.object(scanner.requests.Session, "request", side_effect=tracking_request)
+    scanner.scan_gmaps_batch(["AIzaKeyOne", "AIzaKeyTwo"], concurrency=4)
+
+    assert 1 < peak <= 4
+
+
+@pytest.mark.unit
+def test_batch_probe_errors_are_reported_not_raised(mocker, capsys, vulnerable_pairs):
+    mocker.patch.object(scanner.requests.Session, "request", side_effect=scanner.requests.ConnectionError("boom"))
+    results = scanner.scan_gmaps_batch(["AIzaKeyOne"], concurrency=2)
+
+    assert not vulnerable_pairs(results)
+    assert "Error - boom" in capsys.readouterr().out
+
+
+@pytest.mark.unit
+def test_create_session_applies_transport_settings_once():
+    session = scanner.create_session("http://127.0.0.1:8080", pool_size=16)
+
+    assert session.verify is False
+    assert session.proxies == {"http": "http://127.0.0.1:8080", "https": "http://127.0.0.1:8080"}
+    adapter = session.get_adapter("https://maps.googleapis.com/")
+    assert adapter._pool_maxsize == 16
+    assert adapter is session.get_adapter("https://roads.googleapis.com/")
+
+
+@pytest.mark.unit
+def test_batch_probes_share_one_session(mocker, capsys, fake_request):
+    sessions = set()
+    inner = fake_request(set())
+
+    def recording_request(self, method, url, **kwargs):
+        sessions.add(id(self))
+        return inner(method, url, **kwargs)
+
+    mocker.patch.object(scanner.requests.Session, "request", autospec=True, side_effect=recording_request)
+    scanner.scan_gmaps_batch(["AIzaKeyOne", "AIzaKeyTwo"], concurrency=4)
+
+    assert len(sessions) == 1
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("order", scanner.ORDERS)
+def test_batch_orders_agree_on_results(mocker, capsys, order, fake_request, vulnerable_pairs):
+    keys = ["AIzaKeyOne", "AIzaKeyTwo", "AIzaKeyThree"]
+    mocker.patch.object(scanner.requests.Session, "request", side_effect=fake_request({"AIzaKeyTwo"}))
+
+    results = scanner.scan_gmaps_batch(keys, concurrency=4, order=order)
+
+    assert vulnerable_pairs(results) == {(endpoint.name, "AIzaKeyTwo") for endpoint in scanner.ENDPOINTS}
+    assert set(results) == {endpoint.name for endpoint in scanner.ENDPOINTS}
+
+
+@pytest.mark.unit
+def test_key_order_reports_each_key_once(mocker, capsys, fake_request):
+    mocker.patch.object(scanner.requests.Session, "request", side_effect=fake_request({"AIzaKeyTwo"}))
+
+    scanner.scan_gmaps_batch(["AIzaKeyOne", "AIzaKeyTwo"], order="key")
+    out = capsys.readouterr().out
+
+    assert out.count("[1] AIzaKeyOne") == 1
+    assert out.count("[2] AIzaKeyTwo") == 1
+    assert "Testing Staticmap API across all keys" not in out
+
+
+@pytest.mark.unit
+def test_interleave_by_host_alternates_hosts():
+    keys = ["AIzaKeyOne", "AIzaKeyTwo"]
+
+    pairs = list(scanner.interleave_by_host(scanner.ENDPOINTS, keys))
+    hosts = [endpoint.host for endpoint, _ in pairs]
+    distinct = len({endpoint.host for endpoint in scanner.ENDPOINTS})
+
+    assert sorted((e.name, k) for e, k in pairs) == sorted((e.name, k) for e in scanner.ENDPOINTS for k in keys)
+    assert len(set(hosts[:distinct])) == distinct
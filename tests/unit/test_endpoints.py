@@ -0,0 +1,294 @@
+"""Unit tests for the endpoint registry and the generic probe."""
+import pytest
+
+import eva_gmaps_scanner as scanner
+
+
+class FakeResponse:
+    def __init__(self, status_code=200, text="", content=None):
+        self.status_code = status_code
+        self.text = text
+        self.content = content if content is not None else text.encode()
+        self.headers = {}
+        self.encoding = None
+        self.closed = False
+
+    def json(self):
+        import json
+        return json.loads(self.text)
+
+    def iter_lines(self):
+        return iter(self.content.splitlines())
+
+    def iter_content(self, chunk_size=1):
+        return (self.content[i:i + chunk_size] for i in range(0, len(self.content), chunk_size))
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def fake_session(mocker):
+    session = mocker.Mock()
+    session.request.return_value = FakeResponse()
+    return session
+
+
+@pytest.mark.unit
+def test_registry_has_unique_names_and_key_placeholders():
+    names = [endpoint.name for endpoint in scanner.ENDPOINTS]
+
+    assert len(names) == 32
+    assert len(set(names)) == len(names)
+    for endpoint in scanner.ENDPOINTS:
+        assert "{key}" in endpoint.url or "{key}" in "".join(endpoint.headers.values())
+        assert endpoint.costs
+
+
+@pytest.mark.unit
+def test_probe_sends_rendered_request(fake_session):
+    endpoint = next(e for e in scanner.ENDPOINTS if e.name == "FCM API")
+
+    scanner.probe(fake_session, endpoint, "AIzaTestKey", timeout=5)
+
+    method, url = fake_session.request.call_args.args
+    kwargs = fake_session.request.call_args.kwargs
+    assert method == "POST"
+    assert url == "https://fcm.googleapis.com/fcm/send"
+    assert kwargs["headers"]["Authorization"] == "key=AIzaTestKey"
+    assert kwargs["timeout"] == 5
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("name,response,vulnerable,reason", [
+    ("Geocode API", FakeResponse(200, '{"results": []}'), True, None),
+    ("Geocode API", FakeResponse(200, '{"error_message": "The provided API key is invalid."}'), False, "The provided API key is invalid."),
+    ("Timezone API", FakeResponse(200, '{"errorMessage": "denied"}'), False, "denied"),
+    ("Nearest Roads API", FakeResponse(403, '{"error": {"message": "blocked"}}'), False, "blocked"),
+    ("Places Photo API", FakeResponse(302), True, None),
+    ("Maps Embed API", FakeResponse(403, "nope"), False, "b'nope'"),
+    ("Air Quality API", FakeResponse(403, "plain failure"), False, None),
+    ("Maps JavaScript API", FakeResponse(200, "InvalidKeyMapError"), False, "Invalid API key or key restrictions"),
+])
+def test_probe_classifies_responses(fake_session, name, response, vulnerable, reason):
+    endpoint = next(e for e in scanner.ENDPOINTS if e.name == name)
+    fake_session.request.return_value = response
+
+    result = scanner.probe(fake_session, endpoint, "AIzaTestKey")
+
+    assert result.vulnerable is vulnerable
+    assert result.reason == reason
+    assert result.error is None
+
+
+@pytest.mark.unit
+def test_probe_captures_transport_errors(fake_session):
+    fake_session.request.side_effect = scanner.requests.Timeout("timed out")
+
+    result = scanner.probe(fake_session, scanner.ENDPOINTS[0], "AIzaTestKey")
+
+    assert result.vulnerable is False
+    assert result.error == "timed out"
+
+
+@pytest.mark.unit
+def test_scan_gmaps_reports_every_endpoint_in_order(mocker, fake_session, capsys):
+    fake_session.request.return_value = FakeResponse(200, "{}")
+    mocker.patch("builtins.input", return_value="N")
+
+    scanner.scan_gmaps("AIzaTestKey", session=fake_session)
+
+    out = capsys.readouterr().out
+    positions = [out.index(f"{i}. Testing {e.title or e.name}") for i, e in enumerate(scanner.ENDPOINTS, 1)]
+    assert positions == sorted(positions)
+    assert "Staticmap 			|| $2 per 1000 requests" in out
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("body,invalid", [
+    ('{"error_message": "The provided API key is invalid. ", "status": "REQUEST_DENIED"}', True),
+    ('{"error_message": "The provided API key is expired. ", "status": "REQUEST_DENIED"}', True),
+    ('{"error_message": "This API project is not authorized to use this API.", "status": "REQUEST_DENIED"}', False),
+])
+def test_probe_flags_invalid_keys(fake_session, body, invalid):
+    fake_session.request.return_value = FakeResponse(200, body)
+
+    result = scanner.probe(fake_session, scanner.TRIAGE_ENDPOINT, "AIzaTestKey")
+
+    assert result.invalid_key is invalid
+
+
+@pytest.mark.unit
+def test_scan_gmaps_stops_after_invalid_triage(fake_session, capsys):
+    fake_session.request.return_value = FakeResponse(200, '{"error_message": "The provided API key is invalid. "}')
+
+    scanner.scan_gmaps("AIzaTestKey", session=fake_session)
+
+    assert fake_session.request.call_count == 1
+    assert "skipping all tests" in capsys.readouterr().out
+
+
+@pytest.mark.unit
+def test_scan_gmaps_reuses_triage_result(mocker, fake_session, capsys):
+    fake_session.request.return_value = FakeResponse(200, "{}")
+    mocker.patch("builtins.input", return_value="N")
+
+    scanner.scan_gmaps("AIzaTestKey", session=fake_session)
+
+    assert fake_session.request.call_count == len(scanner.ENDPOINTS)
+
+
+@pytest.mark.unit
+def test_image_probes_ask_for_the_smallest_image():
+    by_name = {endpoint.name: endpoint for endpoint in scanner.ENDPOINTS}
+
+    for name in ("Staticmap API", "Streetview API"):
+        assert "size=1x1" in by_name[name].url
+        assert "size=400x400" in by_name[name].render_poc("AIzaTestKey")
+
+
+@pytest.mark.unit
+def test_image_probes_read_only_a_body_prefix(fake_session):
+    image = FakeResponse(200, content=b"\x89PNG\r\n\x1a\n" + b"\0" * 100_000)
+    fake_session.request.return_value = image
+    staticmap = scanner.ENDPOINTS[0]
+
+    result = scanner.probe(fake_session, staticmap, "AIzaTestKey")
+
+    assert fake_session.request.call_args.kwargs["stream"] is True
+    assert result.vulnerable is True
+    assert image.closed
+
+
+@pytest.mark.unit
+def test_read_prefix_stops_at_the_limit():
+    response = FakeResponse(403, content=b"x" * 10_000)
+
+    buffered = scanner.read_prefix(response, 64)
+
+    assert buffered.content == b"x" * 64
+    assert buffered.status_code == 403
+    assert response.closed
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("name,status,body,verdict", [
+    ("Geocode API", 200, '{"results": []}', scanner.Verdict.VULNERABLE),
+    ("Geocode API", 200, '{"error_message": "The provided API key is invalid. "}', scanner.Verdict.INVALID_KEY),
+    ("Geocode API", 200, '{"error_message": "This API project is not authorized to use this API."}', scanner.Verdict.NOT_ENABLED),
+    ("Geocode API", 200, '{"error_message": "API keys with referer restrictions cannot be used with this API."}', scanner.Verdict.DENIED),
+    ("Geocode API", 200, '{"error_message": "You have exceeded your rate-limit.", "status": "OVER_QUERY_LIMIT"}', scanner.Verdict.QUOTA),
+    ("Solar API", 403, '{"error": {"message": "Solar API has not been used in project 1 before or it is disabled."}}', scanner.Verdict.NOT_ENABLED),
+    ("Solar API", 503, '{"error": {"message": "unavailable"}}', scanner.Verdict.ERROR),
+])
+def test_classifier_returns_structured_verdicts(name, status, body, verdict):
+    endpoint = next(e for e in scanner.ENDPOINTS if e.name == name)
+
+    result = scanner.classify(endpoint, "AIzaTestKey", endpoint.url, FakeResponse(status, body))
+
+    assert result.verdict is verdict
+
+
+@pytest.mark.unit
+def test_error_word_inside_a_payload_is_not_a_refusal():
+    roads = next(e for e in scanner.ENDPOINTS if e.name == "Nearest Roads API")
+    body = '{"snappedPoints": [{"placeId": "error", "note": "no error here"}]}'
+
+    result = scanner.classify(roads, "AIzaTestKey", roads.url, FakeResponse(200, body))
+
+    assert result.verdict is scanner.Verdict.VULNERABLE
+
+
+@pytest.mark.unit
+def test_classifier_scans_only_a_body_prefix():
+    geocode = scanner.TRIAGE_ENDPOINT
+    body = '{"results": ["' + "x" * 10_000 + '"], "error_message": "late"}'
+
+    result = scanner.classify(geocode, "AIzaTestKey", geocode.url, FakeResponse(200, body))
+
+    assert result.vulnerable is True
+
+
+@pytest.mark.unit
+def test_classifier_parses_json_once_and_only_for_refusals(mocker):
+    loads = mocker.spy(scanner.json, "loads")
+    geocode = scanner.TRIAGE_ENDPOINT
+    refusal = scanner.BufferedResponse(200, b'{"error_message": "denied"}')
+
+    scanner.classify(geocode, "AIzaTestKey", geocode.url, scanner.BufferedResponse(200, b'{"results": []}'))
+    assert loads.call_count == 0
+    scanner.classify(geocode, "AIzaTestKey", geocode.url, refusal)
+    refusal.json()
+    assert loads.call_count == 1
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("reason,restriction", [
+    ("API keys with referer restrictions cannot be used with this API.", scanner.Restriction.REFERER),
+    ("Requests from referer <empty> are blocked.", scanner.Restriction.REFERER),
+    ("This IP, site or mobile application is not authorized to use this API key. Request received from IP address 192.0.2.1, with empty referer", scanner.Restriction.IP),
+    ("The provided API key is expired. ", scanner.Restriction.EXPIRED),
+    ("API key not valid. Please pass a valid API key.", scanner.Restriction.INVALID),
+    ("This API key is not authorized to use this service or API.", None),
+    (None, None),
+])
+def test_restriction_of_reads_key_wide_refusals(reason, restriction):
+    assert scanner.restriction_of(reason) is restriction
+
+
+@pytest.mark.unit
+def test_referer_restriction_skips_only_web_services(fake_session, mocker, capsys):
+    fake_session.request.return_value = FakeResponse(200, '{"error_message": "API keys with referer restrictions cannot be used with this API.", "status": "REQUEST_DENIED"}')
+    mocker.patch("builtins.input", return_value="N")
+
+    scanner.scan_gmaps("AIzaTestKey", session=fake_session)
+
+    client_side = [e for e in scanner.ENDPOINTS if e.client_side]
+    assert fake_session.request.call_count == 1 + len(client_side)
+    out = capsys.readouterr().out
+    assert "referer restrictions, skipping" in out
+    assert "(inferred, not sent)" in out
+
+
+@pytest.mark.unit
+def test_list_price_takes_highest_published_price():
+    by_name = {e.name: e for e in scanner.ENDPOINTS}
+
+    assert scanner.list_price(by_name["Staticmap API"]) == 2.0
+    assert scanner.list_price(by_name["Nearby Search-Places API"]) == 32.0
+    assert scanner.list_price(by_name["FCM API"]) == 0.0
+
+
+@pytest.mark.unit
+def test_by_price_puts_most_expensive_first_and_is_stable():
+    ordered = scanner.by_price(scanner.ENDPOINTS)
+    prices = [scanner.PRICES[e.name] for e in ordered]
+
+    assert prices == sorted(prices, reverse=True)
+    assert sorted(ordered, key=scanner.ENDPOINTS.index) == scanner.ENDPOINTS
+    free = [e for e in ordered if not scanner.PRICES[e.name]]
+    assert free == [e for e in scanner.ENDPOINTS if not scanner.PRICES[e.name]]
+
+
+@pytest.mark.unit
+def test_exposure_sums_only_vulnerable_results():
+    key = "AIzaTestKey"
+    results = [
+        scanner.ProbeResult(scanner.ENDPOINTS[0], key, vulnerable=True),
+        scanner.ProbeResult(scanner.ENDPOINTS[1], key, vulnerable=True),
+        scanner.ProbeResult(scanner.ENDPOINTS[2], key, vulnerable=False),
+    ]
+
+    assert scanner.exposure(results) == 9.0
+    assert scanner.format_exposure(1234.5) == "$1,234.50 per 1000 requests"
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("argv,concurrency", [([], len(scanner.ENDPOINTS)), (["-c", "4"], 4)])
+def test_single_key_mode_honours_concurrency(mocker, monkeypatch, argv, concurrency):
+    scan = mocker.patch.object(scanner, "scan_gmaps")
+    monkeypatch.setattr("sys.argv", ["scanner", "-a", "AIzaTestKey"] + argv)
+
+    scanner.main()
+
+    assert scan.call_args.kwargs["concurrency"] == concurrency
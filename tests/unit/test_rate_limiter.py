@@ -0,0 +1,119 @@
+"""Unit tests for the adaptive per-host rate limiter."""
+import pytest
+
+import eva_gmaps_scanner as scanner
+
+
+@pytest.mark.unit
+def test_reserve_allows_one_second_burst_then_spaces_requests():
+    limiter = scanner.HostRateLimiter(rate=10)
+
+    delays = [limiter.reserve("maps.googleapis.com") for _ in range(12)]
+
+    assert all(delay == 0 for delay in delays[:10])
+    assert delays[10] == pytest.approx(0.1, abs=0.01)
+    assert delays[11] == pytest.approx(0.2, abs=0.01)
+
+
+@pytest.mark.unit
+def test_hosts_have_independent_buckets():
+    limiter = scanner.HostRateLimiter(rate=1)
+
+    assert limiter.reserve("maps.googleapis.com") == 0
+    assert limiter.reserve("roads.googleapis.com") == 0
+    assert limiter.reserve("maps.googleapis.com") > 0
+
+
+@pytest.mark.unit
+def test_throttling_halves_rate_and_success_recovers_it(monkeypatch):
+    clock = [100.0]
+    monkeypatch.setattr(scanner.time, "monotonic", lambda: clock[0])
+    limiter = scanner.HostRateLimiter(rate=8, min_rate=1)
+    host = "places.googleapis.com"
+
+    limiter.throttled(host)
+    assert limiter.rate(host) == 4
+    for _ in range(10):
+        clock[0] += scanner.THROTTLE_COOLDOWN
+        limiter.throttled(host)
+    assert limiter.rate(host) == 1
+
+    limiter.succeeded(host)
+    assert limiter.rate(host) == 1 + scanner.RATE_INCREASE_STEP
+    assert limiter.throttle_counts() == {host: 11}
+
+
+@pytest.mark.unit
+def test_backoff_is_jittered_and_capped():
+    limiter = scanner.HostRateLimiter(backoff_base=1, backoff_cap=8)
+
+    for attempt in range(10):
+        delay = limiter.backoff(attempt)
+        assert 0 <= delay <= min(8, 2 ** attempt)
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("status,body,throttled", [
+    (429, b"", True),
+    (200, b'{"error_message": "You have exceeded your rate-limit", "status": "OVER_QUERY_LIMIT"}', True),
+    (403, b'{"error": {"status": "RESOURCE_EXHAUSTED"}}', True),
+    (200, b'{"error_message": "denied", "status": "REQUEST_DENIED"}', False),
+])
+def test_is_throttled(status, body, throttled):
+    assert scanner.is_throttled(scanner.BufferedResponse(status, body)) is throttled
+
+
+@pytest.mark.unit
+def test_burst_of_throttles_cuts_rate_once(monkeypatch):
+    monkeypatch.setattr(scanner.time, "monotonic", lambda: 50.0)
+    limiter = scanner.HostRateLimiter(rate=64)
+
+    for _ in range(20):
+        limiter.throttled("maps.googleapis.com")
+
+    assert limiter.rate("maps.googleapis.com") == 32
+    assert limiter.throttle_counts() == {"maps.googleapis.com": 20}
+
+
+@pytest.mark.unit
+def test_budget_refuses_requests_over_the_cap():
+    budget = scanner.ProbeBudget(max_requests=2)
+
+    assert [budget.take() for _ in range(4)] == [True, True, False, False]
+    assert (budget.sent, budget.refused) == (2, 2)
+
+
+@pytest.mark.unit
+def test_budget_refuses_requests_after_the_deadline(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(scanner.time, "monotonic", lambda: now[0])
+    budget = scanner.ProbeBudget(deadline=5)
+
+    assert budget.take()
+    now[0] = 105.0
+    assert not budget.take()
+
+
+@pytest.mark.unit
+def test_main_rejects_negative_max_retries(monkeypatch, capsys):
+    monkeypatch.setattr("sys.argv", ["scanner", "-a", "AIzaTestKey", "--max-retries", "-1"])
+
+    with pytest.raises(SystemExit) as exc:
+        scanner.main()
+
+    assert exc.value.code == 1
+    assert "--max-retries must be at least 0" in capsys.readouterr().out
+
+
+@pytest.mark.unit
+def test_effective_rps_averages_over_the_scan(monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr(scanner.time, "monotonic", lambda: now[0])
+    limiter = scanner.HostRateLimiter(rate=100)
+    limiter.reserve("roads.googleapis.com")
+    for _ in range(5):
+        limiter.reserve("maps.googleapis.com")
+    now[0] = 2.0
+    limiter.reserve("maps.googleapis.com")
+
+    assert limiter.effective_rps() == {"maps.googleapis.com": 2.5}
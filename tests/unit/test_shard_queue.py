@@ -0,0 +1,108 @@
+"""Unit tests for the SQLite shard queue behind --workers/--worker and the --processes result packing."""
+import pytest
+
+import eva_gmaps_scanner as scanner
+
+
+KEYS = ["AIzaKeyOne", "AIzaKeyTwo"]
+STATICMAP = scanner.ENDPOINTS[0]
+
+
+@pytest.fixture
+def path(temp_dir):
+    return str(temp_dir / "shards.sqlite3")
+
+
+@pytest.mark.unit
+def test_completed_shards_come_back_in_endpoint_order(path):
+    shards = scanner.ShardQueue(path)
+    shard = shards.add_shard(KEYS)
+    shards.close_input()
+
+    claimed = shards.claim("w1")
+    shards.complete(shard, KEYS, [
+        scanner.ProbeResult(scanner.ENDPOINTS[1], "AIzaKeyOne", reason="denied"),
+        scanner.ProbeResult(STATICMAP, "AIzaKeyOne", vulnerable=True, status_code=200, elapsed=0.01),
+        scanner.ProbeResult(STATICMAP, "AIzaKeyTwo", error="timed out"),
+    ])
+    merged = dict(shards.take_completed())
+
+    assert claimed == (shard, KEYS)
+    assert [r.endpoint for r in merged["AIzaKeyOne"]] == [STATICMAP, scanner.ENDPOINTS[1]]
+    assert merged["AIzaKeyOne"][0].vulnerable and merged["AIzaKeyOne"][0].elapsed == 0.01
+    assert merged["AIzaKeyTwo"][0].error == "timed out"
+    assert shards.finished()
+    assert list(shards.take_completed()) == []
+    shards.close()
+
+
+@pytest.mark.unit
+def test_a_leased_shard_is_claimed_once(path):
+    coordinator = scanner.ShardQueue(path)
+    coordinator.add_shard(KEYS)
+    first, second = scanner.ShardQueue(path), scanner.ShardQueue(path)
+
+    assert first.claim("w1") is not None
+    assert second.claim("w2") is None
+    for shards in (coordinator, first, second):
+        shards.close()
+
+
+@pytest.mark.unit
+def test_an_expired_lease_is_handed_to_another_worker(path):
+    shards = scanner.ShardQueue(path)
+    shard = shards.add_shard(KEYS)
+
+    shards.claim("dead-worker", lease=-1)
+
+    assert shards.claim("w2") == (shard, KEYS)
+    shards.close()
+
+
+@pytest.mark.unit
+def test_queue_is_not_finished_until_input_is_closed(path):
+    shards = scanner.ShardQueue(path)
+
+    assert not shards.finished()
+    shards.close_input()
+    assert shards.finished()
+    shards.close()
+
+
+@pytest.mark.unit
+def test_main_rejects_workers_without_a_list(monkeypatch, capsys):
+    monkeypatch.setattr("sys.argv", ["scanner", "-a", "AIzaKeyOne", "--workers", "2"])
+
+    with pytest.raises(SystemExit) as exc:
+        scanner.main()
+
+    assert exc.value.code == 1
+    assert "--list" in capsys.readouterr().out
+
+
+@pytest.mark.unit
+def test_packed_results_round_trip():
+    result = scanner.ProbeResult(
+        scanner.ENDPOINTS[3], "AIzaKeyOne", status_code=429, reason="slow down", error="Throttled (HTTP 429)",
+        throttled=True, attempts=4, elapsed=0.25, timing=scanner.ProbeTiming(queue=0.1, ttfb=0.2))
+
+    unpacked = scanner.unpack_result("AIzaKeyOne", scanner.pack_result(result))
+
+    assert unpacked.endpoint is scanner.ENDPOINTS[3]
+    assert (unpacked.status_code, unpacked.reason, unpacked.error, unpacked.attempts, unpacked.elapsed) == (429, "slow down", "Throttled (HTTP 429)", 4, 0.25)
+    assert unpacked.throttled and not (unpacked.vulnerable or unpacked.invalid_key or unpacked.inferred)
+    assert unpacked.verdict is result.verdict
+    assert unpacked.timing.as_dict() == result.timing.as_dict()
+
+
+@pytest.mark.unit
+def test_main_rejects_processes_with_workers(temp_dir, monkeypatch, capsys):
+    keys = temp_dir / "keys.txt"
+    keys.write_text("AIzaKeyOne\n")
+    monkeypatch.setattr("sys.argv", ["scanner", "-l", str(keys), "--processes", "2", "--workers", "2"])
+
+    with pytest.raises(SystemExit) as exc:
+        scanner.main()
+
+    assert exc.value.code == 1
+    assert "--processes or --workers" in capsys.readouterr().out